@@ -1,12 +1,18 @@
 # backend/app/api/routes_admin.py
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict, Any, List
 import logging
-import shutil
 import os
+import uuid
 
+from app.db.neo4j_driver import pool_stats
 from app.services import graph_service
+from app.services.ingest_jobs import get_job_manager, IngestJob, MODES, DELTA
+from app.services.answer_cache import get_answer_cache
+from app.utils.embedding_cache import get_embedding_cache
+from app.utils.feedback import query_feedback, feedback_summary_by_drug, get_feedback_writer
 
 logger = logging.getLogger("medical-chatbot.api.routes_admin")
 router = APIRouter()
@@ -15,20 +21,52 @@ router = APIRouter()
 class IngestResponse(BaseModel):
     success: bool
     message: str
+    report: Optional[Dict[str, Any]] = None
+
+
+class IngestJobResponse(BaseModel):
+    job_id: str
+    state: str
+    file: str
+    mode: str = "full"
+    rows_processed: int = 0
+    elapsed_seconds: Optional[float] = None
+    rows_per_sec: float = 0.0
+    stages: Dict[str, Dict[str, Any]] = {}
+    error: Optional[str] = None
+    report: Optional[Dict[str, Any]] = None
+
+
+UPLOAD_DIR = "/tmp/medical_chatbot_uploads"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _check_mode(mode: str):
+    if mode not in MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(MODES)}")
 
 
 @router.post("/ingest")
-def ingest_csv(file_path: Optional[str] = Form(None)):
+def ingest_csv(file_path: Optional[str] = Form(None), mode: str = Form("full")):
     """
     Ingest CSV/TSV file into Neo4j.
     Option 1: supply `file_path` on the server filesystem (fast).
     Option 2: Use file upload endpoint below to upload and ingest.
+    `mode=delta` only rewrites drugs that were added or changed and removes
+    drugs missing from the file.
     """
+    _check_mode(mode)
     if not file_path:
         raise HTTPException(status_code=400, detail="file_path form field required")
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="file not found on server")
     try:
+        if mode == DELTA:
+            report = graph_service.ingest_drug_file_delta(file_path)
+            return IngestResponse(success=True, message=(
+                f"Delta ingest: {report['added']} added, {report['changed']} changed, "
+                f"{report['unchanged']} unchanged, {report['removed']} removed."
+            ), report=report)
         count = graph_service.ingest_drug_file(file_path)
         return IngestResponse(success=True, message=f"Ingested {count} rows.")
     except Exception as e:
@@ -36,21 +74,91 @@ def ingest_csv(file_path: Optional[str] = Form(None)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/upload_and_ingest")
-async def upload_and_ingest(file: UploadFile = File(...)):
+def _remove_upload(job: IngestJob):
+    try:
+        os.remove(job.path)
+    except FileNotFoundError:
+        pass
+
+
+@router.post("/upload_and_ingest", response_model=IngestJobResponse, status_code=202)
+async def upload_and_ingest(file: UploadFile = File(...), mode: str = Form("full")):
     """
-    Upload the dataset file and ingest it.
-    Returns number of records ingested.
+    Upload the dataset file and queue it for ingestion (`mode` full or delta).
+    The file is streamed to disk off the event loop and a job is returned
+    immediately; poll GET /jobs/{job_id} for progress. The uploaded copy is
+    deleted once the job finishes, fails or is cancelled.
     """
-    upload_dir = "/tmp/medical_chatbot_uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    dest_path = os.path.join(upload_dir, file.filename)
-    with open(dest_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-
+    _check_mode(mode)
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    filename = os.path.basename(file.filename or "upload.csv")
+    dest_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}_{filename}")
+    out = await run_in_threadpool(open, dest_path, "wb")
     try:
-        count = graph_service.ingest_drug_file(dest_path)
-        return IngestResponse(success=True, message=f"Ingested {count} rows.")
-    except Exception as e:
-        logger.exception("Upload+Ingest failed")
-        raise HTTPException(status_code=500, detail=str(e))
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(os.remove, dest_path)
+        raise
+    await run_in_threadpool(out.close)
+
+    job = get_job_manager().submit(dest_path, mode, on_done=_remove_upload)
+    return IngestJobResponse(**job.as_dict())
+
+
+@router.get("/jobs/{job_id}", response_model=IngestJobResponse)
+def get_ingest_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return IngestJobResponse(**job.as_dict())
+
+
+@router.delete("/jobs/{job_id}", response_model=IngestJobResponse)
+def cancel_ingest_job(job_id: str):
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return IngestJobResponse(**job.as_dict())
+
+
+@router.get("/embedding_cache")
+def embedding_cache_stats():
+    return get_embedding_cache().stats()
+
+
+@router.get("/answer_cache")
+def answer_cache_stats():
+    return get_answer_cache().stats()
+
+
+@router.delete("/answer_cache")
+def clear_answer_cache():
+    get_answer_cache().clear()
+    return {"success": True}
+
+
+@router.get("/neo4j_pool")
+def neo4j_pool_stats():
+    return pool_stats()
+
+
+@router.get("/feedback")
+def list_feedback(answer_id: Optional[str] = None, drug: Optional[str] = None,
+                  limit: int = Query(100, ge=1, le=10000)) -> List[Dict[str, Any]]:
+    """Recorded feedback, newest first, filtered by answer id and/or cited drug."""
+    return query_feedback(answer_id=answer_id, drug=drug, limit=limit)
+
+
+@router.get("/feedback/by_drug")
+def feedback_by_drug(limit: int = Query(100, ge=1, le=10000)) -> List[Dict[str, Any]]:
+    return feedback_summary_by_drug(limit=limit)
+
+
+@router.get("/feedback/queue")
+def feedback_queue_stats():
+    return get_feedback_writer().stats()
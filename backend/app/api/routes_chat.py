@@ -1,10 +1,15 @@
 # backend/app/api/routes_chat.py
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import json
 import logging
 
+from app.core import readiness
+from app.core.config import settings
 from app.services import rag_service
+from app.utils.feedback import record_feedback, answer_id, drugs_from_sources
 
 logger = logging.getLogger("medical-chatbot.api.routes_chat")
 router = APIRouter()
@@ -15,9 +20,25 @@ class QueryRequest(BaseModel):
     top_k: Optional[int] = 5
 
 
+class BatchQueryRequest(BaseModel):
+    questions: List[str]
+    top_k: Optional[int] = 5
+    concurrency: Optional[int] = None
+
+
 class QueryResponse(BaseModel):
     answer: str
     sources: Optional[List[str]] = []
+    answer_id: Optional[str] = None
+
+
+class FeedbackRequest(BaseModel):
+    question: str
+    answer: str
+    answer_id: Optional[str] = None  # as returned with the answer; derived from question + answer if missing
+    rating: Optional[int] = None
+    comment: Optional[str] = None
+    sources: Optional[List[str]] = []
 
 
 @router.get("/health")
@@ -25,11 +46,100 @@ def health():
     return {"status": "ok"}
 
 
+@router.get("/ready")
+def ready():
+    """
+    Readiness, separate from liveness (/health): 200 once every prewarmed
+    component (Neo4j, embedder, vector index, LLM client) has loaded, 503 before
+    that or if one failed. Per-component state and load time are included.
+    """
+    ok = readiness.is_ready()
+    return JSONResponse(
+        status_code=200 if ok else 503,
+        content={"status": "ready" if ok else "not ready", "components": readiness.snapshot()},
+    )
+
+
 @router.post("/ask", response_model=QueryResponse)
-def ask(request: QueryRequest):
+async def ask(request: QueryRequest):
     try:
-        answer, sources = rag_service.answer_question(request.question, top_k=request.top_k)
-        return QueryResponse(answer=answer, sources=sources)
+        answer, sources = await rag_service.aanswer_question(request.question, top_k=request.top_k)
+        return QueryResponse(answer=answer, sources=sources, answer_id=answer_id(request.question, answer))
     except Exception as e:
         logger.exception("Failed to answer question")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/ask/stream")
+async def ask_stream(request: QueryRequest):
+    """
+    Server-Sent Events stream: one `sources` event once retrieval is done,
+    then `token` events as the answer is generated, then `done` carrying the
+    `answer_id` (or `error` if anything fails mid-stream).
+    """
+    async def events():
+        parts = []
+        try:
+            async for event, data in rag_service.astream_answer(request.question, top_k=request.top_k):
+                if event == "token":
+                    parts.append(data)
+                yield _sse(event, data)
+            yield _sse("done", {"answer_id": answer_id(request.question, "".join(parts))})
+        except Exception as e:
+            logger.exception("Failed to stream answer")
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/ask_batch")
+async def ask_batch(request: BatchQueryRequest):
+    """
+    Answer a batch of questions. Results are streamed back as newline-delimited
+    JSON in completion order, each carrying the `index` of its question and
+    either `answer`/`sources` or `error`.
+    """
+    if len(request.questions) > settings.BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"at most {settings.BATCH_MAX_QUESTIONS} questions per batch",
+        )
+
+    async def results():
+        async for item in rag_service.aanswer_batch(
+            request.questions, top_k=request.top_k, concurrency=request.concurrency
+        ):
+            if "answer" in item:
+                item["answer_id"] = answer_id(item["question"], item["answer"])
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.post("/feedback", status_code=202)
+async def feedback(request: FeedbackRequest):
+    """
+    Record a rating/comment for an answer. Rows are queued without blocking
+    the event loop and written to SQLite in batches by a background thread;
+    503 means the queue is full and the feedback was not recorded.
+    """
+    aid = request.answer_id or answer_id(request.question, request.answer)
+    queued = record_feedback(
+        request.question,
+        request.answer,
+        rating=request.rating,
+        comment=request.comment,
+        answer_id=aid,
+        drugs=drugs_from_sources(request.sources or []),
+    )
+    if not queued:
+        raise HTTPException(status_code=503, detail="feedback queue is full, try again later")
+    return {"status": "queued", "answer_id": aid}
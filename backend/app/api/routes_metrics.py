@@ -0,0 +1,19 @@
+# backend/app/api/routes_metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint: request counts and latency per route, per-stage
+    RAG latency histograms, cache hit counters, Neo4j round-trips per request
+    and pool usage, LLM token counts and ingest rows/s per stage.
+    """
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
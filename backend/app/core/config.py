@@ -7,18 +7,102 @@ class Settings(BaseSettings):
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = "neo4j"
+    NEO4J_DATABASE: str = ""  # empty = server default database
+    NEO4J_MAX_POOL_SIZE: int = 100
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT: float = 60.0  # seconds waiting for a pooled connection
+    NEO4J_MAX_CONNECTION_LIFETIME: float = 3600.0  # seconds before a pooled connection is recycled
+    NEO4J_CONNECTION_TIMEOUT: float = 30.0
+    # Retries are left to the driver: execute_read/write retry connection failures and
+    # transient errors (deadlocks included) with backoff for at most this many seconds
+    NEO4J_MAX_TRANSACTION_RETRY_TIME: float = 15.0
 
     # Groq / LLM
     GROQ_API_KEY: str = ""
 
     # Embeddings
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "torch"  # "torch", "torch-int8", "onnx" or "hashing"
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_THREADS: int = 0  # intra-op threads; 0 = library default
+    EMBEDDING_MAX_SEQ_LENGTH: int = 0  # tokens per text; 0 = model default
+    EMBEDDING_ONNX_FILE: str = ""  # e.g. "onnx/model_qint8_avx512_vnni.onnx" for the onnx backend
+    EMBEDDING_DIM: int = 384  # output size of the hashing backend
+    EMBEDDING_STORAGE_DTYPE: str = "float32"  # packed Drug.embedding_blob dtype: "float32" or "float16"
+    NEO4J_STORE_EMBEDDING_LIST: bool = False  # also keep the legacy Drug.embedding float list
+    EMBEDDING_CACHE_SIZE: int = 10000  # vectors kept in the in-memory LRU tier
+    EMBEDDING_CACHE_PERSIST: bool = True  # also keep vectors in the SQLite metadata DB
+    EMBEDDING_EXECUTOR_WORKERS: int = 1  # threads encoding queries for the async request path
+
+    # Retrieval context (rag_service)
+    RAG_MAX_SIDE_EFFECTS: int = 10  # side effects listed per drug
+    RAG_EXPAND_NEIGHBOURS: bool = False  # add other drugs treating the same condition
+    RAG_MAX_RELATED: int = 5
+    RAG_CONTEXT_TOKENS: int = 1024  # token budget for the context block of each prompt
+    RAG_TOKEN_ENCODING: str = "o200k_base"  # tiktoken encoding; approximate counts without tiktoken
+    RAG_MMR_LAMBDA: float = 0.7  # relevance vs. diversity when ordering drugs; 1 = relevance only
+
+    # Hybrid retrieval (lexical BM25 + vector, fused with reciprocal rank fusion)
+    HYBRID_SEARCH_ENABLED: bool = True
+    HYBRID_EXACT_NAME_FAST_PATH: bool = True  # named drugs skip embedding and vector search
+    HYBRID_RRF_K: int = 60
+    HYBRID_CANDIDATES: int = 20  # hits taken from each ranking before fusion
+    LEXICAL_FUZZY: bool = True  # prefix / typo expansion of unknown query terms
+
+    # Intent router (templated graph questions answered without the LLM)
+    INTENT_ROUTER_ENABLED: bool = True
+
+    # Batch question answering (/api/ask_batch)
+    BATCH_MAX_QUESTIONS: int = 1000
+    BATCH_LLM_CONCURRENCY: int = 8  # Groq completions in flight per batch
+
+    # Answer cache (rag_service)
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_TTL: float = 3600.0  # seconds; 0 = no expiry
+    ANSWER_CACHE_MAX_ENTRIES: int = 1000
+    ANSWER_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    ANSWER_CACHE_SIMILARITY: float = 0.95  # near-duplicate cosine threshold; 0 = exact match only
+
+    # Startup
+    PREWARM_ON_STARTUP: bool = True  # load components in a background thread at startup
+    PREWARM_COMPONENTS: str = "neo4j,embeddings,tokenizer,vector_index,graph_projection,llm"
+
+    # Observability
+    METRICS_ENABLED: bool = True  # record latency/counter metrics served at /metrics
 
     # Local metadata DB
     SQLITE_PATH: str = "metadata.db"
+    SQLITE_BUSY_TIMEOUT: float = 5.0  # seconds a writer waits for the database lock
+    SQLITE_POOL_SIZE: int = 8  # connections shared by all threads
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # WAL + NORMAL is durable across app crashes, fsyncs at checkpoints
+
+    # Feedback capture (write-behind queue flushed to SQLite in batches)
+    FEEDBACK_QUEUE_SIZE: int = 100000  # submissions buffered before POST /api/feedback returns 503
+    FEEDBACK_BATCH_SIZE: int = 1000  # rows written per transaction
+    FEEDBACK_FLUSH_INTERVAL: float = 0.5  # seconds between flushes of a partial batch
 
     # Ingestion & tuning
     INGEST_BATCH_SIZE: int = 500
+    INGEST_QUEUE_SIZE: int = 2  # chunks buffered between read/embed/write stages
+    INGEST_EMBED_PROCESSES: int = 0  # encode chunks in this many worker processes; 0 = in the ingest thread
+    INGEST_WRITE_PARTITIONS: int = 1  # concurrent write transactions per chunk, drugs split by name
+    INGEST_MAX_CONCURRENT_JOBS: int = 1  # background ingest jobs running at once
+    INGEST_JOB_HISTORY: int = 100  # finished jobs kept for GET /api/admin/jobs/{id}
+
+    # Vector search backend
+    VECTOR_SEARCH_BACKEND: str = "memory"  # "memory" (in-process index below) or "neo4j" (native vector index, 5.11+)
+    NEO4J_VECTOR_INDEX_NAME: str = "drug_embedding"
+    NEO4J_VECTOR_SIMILARITY: str = "cosine"  # "cosine" or "euclidean"
+
+    # In-process vector index (semantic search)
+    VECTOR_INDEX_MODE: str = "ivf"  # "ivf" or "exact"
+    VECTOR_INDEX_NLIST: int = 0  # IVF lists; 0 = sqrt(number of drugs)
+    VECTOR_INDEX_NPROBE: int = 8  # lists scanned per query; higher = better recall, slower
+    VECTOR_INDEX_MIN_TRAIN_SIZE: int = 2048  # below this size search is exact brute force
+
+    # Multi-worker deployment (gunicorn.conf.py)
+    INDEX_SNAPSHOT_DIR: str = ""  # shared, memory-mapped index snapshots; empty = per-process indexes
+    INDEX_REFRESH_INTERVAL: float = 2.0  # seconds between checks for snapshots published by other workers
+    INDEX_SNAPSHOT_KEEP: int = 2  # generations kept on disk
 
     # Use pydantic-settings model_config to load .env
     model_config = {
@@ -0,0 +1,295 @@
+# backend/app/core/metrics.py
+"""
+Minimal in-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are plain dicts guarded by a lock, so recording a
+sample costs a dict lookup and an addition. Values owned elsewhere (cache
+hit counts, Neo4j pool usage) are read only at scrape time via collectors.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# seconds; covers cached answers (sub-ms) up to slow LLM completions
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+TOKEN_BUCKETS = (64, 128, 256, 512, 768, 1024, 1536, 2048, 4096, 8192)
+
+PREFIX = "medchat_"
+
+LabelKey = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: LabelKey) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # the text format names counter families after their samples
+        self.name += "_total"
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if not settings.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels):
+        if not settings.METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label key: [bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        if not settings.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            row[i] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels) -> int:
+        row = self._values.get(self._key(labels))
+        return int(sum(row[:-1])) if row else 0
+
+    def total(self, **labels) -> float:
+        """Sum of observed values."""
+        row = self._values.get(self._key(labels))
+        return row[-1] if row else 0.0
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = [(key, list(row)) for key, row in self._values.items()]
+        for key, row in items:
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, n in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += n
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, row[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+_registry: List[_Metric] = []
+# callables returning (name, kind, documentation, [(labels, value), ...]) read at scrape time
+_collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]] = []
+
+
+def _register(metric: _Metric) -> _Metric:
+    _registry.append(metric)
+    return metric
+
+
+def register_collector(collector: Callable):
+    """Register `collector()`, called on every scrape to report values owned by another module."""
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+# ---- application metrics --------------------------------------------------
+
+HTTP_REQUESTS = _register(Counter("http_requests", "HTTP requests by route, method and status.", ("path", "method", "status")))
+HTTP_LATENCY = _register(Histogram("http_request_duration_seconds", "HTTP request latency, including streamed bodies.", ("path",)))
+STAGE_LATENCY = _register(Histogram("stage_duration_seconds", "Latency of RAG pipeline stages.", ("stage",)))
+STAGE_ERRORS = _register(Counter("stage_errors", "Exceptions raised by RAG pipeline stages.", ("stage",)))
+ANSWERS = _register(Counter("answers", "Answers served, by source (cache_exact, cache_similar, graph, generated).", ("source",)))
+INTENT_ROUTES = _register(Counter(
+    "intent_routes", "Questions seen by the intent router, by intent and outcome (answered, fallback).", ("intent", "outcome"),
+))
+INTENT_HIT_RATIO = _register(Gauge("intent_router_hit_ratio", "Share of questions answered by the intent router fast path."))
+RETRIEVALS = _register(Counter("retrievals", "Retrievals by path (exact_name, hybrid, vector).", ("path",)))
+NEO4J_ROUND_TRIPS = _register(Histogram(
+    "neo4j_round_trips_per_request", "Neo4j transactions (including retries) run while serving one HTTP request.",
+    buckets=COUNT_BUCKETS,
+))
+NEO4J_TRANSACTIONS = _register(Counter("neo4j_transactions", "Neo4j transactions by access mode and outcome.", ("mode", "outcome")))
+LLM_TOKENS = _register(Counter("llm_tokens", "LLM tokens reported by Groq usage, by kind (prompt, completion).", ("kind",)))
+CONTEXT_TOKENS = _register(Histogram(
+    "rag_prompt_tokens", "Tokens of each RAG prompt, by part (context, prompt).", ("part",), buckets=TOKEN_BUCKETS,
+))
+LLM_REQUESTS = _register(Counter("llm_requests", "LLM completion requests by mode (sync, async, stream).", ("mode",)))
+FEEDBACK = _register(Counter("feedback_submissions", "Feedback submissions by outcome (queued, dropped, written).", ("outcome",)))
+INGEST_ROWS = _register(Counter("ingest_rows", "Rows processed by each ingest pipeline stage.", ("stage",)))
+INGEST_BUSY = _register(Counter("ingest_stage_busy_seconds", "Busy time of each ingest pipeline stage.", ("stage",)))
+INGEST_RATE = _register(Gauge("ingest_rows_per_second", "Rows/s of each stage in the most recent ingest.", ("stage",)))
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage into STAGE_LATENCY and count it in STAGE_ERRORS if it raises."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - t0, stage=name)
+
+
+# ---- per-request Neo4j round-trips ----------------------------------------
+
+_round_trips: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("neo4j_round_trips", default=None)
+
+
+def record_round_trip():
+    counter = _round_trips.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def _route_template(scope) -> str:
+    """Request path with path parameters put back as {name}; unmatched paths share one label."""
+    if scope.get("route") is None:
+        return "unmatched"
+    params = {str(v): k for k, v in scope.get("path_params", {}).items()}
+    segments = scope.get("path", "").split("/")
+    return "/".join("{%s}" % params[seg] if seg in params else seg for seg in segments)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting requests and timing them until the last body
+    chunk is sent, so streamed answers are measured end to end. The route
+    template (e.g. /api/admin/jobs/{job_id}) is used as the path label, which
+    keeps label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        counter = [0]
+        token = _round_trips.set(counter)
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - t0
+            _round_trips.reset(token)
+            path = _route_template(scope)
+            HTTP_REQUESTS.inc(path=path, method=scope["method"], status=str(status["code"]))
+            HTTP_LATENCY.observe(elapsed, path=path)
+            if path != "/metrics":
+                NEO4J_ROUND_TRIPS.observe(counter[0])
+
+
+def render() -> str:
+    """All metrics and collector values in Prometheus text format."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        for name, kind, documentation, samples in collector():
+            name = PREFIX + name
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
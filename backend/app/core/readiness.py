@@ -0,0 +1,56 @@
+# backend/app/core/readiness.py
+import threading
+import time
+from typing import Dict, Any, Optional
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+LAZY = "lazy"  # not prewarmed; loads on first use
+
+_lock = threading.Lock()
+_components: Dict[str, Dict[str, Any]] = {}
+
+
+def register(component: str, state: str = PENDING):
+    with _lock:
+        _components[component] = {"state": state, "seconds": None, "error": None, "_started": None}
+
+
+def mark_loading(component: str):
+    with _lock:
+        entry = _components.setdefault(component, {"seconds": None, "error": None})
+        entry.update(state=LOADING, _started=time.perf_counter())
+
+
+def mark_ready(component: str):
+    _finish(component, READY)
+
+
+def mark_failed(component: str, error: str):
+    _finish(component, FAILED, error)
+
+
+def _finish(component: str, state: str, error: Optional[str] = None):
+    with _lock:
+        entry = _components.setdefault(component, {"_started": None})
+        started = entry.get("_started")
+        entry.update(
+            state=state,
+            error=error,
+            seconds=round(time.perf_counter() - started, 3) if started else None,
+        )
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        return {
+            name: {k: v for k, v in entry.items() if not k.startswith("_")}
+            for name, entry in _components.items()
+        }
+
+
+def is_ready() -> bool:
+    with _lock:
+        return all(entry["state"] in (READY, LAZY) for entry in _components.values())
@@ -1,18 +1,114 @@
 # backend/app/db/database.py
+import logging
 import sqlite3
-from app.core.config import settings
 import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("medical-chatbot.db.database")
 
+# Bounded pool of connections shared by all threads. A connection is used by one
+# thread at a time (checked out with `connection()`); WAL mode lets pooled
+# connections read while another writes. close_all() bumps the generation, so
+# connections checked out before it are closed when they come back.
 _lock = threading.Lock()
-_conn = None
+_idle: List[sqlite3.Connection] = []
+_available: Optional[threading.Semaphore] = None
+_generation = 0
+_open: Dict[sqlite3.Connection, int] = {}  # connection -> generation it belongs to
+_initialized = False
+
+
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """
+    Check out a connection for the duration of the block. At most
+    SQLITE_POOL_SIZE are open at once; further callers wait for one to be
+    returned (up to SQLITE_BUSY_TIMEOUT, then TimeoutError). Use `with conn:`
+    inside the block for a transaction.
+    """
+    available = _semaphore()
+    if not available.acquire(timeout=settings.SQLITE_BUSY_TIMEOUT):
+        raise TimeoutError("no SQLite connection available")
+    conn = None
+    try:
+        with _lock:
+            conn = _idle.pop() if _idle else None
+        if conn is None:
+            conn = _connect()
+        yield conn
+    finally:
+        if conn is not None:
+            _release(conn)
+        available.release()
+
+
+def _semaphore() -> threading.Semaphore:
+    global _available
+    with _lock:
+        if _available is None:
+            _available = threading.Semaphore(max(1, settings.SQLITE_POOL_SIZE))
+        return _available
+
+
+def _release(conn: sqlite3.Connection):
+    if conn.in_transaction:
+        conn.rollback()
+    with _lock:
+        if _open.get(conn) == _generation:
+            _idle.append(conn)
+            return
+        _open.pop(conn, None)
+    # opened before the last close_all()
+    conn.close()
+
+
+def _connect() -> sqlite3.Connection:
+    global _initialized
+    # check_same_thread=False: pooled connections move between threads, one at a time
+    conn = sqlite3.connect(settings.SQLITE_PATH, check_same_thread=False, timeout=settings.SQLITE_BUSY_TIMEOUT)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT * 1000)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    with _lock:
+        if not _initialized:
+            _initialize(conn)
+            _initialized = True
+        _open[conn] = _generation
+    return conn
+
 
+def open_connections() -> int:
+    """Connections currently open (idle or checked out)."""
+    with _lock:
+        return len(_open)
 
-def get_conn():
-    global _conn
-    if _conn is None:
-        _conn = sqlite3.connect(settings.SQLITE_PATH, check_same_thread=False)
-        _initialize(_conn)
-    return _conn
+
+def close_all():
+    """
+    Close the idle connections (application shutdown, or switching SQLITE_PATH).
+    Connections still checked out are closed when they are returned.
+    """
+    global _initialized, _generation, _available
+    with _lock:
+        for conn in _idle:
+            _open.pop(conn, None)
+            try:
+                conn.close()
+            except Exception:
+                logger.exception("Error closing SQLite connection")
+        _idle.clear()
+        _generation += 1
+        _initialized = False
+        # blocks already holding a slot release the old semaphore
+        _available = None
+
+
+def _columns(conn, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
 
 
 def _initialize(conn):
@@ -25,7 +121,31 @@ def _initialize(conn):
                 answer TEXT,
                 rating INTEGER,
                 comment TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                answer_id TEXT
+            )
+            """
+        )
+        # databases created before answer ids were recorded
+        if "answer_id" not in _columns(conn, "feedback"):
+            conn.execute("ALTER TABLE feedback ADD COLUMN answer_id TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS feedback_answer_id ON feedback (answer_id)")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feedback_drug (
+                feedback_id INTEGER NOT NULL REFERENCES feedback (id),
+                drug TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS feedback_drug_drug ON feedback_drug (drug)")
+        conn.execute("CREATE INDEX IF NOT EXISTS feedback_drug_feedback ON feedback_drug (feedback_id)")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                key TEXT PRIMARY KEY,
+                dim INTEGER,
+                vector BLOB
             )
             """
         )
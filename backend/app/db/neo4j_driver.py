@@ -1,20 +1,36 @@
 # backend/app/db/neo4j_driver.py
 import logging
-from neo4j import GraphDatabase, Driver
+import threading
+import time
+from typing import Any, Callable, Dict, TypeVar
+
+from neo4j import GraphDatabase, Driver, AsyncGraphDatabase, AsyncDriver, READ_ACCESS, WRITE_ACCESS
+from app.core import metrics
 from app.core.config import settings
 
 logger = logging.getLogger("medical-chatbot.db.neo4j_driver")
 _driver: Driver = None
+_async_driver: AsyncDriver = None
+
+T = TypeVar("T")
+
+
+def _driver_config() -> Dict[str, Any]:
+    return {
+        "auth": (settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+        "max_connection_pool_size": settings.NEO4J_MAX_POOL_SIZE,
+        "connection_acquisition_timeout": settings.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+        "max_connection_lifetime": settings.NEO4J_MAX_CONNECTION_LIFETIME,
+        "connection_timeout": settings.NEO4J_CONNECTION_TIMEOUT,
+        "max_transaction_retry_time": settings.NEO4J_MAX_TRANSACTION_RETRY_TIME,
+    }
 
 
 def init_neo4j():
     global _driver
     if _driver is None:
         logger.info("Initializing Neo4j driver...")
-        _driver = GraphDatabase.driver(
-            settings.NEO4J_URI,
-            auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
-        )
+        _driver = GraphDatabase.driver(settings.NEO4J_URI, **_driver_config())
 
 
 def get_driver() -> Driver:
@@ -31,3 +47,191 @@ def close_neo4j():
         except Exception:
             logger.exception("Error closing Neo4j driver")
         _driver = None
+
+
+def get_async_driver() -> AsyncDriver:
+    """
+    Async driver for the request path. Created lazily so that it binds to the
+    running event loop.
+    """
+    global _async_driver
+    if _async_driver is None:
+        logger.info("Initializing async Neo4j driver...")
+        _async_driver = AsyncGraphDatabase.driver(settings.NEO4J_URI, **_driver_config())
+    return _async_driver
+
+
+async def close_async_neo4j():
+    global _async_driver
+    if _async_driver:
+        try:
+            await _async_driver.close()
+        except Exception:
+            logger.exception("Error closing async Neo4j driver")
+        _async_driver = None
+
+
+# ---- managed transactions -------------------------------------------------
+
+class _PoolStats:
+    """
+    Counters for sessions handed out by this module. The driver does not expose
+    its pool, so utilization is measured as sessions in use against the
+    configured pool size (each session holds at most one connection).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.transactions = 0
+        self.retries = 0
+        self.failures = 0
+        self.acquire_seconds = 0.0
+
+    def acquire(self):
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def release(self, waited: float, ok: bool):
+        with self._lock:
+            self.in_use -= 1
+            self.transactions += 1
+            self.acquire_seconds += waited
+            if not ok:
+                self.failures += 1
+
+    def retried(self):
+        with self._lock:
+            self.retries += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        size = settings.NEO4J_MAX_POOL_SIZE
+        return {
+            "max_pool_size": size,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "utilization": round(self.in_use / size, 4) if size else 0.0,
+            "transactions": self.transactions,
+            "retries": self.retries,
+            "failures": self.failures,
+            "avg_acquire_ms": round(1000 * self.acquire_seconds / self.transactions, 3) if self.transactions else 0.0,
+        }
+
+
+_stats = _PoolStats()
+
+
+def pool_stats() -> Dict[str, Any]:
+    return _stats.as_dict()
+
+
+def _collect_pool_metrics():
+    stats = _stats.as_dict()
+    yield "neo4j_sessions_in_use", "gauge", "Neo4j sessions currently checked out.", [({}, stats["in_use"])]
+    yield "neo4j_pool_utilization", "gauge", "Sessions in use over NEO4J_MAX_POOL_SIZE.", [({}, stats["utilization"])]
+    yield "neo4j_retries_total", "counter", "Neo4j transactions retried by the driver.", [({}, stats["retries"])]
+
+
+metrics.register_collector(_collect_pool_metrics)
+
+
+def _record(access_mode, ok: bool):
+    metrics.record_round_trip()
+    metrics.NEO4J_TRANSACTIONS.inc(
+        mode="read" if access_mode == READ_ACCESS else "write",
+        outcome="ok" if ok else "error",
+    )
+
+
+def _session_kwargs(access_mode) -> Dict[str, Any]:
+    kwargs = {"default_access_mode": access_mode}
+    if settings.NEO4J_DATABASE:
+        kwargs["database"] = settings.NEO4J_DATABASE
+    return kwargs
+
+
+def _execute(access_mode, work: Callable[..., T], args, kwargs) -> T:
+    _stats.acquire()
+    t0 = time.perf_counter()
+    waited = 0.0
+    ok = False
+    calls = 0
+
+    def timed_work(tx, *a, **kw):
+        nonlocal waited, calls
+        calls += 1
+        if calls > 1:
+            _stats.retried()  # the driver is retrying the transaction
+        if not waited:
+            waited = time.perf_counter() - t0
+        return work(tx, *a, **kw)
+
+    try:
+        with get_driver().session(**_session_kwargs(access_mode)) as session:
+            if access_mode == READ_ACCESS:
+                result = session.execute_read(timed_work, *args, **kwargs)
+            else:
+                result = session.execute_write(timed_work, *args, **kwargs)
+        ok = True
+        return result
+    finally:
+        _stats.release(waited, ok)
+        _record(access_mode, ok)
+
+
+def execute_read(work: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run `work(tx, *args, **kwargs)` in a managed read transaction. With a
+    neo4j:// URI reads are routed to cluster read replicas. `work` must consume
+    its results inside the transaction and may be called more than once: the
+    driver retries connection failures, leader changes and transient errors
+    (deadlocks included) with jittered backoff for up to
+    NEO4J_MAX_TRANSACTION_RETRY_TIME, then raises the last error.
+    """
+    return _execute(READ_ACCESS, work, args, kwargs)
+
+
+def execute_write(work: Callable[..., T], *args, **kwargs) -> T:
+    """Run `work(tx, *args, **kwargs)` in a managed write transaction on the leader."""
+    return _execute(WRITE_ACCESS, work, args, kwargs)
+
+
+async def _aexecute(access_mode, work, args, kwargs):
+    _stats.acquire()
+    t0 = time.perf_counter()
+    waited = 0.0
+    ok = False
+    calls = 0
+
+    async def timed_work(tx, *a, **kw):
+        nonlocal waited, calls
+        calls += 1
+        if calls > 1:
+            _stats.retried()  # the driver is retrying the transaction
+        if not waited:
+            waited = time.perf_counter() - t0
+        return await work(tx, *a, **kw)
+
+    try:
+        async with get_async_driver().session(**_session_kwargs(access_mode)) as session:
+            if access_mode == READ_ACCESS:
+                result = await session.execute_read(timed_work, *args, **kwargs)
+            else:
+                result = await session.execute_write(timed_work, *args, **kwargs)
+        ok = True
+        return result
+    finally:
+        _stats.release(waited, ok)
+        _record(access_mode, ok)
+
+
+async def aexecute_read(work, *args, **kwargs):
+    """Async `execute_read`; `work` is a coroutine function taking an async transaction."""
+    return await _aexecute(READ_ACCESS, work, args, kwargs)
+
+
+async def aexecute_write(work, *args, **kwargs):
+    """Async `execute_write`; `work` is a coroutine function taking an async transaction."""
+    return await _aexecute(WRITE_ACCESS, work, args, kwargs)
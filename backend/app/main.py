@@ -1,16 +1,27 @@
 # backend/app/main.py
-import atexit
-import logging
+import time
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+_PROCESS_T0 = time.perf_counter()
 
-from app.api import routes_chat, routes_admin
-from app.core import config, logging as logging_config
-from app.db.neo4j_driver import init_neo4j, close_neo4j
+import atexit  # noqa: E402
+import logging  # noqa: E402
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+
+from app.api import routes_chat, routes_admin, routes_metrics  # noqa: E402
+from app.core import config, metrics, logging as logging_config  # noqa: E402
+from app.db.neo4j_driver import init_neo4j, close_neo4j, close_async_neo4j  # noqa: E402
+from app.utils.embeddings import shutdown_executor  # noqa: E402
+from app.utils.feedback import shutdown_feedback_writer  # noqa: E402
+from app.db.database import close_all as close_sqlite  # noqa: E402
+from app.services.ingest_jobs import shutdown_job_manager  # noqa: E402
+from app.services.warmup import start_prewarm  # noqa: E402
+from app.services.graph_service import start_index_refresh, stop_index_refresh  # noqa: E402
 
 logging_config.configure_logging()
 logger = logging.getLogger("medical-chatbot")
+logger.info("Imported application modules in %.2fs", time.perf_counter() - _PROCESS_T0)
 
 app = FastAPI(title="Medical Chatbot API", version="0.1.0")
 
@@ -21,10 +32,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
 
 # Include routers
 app.include_router(routes_chat.router, prefix="/api")
 app.include_router(routes_admin.router, prefix="/api/admin")
+app.include_router(routes_metrics.router)
 
 
 @app.on_event("startup")
@@ -32,12 +45,20 @@ async def startup_event():
     logger.info("Starting application...")
     init_neo4j()
     logger.info("Neo4j driver initialized.")
+    start_prewarm(_PROCESS_T0)
+    start_index_refresh()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down application...")
+    stop_index_refresh()
+    shutdown_job_manager()
+    shutdown_executor()
+    shutdown_feedback_writer()
+    close_sqlite()
     close_neo4j()
+    await close_async_neo4j()
     logger.info("Neo4j driver closed.")
 
 
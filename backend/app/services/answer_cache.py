@@ -0,0 +1,213 @@
+# backend/app/services/answer_cache.py
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("medical-chatbot.services.answer_cache")
+
+_ENTRY_OVERHEAD = 256  # rough per-entry bookkeeping cost in bytes
+
+
+def normalize_question(question: str) -> str:
+    q = re.sub(r"\s+", " ", question.strip().lower())
+    return q.rstrip("?!. ")
+
+
+class _Entry:
+    __slots__ = ("answer", "sources", "drugs", "embedding", "top_k", "created", "size")
+
+    def __init__(self, answer: str, sources: List[str], drugs: Set[str],
+                 embedding: Optional[np.ndarray], top_k: int):
+        self.answer = answer
+        self.sources = sources
+        self.drugs = drugs
+        self.embedding = embedding
+        self.top_k = top_k
+        self.created = time.monotonic()
+        self.size = (
+            _ENTRY_OVERHEAD + len(answer) + sum(len(s) for s in sources)
+            + (embedding.nbytes if embedding is not None else 0)
+        )
+
+
+class AnswerCache:
+    """
+    Cache of generated answers keyed by the normalized question (and top_k).
+
+    Lookups are exact first; with `similarity_threshold` > 0 a question whose
+    embedding is at least that cosine-similar to a cached one is also a hit.
+    Entries expire after `ttl` seconds, are evicted LRU-first when
+    `max_entries` or `max_bytes` is exceeded, and are dropped when an ingest
+    touches any drug they cite (`invalidate_drugs`).
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 32 * 1024 * 1024,
+                 ttl: float = 3600.0, similarity_threshold: float = 0.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_drug: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # stacked embeddings of entries, rebuilt lazily after changes
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: List[str] = []
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(question: str, top_k: int) -> str:
+        return f"{top_k}:{normalize_question(question)}"
+
+    def get(self, question: str, top_k: int) -> Optional[Tuple[str, List[str]]]:
+        key = self._key(question, top_k)
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return entry.answer, list(entry.sources)
+
+    def get_similar(self, embedding, top_k: int) -> Optional[Tuple[str, List[str]]]:
+        """Near-duplicate lookup; call after `get` missed. Counts a miss when nothing matches."""
+        with self._lock:
+            if self.similarity_threshold <= 0 or not self._entries:
+                self.misses += 1
+                return None
+            if self._matrix is None:
+                self._matrix_keys = [k for k, e in self._entries.items() if e.embedding is not None]
+                self._matrix = (
+                    np.stack([self._entries[k].embedding for k in self._matrix_keys])
+                    if self._matrix_keys else np.zeros((0, 0), dtype=np.float32)
+                )
+            if self._matrix.shape[0] == 0:
+                self.misses += 1
+                return None
+            q = _unit(embedding)
+            scores = self._matrix @ q
+            for idx in np.argsort(-scores):
+                if scores[idx] < self.similarity_threshold:
+                    break
+                key = self._matrix_keys[idx]
+                entry = self._live(key)
+                if entry is not None and entry.top_k == top_k:
+                    self._entries.move_to_end(key)
+                    self.similar_hits += 1
+                    return entry.answer, list(entry.sources)
+            self.misses += 1
+            return None
+
+    def put(self, question: str, top_k: int, answer: str, sources: List[str],
+            drugs: Iterable[str], embedding=None):
+        key = self._key(question, top_k)
+        emb = _unit(embedding) if embedding is not None and self.similarity_threshold > 0 else None
+        entry = _Entry(answer, list(sources), set(drugs), emb, top_k)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            for drug in entry.drugs:
+                self._by_drug.setdefault(drug, set()).add(key)
+            self._matrix = None
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_drugs(self, drug_names: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for drug in drug_names:
+                for key in list(self._by_drug.get(drug, ())):
+                    self._remove(key)
+                    removed += 1
+        if removed:
+            logger.info("Invalidated %d cached answers after ingest", removed)
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_drug.clear()
+            self._bytes = 0
+            self._matrix = None
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.similar_hits) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _live(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl > 0 and time.monotonic() - entry.created > self.ttl:
+            self._remove(key)
+            return None
+        return entry
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for drug in entry.drugs:
+            keys = self._by_drug.get(drug)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_drug[drug]
+        self._matrix = None
+
+
+def _unit(vec) -> np.ndarray:
+    v = np.asarray(vec, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
+
+
+# helper singleton
+_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    global _cache
+    if _cache is None:
+        _cache = AnswerCache(
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            max_bytes=settings.ANSWER_CACHE_MAX_BYTES,
+            ttl=settings.ANSWER_CACHE_TTL,
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY,
+        )
+    return _cache
+
+
+def _collect_metrics():
+    if _cache is None:
+        return
+    stats = _cache.stats()
+    yield "answer_cache_lookups_total", "counter", "Answer cache lookups by result.", [
+        ({"result": "exact_hit"}, stats["exact_hits"]),
+        ({"result": "similar_hit"}, stats["similar_hits"]),
+        ({"result": "miss"}, stats["misses"]),
+    ]
+    yield "answer_cache_entries", "gauge", "Answers currently cached.", [({}, stats["entries"])]
+
+
+metrics.register_collector(_collect_metrics)
@@ -0,0 +1,167 @@
+# backend/app/services/context_builder.py
+"""
+Packs retrieved drugs into the LLM prompt under a token budget.
+
+Drugs are ordered by maximal marginal relevance over their embeddings, so
+near-duplicate products do not crowd out different ones. Uses and side
+effects shared by several drugs are stated once on a grouped line instead
+of being repeated per drug. Drugs are then added greedily while the rendered
+context stays within RAG_CONTEXT_TOKENS, counted with the target model's
+tokenizer (tiktoken) when available.
+"""
+import asyncio
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger("medical-chatbot.services.context_builder")
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+# helper singleton: tiktoken encoding, False once it is known to be unavailable
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        # concurrent first requests wait for one load instead of each fetching the file
+        with _encoding_lock:
+            if _encoding is None:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding(settings.RAG_TOKEN_ENCODING)
+                except Exception as e:
+                    # not installed, or the encoding file cannot be fetched
+                    logger.warning("tiktoken encoding %s unavailable (%s); using approximate token counts",
+                                   settings.RAG_TOKEN_ENCODING, e)
+                    _encoding = False
+    return _encoding or None
+
+
+def load_encoding():
+    """Load the tiktoken encoding now; its first use may download the BPE file."""
+    _get_encoding()
+
+
+async def aload_encoding():
+    """Load the tiktoken encoding off the event loop if it is not loaded yet."""
+    if _encoding is None:
+        await asyncio.get_running_loop().run_in_executor(None, _get_encoding)
+
+
+def count_tokens(text: str) -> int:
+    """Tokens of `text` for the target model; ~4 characters per token per word without tiktoken."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum((len(w) + 3) // 4 for w in _WORD_RE.findall(text))
+
+
+def mmr_order(scores: Sequence[float], embeddings: Optional[np.ndarray], lam: float) -> List[int]:
+    """
+    Indices of the hits in maximal-marginal-relevance order: each pick
+    maximizes lam * relevance - (1 - lam) * max similarity to earlier picks.
+    Without embeddings the retrieval order is kept.
+    """
+    n = len(scores)
+    if embeddings is None or n < 3 or lam >= 1.0:
+        return list(range(n))
+    rel = np.asarray(scores, dtype=np.float32)
+    spread = float(rel.max() - rel.min())
+    rel = (rel - rel.min()) / spread if spread > 0 else np.ones(n, dtype=np.float32)
+    sim = embeddings @ embeddings.T
+
+    order = [int(np.argmax(rel))]
+    max_sim = sim[order[0]].copy()
+    remaining = np.ones(n, dtype=bool)
+    remaining[order[0]] = False
+    while remaining.any():
+        gain = lam * rel - (1.0 - lam) * max_sim
+        gain[~remaining] = -np.inf
+        pick = int(np.argmax(gain))
+        order.append(pick)
+        remaining[pick] = False
+        max_sim = np.maximum(max_sim, sim[pick])
+    return order
+
+
+def _grouped(kind: str, facts: Dict[str, List[str]], names: List[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    Split per-drug fact lists into facts unique to one drug and grouped lines
+    for facts shared by several, e.g. "Side effects of A, B: Nausea".
+    """
+    holders: Dict[str, List[str]] = {}
+    for name in names:
+        for fact in dict.fromkeys(facts.get(name, [])):
+            holders.setdefault(fact, []).append(name)
+    own: Dict[str, List[str]] = {name: [] for name in names}
+    shared: Dict[Tuple[str, ...], List[str]] = {}
+    for fact, drugs in holders.items():
+        if len(drugs) == 1:
+            own[drugs[0]].append(fact)
+        else:
+            shared.setdefault(tuple(drugs), []).append(fact)
+    lines = [f"{kind} of {', '.join(drugs)}: {', '.join(values)}" for drugs, values in shared.items()]
+    return own, lines
+
+
+def render(drugs: List[Dict[str, Any]]) -> List[str]:
+    """Context lines for `drugs` (dicts with name, score, description, conditions, side_effects, related)."""
+    names = [d["name"] for d in drugs]
+    uses, shared_uses = _grouped("Uses", {d["name"]: d["conditions"] for d in drugs}, names)
+    effects, shared_effects = _grouped("Side effects", {d["name"]: d["side_effects"] for d in drugs}, names)
+    included = set(names)
+    lines = []
+    for d in drugs:
+        name = d["name"]
+        lines.append(f"Drug: {name} (score={d['score']:.3f}) - {d['description']}")
+        if uses[name]:
+            lines.append(f"Uses of {name}: {', '.join(uses[name])}")
+        if effects[name]:
+            lines.append(f"Side effects of {name}: {', '.join(effects[name])}")
+        related = [r for r in d["related"] if r not in included]
+        if related:
+            lines.append(f"Other drugs for the same condition as {name}: {', '.join(related)}")
+    return lines + shared_uses + shared_effects
+
+
+def build_context(hits: List[dict], graph_context: dict, embeddings: Optional[np.ndarray] = None,
+                  max_tokens: Optional[int] = None) -> Tuple[List[str], List[str], int]:
+    """
+    Returns (context_lines, names of the drugs included, context tokens).
+    A drug that does not fit whole is retried without side effects and
+    related drugs; the top drug is always included, if need be over budget.
+    """
+    budget = settings.RAG_CONTEXT_TOKENS if max_tokens is None else max_tokens
+    order = mmr_order([h["score"] for h in hits], embeddings, settings.RAG_MMR_LAMBDA)
+
+    chosen: List[Dict[str, Any]] = []
+    lines: List[str] = []
+    tokens = 0
+    for i in order:
+        hit = hits[i]
+        ctx = graph_context.get(hit["name"], {})
+        drug = {
+            "name": hit["name"],
+            "score": hit["score"],
+            "description": ctx.get("description") or hit.get("description") or "",
+            "conditions": ctx.get("conditions") or [],
+            "side_effects": ctx.get("side_effects") or [],
+            "related": ctx.get("related") or [],
+        }
+        options = (drug, dict(drug, side_effects=[], related=[]))
+        for candidate in options:
+            candidate_lines = render(chosen + [candidate])
+            candidate_tokens = count_tokens("\n".join(candidate_lines))
+            if candidate_tokens <= budget or (not chosen and candidate is options[-1]):
+                chosen.append(candidate)
+                lines, tokens = candidate_lines, candidate_tokens
+                break
+    return lines, [d["name"] for d in chosen], tokens
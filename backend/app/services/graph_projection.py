@@ -0,0 +1,147 @@
+# backend/app/services/graph_projection.py
+"""
+Read-only in-memory projection of the Drug-[:TREATS]->Condition and
+Drug-[:HAS_SIDE_EFFECT]->SideEffect graph, so structural lookups ("side
+effects of X", "drugs for Y", "drugs sharing side effects with Z") need no
+Neo4j round trip. Neo4j stays the source of truth: graph_service builds the
+projection from it and rebuilds it after ingests.
+
+Node names are interned to dense int ids per label, and each relationship
+type is stored as CSR adjacency (indptr / indices arrays) in both
+directions, so a lookup is a dict hit plus an array slice.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("medical-chatbot.services.graph_projection")
+
+
+def _intern(names: Iterable[str], ids: Dict[str, int], table: List[str]) -> List[int]:
+    out = []
+    for name in names:
+        i = ids.get(name)
+        if i is None:
+            i = ids[name] = len(table)
+            table.append(name)
+        out.append(i)
+    return out
+
+
+class _Csr:
+    """Adjacency of `n` source nodes: neighbours of i are indices[indptr[i]:indptr[i + 1]]."""
+
+    __slots__ = ("indptr", "indices")
+
+    def __init__(self, sources: np.ndarray, targets: np.ndarray, n: int):
+        order = np.argsort(sources, kind="stable")  # keeps each node's edge order
+        self.indices = targets[order].astype(np.int32)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=self.indptr[1:])
+
+    def neighbours(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes
+
+
+class GraphProjection:
+    """
+    Immutable snapshot of the drug graph. Build it with per-drug lists of
+    condition and side-effect names; unknown names return empty results.
+    """
+
+    def __init__(self, drugs: Sequence[str], conditions: Sequence[Sequence[str]],
+                 side_effects: Sequence[Sequence[str]]):
+        self._drug_ids: Dict[str, int] = {}
+        self._drugs: List[str] = []
+        self._condition_ids: Dict[str, int] = {}
+        self._conditions: List[str] = []
+        self._effect_ids: Dict[str, int] = {}
+        self._effects: List[str] = []
+
+        treats: Tuple[List[int], List[int]] = ([], [])
+        has_effect: Tuple[List[int], List[int]] = ([], [])
+        for name, drug_conditions, drug_effects in zip(drugs, conditions, side_effects):
+            d = _intern([name], self._drug_ids, self._drugs)[0]
+            for edges, targets, ids, table in ((treats, drug_conditions, self._condition_ids, self._conditions),
+                                               (has_effect, drug_effects, self._effect_ids, self._effects)):
+                interned = _intern(dict.fromkeys(targets or ()), ids, table)
+                edges[0].extend([d] * len(interned))
+                edges[1].extend(interned)
+
+        def arrays(edges):
+            return np.asarray(edges[0], dtype=np.int32), np.asarray(edges[1], dtype=np.int32)
+
+        src, dst = arrays(treats)
+        self._treats = _Csr(src, dst, len(self._drugs))
+        self._treated_by = _Csr(dst, src, len(self._conditions))
+        src, dst = arrays(has_effect)
+        self._has_effect = _Csr(src, dst, len(self._drugs))
+        self._effect_of = _Csr(dst, src, len(self._effects))
+
+    @classmethod
+    def from_records(cls, records) -> "GraphProjection":
+        """From rows with "name", "conditions" and "side_effects" (one per drug)."""
+        records = list(records)
+        return cls([r["name"] for r in records], [r["conditions"] for r in records],
+                   [r["side_effects"] for r in records])
+
+    def __len__(self) -> int:
+        return len(self._drugs)
+
+    def __contains__(self, drug: str) -> bool:
+        return drug in self._drug_ids
+
+    @property
+    def drug_names(self) -> List[str]:
+        return list(self._drugs)
+
+    @property
+    def condition_names(self) -> List[str]:
+        return list(self._conditions)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the adjacency arrays (the interned name tables come on top)."""
+        return sum(csr.nbytes for csr in (self._treats, self._treated_by, self._has_effect, self._effect_of))
+
+    @staticmethod
+    def _lookup(name: str, ids: Dict[str, int], csr: _Csr, table: List[str], limit: Optional[int]) -> List[str]:
+        i = ids.get(name)
+        if i is None:
+            return []
+        return [table[j] for j in csr.neighbours(i)[:limit]]
+
+    def conditions(self, drug: str) -> List[str]:
+        return self._lookup(drug, self._drug_ids, self._treats, self._conditions, None)
+
+    def side_effects(self, drug: str, limit: Optional[int] = None) -> List[str]:
+        return self._lookup(drug, self._drug_ids, self._has_effect, self._effects, limit)
+
+    def drugs_treating(self, condition: str, limit: Optional[int] = None) -> List[str]:
+        return self._lookup(condition, self._condition_ids, self._treated_by, self._drugs, limit)
+
+    def drugs_with_side_effect(self, effect: str, limit: Optional[int] = None) -> List[str]:
+        return self._lookup(effect, self._effect_ids, self._effect_of, self._drugs, limit)
+
+    def drugs_sharing_side_effects(self, drug: str, top_k: int = 10) -> List[Tuple[str, int]]:
+        """Other drugs with the most side effects in common with `drug`, as (name, shared count)."""
+        d = self._drug_ids.get(drug)
+        if d is None or top_k <= 0:
+            return []
+        effects = self._has_effect.neighbours(d)
+        if len(effects) == 0:
+            return []
+        others = np.concatenate([self._effect_of.neighbours(e) for e in effects])
+        counts = np.bincount(others, minlength=len(self._drugs))
+        counts[d] = 0
+        candidates = np.flatnonzero(counts)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-counts[candidates], top_k - 1)[:top_k]]
+        # most shared first, ties in drug-id order
+        ranked = sorted(candidates.tolist(), key=lambda i: (-counts[i], i))
+        return [(self._drugs[i], int(counts[i])) for i in ranked]
@@ -1,26 +1,100 @@
 # backend/app/services/graph_service.py
+import asyncio
+import hashlib
 import logging
 import csv
 import os
-from typing import List, Dict, Any
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Callable
 import numpy as np
-from app.db.neo4j_driver import get_driver
-from app.utils.preprocess import load_drug_dataframe
-from app.utils.embeddings import embed_texts
+from neo4j.exceptions import ClientError, Neo4jError
+from app.db.neo4j_driver import execute_read, execute_write, aexecute_read
+from app.utils.preprocess import iter_drug_dataframes, build_drug_records
+from app.utils.embeddings import embed_texts, embedding_namespace
+from app.utils.embedding_pool import EmbeddingPool
+from app.services.vector_index import VectorIndex
+from app.services.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from app.services.graph_projection import GraphProjection
+from app.services.ingest_pipeline import run_pipeline
+from app.services import index_snapshot
 from app.core.config import settings
 
 logger = logging.getLogger("medical-chatbot.services.graph_service")
 
+# In-process vector index, built from Neo4j on first use
+_vector_index: Optional[VectorIndex] = None
+_vector_index_lock = threading.Lock()
+# In-memory BM25 index over drug names, uses and side effects, built the same way
+_lexical_index: Optional[LexicalIndex] = None
+_lexical_index_lock = threading.Lock()
+# Multi-worker mode (INDEX_SNAPSHOT_DIR): generation of the shared snapshot the
+# indexes above were loaded from, and drugs ingested here but not yet published
+_snapshot_generation = 0
+_unpublished: List[str] = []
+_refresh_stop = threading.Event()
+# VECTOR_SEARCH_BACKEND="neo4j": whether the server's vector index is usable;
+# None until checked, False sends vector search to the in-process index
+_neo4j_vector_ready: Optional[bool] = None
+_neo4j_vector_lock = threading.Lock()
+# Read-only projection of the drug graph for structural lookups; rebuilt after
+# ingests (stale = the graph changed since it was built)
+_graph_projection: Optional[GraphProjection] = None
+_graph_projection_lock = threading.Lock()
+_graph_projection_stale = False
 
-def _create_constraints(session):
+# Callbacks notified with the drug names of every committed ingest chunk
+_ingest_listeners: List[Callable[[List[str]], None]] = []
+
+
+def add_ingest_listener(callback: Callable[[List[str]], None]):
+    """Register `callback(drug_names)`, called after each ingest chunk is committed."""
+    if callback not in _ingest_listeners:
+        _ingest_listeners.append(callback)
+
+
+def _notify_ingested(drug_names: List[str]):
+    global _graph_projection_stale
+    _graph_projection_stale = True
+    for callback in _ingest_listeners:
+        try:
+            callback(drug_names)
+        except Exception:
+            logger.exception("Ingest listener %r failed", callback)
+
+
+_CONSTRAINTS = [
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (d:Drug) REQUIRE (d.name) IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (s:SideEffect) REQUIRE (s.name) IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Condition) REQUIRE (c.name) IS UNIQUE",
+]
+
+
+def _run_tx(tx, query: str, **params):
+    tx.run(query, **params).consume()
+
+
+def _fetch_tx(tx, query: str, **params) -> list:
+    return list(tx.run(query, **params))
+
+
+async def _afetch_tx(tx, query: str, **params) -> list:
+    res = await tx.run(query, **params)
+    return [r async for r in res]
+
+
+def _create_constraints():
     """
     Create uniqueness constraints for nodes we use (Neo4j 5+ syntax).
     Uses FOR / REQUIRE instead of ON / ASSERT.
     """
     try:
-        session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (d:Drug) REQUIRE (d.name) IS UNIQUE")
-        session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (s:SideEffect) REQUIRE (s.name) IS UNIQUE")
-        session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (c:Condition) REQUIRE (c.name) IS UNIQUE")
+        for statement in _CONSTRAINTS:
+            execute_write(_run_tx, statement)
     except Exception as e:
         # log and re-raise if needed; keep behavior tolerant (sometimes constraints already exist)
         import logging
@@ -30,132 +104,1045 @@ def _create_constraints(session):
 
 
 
-def ingest_drug_file(path: str) -> int:
+_UPSERT_DRUGS = """
+UNWIND $rows AS row
+MERGE (d:Drug {name: row.name})
+SET d.description = coalesce(d.description, row.description),
+    d.embedding_blob = row.embedding_blob,
+    d.embedding_dtype = $embedding_dtype,
+    d.embedding = row.embedding,
+    d.row_hashes = CASE WHEN d.ingest_run = $ingest_run
+                        THEN coalesce(d.row_hashes, [d.content_hash]) + row.content_hash END,
+    d.content_hash = row.content_hash,
+    d.ingest_run = $ingest_run
+"""
+
+# a drug listed on several rows of one ingest collects its row hashes in d.row_hashes;
+# once the ingest ends they are folded into its content_hash (see _drug_hash)
+_MULTI_ROW_HASHES = "MATCH (d:Drug) WHERE d.row_hashes IS NOT NULL RETURN d.name AS name, d.row_hashes AS row_hashes"
+
+_SET_CONTENT_HASHES = """
+UNWIND $rows AS row
+MATCH (d:Drug {name: row.name})
+SET d.content_hash = row.content_hash
+REMOVE d.row_hashes
+"""
+
+# partitioned writes: shared nodes are created up front in one transaction, then
+# each partition only links its own drugs to them
+_MERGE_SHARED_NODES = """
+UNWIND $conditions AS name
+MERGE (:Condition {name: name})
+WITH count(*) AS done
+UNWIND $effects AS name
+MERGE (:SideEffect {name: name})
+"""
+
+_LINK_CONDITIONS = """
+UNWIND $rows AS row
+MATCH (d:Drug {name: row.drug})
+MATCH (c:Condition {name: row.condition})
+MERGE (d)-[:TREATS]->(c)
+"""
+
+_LINK_SIDE_EFFECTS = """
+UNWIND $rows AS row
+MATCH (d:Drug {name: row.drug})
+MATCH (s:SideEffect {name: row.effect})
+MERGE (d)-[:HAS_SIDE_EFFECT]->(s)
+"""
+
+# delta ingest: a changed drug loses its old edges and description before it is rewritten
+_CLEAR_DRUGS = """
+UNWIND $names AS name
+MATCH (d:Drug {name: name})
+SET d.description = null
+WITH d
+OPTIONAL MATCH (d)-[r:TREATS|HAS_SIDE_EFFECT]->()
+DELETE r
+"""
+
+_DELETE_DRUGS = """
+UNWIND $names AS name
+MATCH (d:Drug {name: name})
+DETACH DELETE d
+"""
+
+_DELETE_ORPHANS = {
+    label: f"""
+    MATCH (n:{label}) WHERE NOT (n)--()
+    WITH n LIMIT $limit
+    DELETE n
+    RETURN count(*) AS deleted
+    """
+    for label in ("Condition", "SideEffect")
+}
+
+_CONTENT_HASHES = "MATCH (d:Drug) RETURN d.name AS name, d.content_hash AS content_hash"
+
+_UPSERT_CONDITIONS = """
+UNWIND $rows AS row
+MATCH (d:Drug {name: row.drug})
+MERGE (c:Condition {name: row.condition})
+MERGE (d)-[:TREATS]->(c)
+"""
+
+_UPSERT_SIDE_EFFECTS = """
+UNWIND $rows AS row
+MATCH (d:Drug {name: row.drug})
+MERGE (s:SideEffect {name: row.effect})
+MERGE (d)-[:HAS_SIDE_EFFECT]->(s)
+"""
+
+def _split_effects(effects: str) -> List[str]:
+    return [x.strip() for x in effects.split(",") if x.strip()]
+
+
+def _chunk_params(meta_rows: List[Dict[str, Any]], embeddings) -> Dict[str, List[Dict[str, Any]]]:
+    drugs, conditions, side_effects = [], [], []
+    store_list = settings.NEO4J_STORE_EMBEDDING_LIST or settings.VECTOR_SEARCH_BACKEND == "neo4j"
+    for meta, emb in zip(meta_rows, embeddings):
+        drug = meta["drug"]
+        drugs.append({
+            "name": drug,
+            "description": meta["review"][:1000],
+            "embedding_blob": encode_embedding(emb),
+            # the float-list property is only kept when requested or indexed by Neo4j; null removes it
+            "embedding": emb.astype(float).tolist() if store_list else None,
+            "content_hash": meta.get("hash"),
+        })
+        if meta["condition"]:
+            conditions.append({"drug": drug, "condition": meta["condition"]})
+        if meta["effects"]:
+            side_effects.extend({"drug": drug, "effect": e} for e in _split_effects(meta["effects"]))
+    return {"drugs": drugs, "conditions": conditions, "side_effects": side_effects}
+
+
+def encode_embedding(embedding) -> bytes:
+    """Pack one embedding as raw bytes of EMBEDDING_STORAGE_DTYPE (float32 or float16)."""
+    return np.asarray(embedding).astype(settings.EMBEDDING_STORAGE_DTYPE).tobytes()
+
+
+def decode_embeddings(blobs: List[bytes], dtype: str) -> np.ndarray:
+    """Decode equally sized packed embeddings straight into one contiguous float32 matrix."""
+    if not blobs:
+        return np.zeros((0, 0), dtype=np.float32)
+    packed = np.frombuffer(b"".join(blobs), dtype=dtype)
+    return packed.reshape(len(blobs), -1).astype(np.float32)
+
+
+def _write_chunk_tx(tx, params: Dict[str, List[Dict[str, Any]]], clear: List[str] = (), link_only: bool = False,
+                    run: str = ""):
+    if clear:
+        tx.run(_CLEAR_DRUGS, names=list(clear)).consume()
+    tx.run(_UPSERT_DRUGS, rows=params["drugs"], embedding_dtype=settings.EMBEDDING_STORAGE_DTYPE,
+           ingest_run=run).consume()
+    if params["conditions"]:
+        tx.run(_LINK_CONDITIONS if link_only else _UPSERT_CONDITIONS, rows=params["conditions"]).consume()
+    if params["side_effects"]:
+        tx.run(_LINK_SIDE_EFFECTS if link_only else _UPSERT_SIDE_EFFECTS, rows=params["side_effects"]).consume()
+
+
+def _partition(params: Dict[str, List[Dict[str, Any]]], clear: List[str], partitions: int):
+    """Split chunk params by a hash of the drug name, so no two partitions touch the same Drug node."""
+    def part_of(name: str) -> int:
+        return zlib.crc32(name.encode("utf-8")) % partitions
+
+    parts = [({"drugs": [], "conditions": [], "side_effects": []}, []) for _ in range(partitions)]
+    for row in params["drugs"]:
+        parts[part_of(row["name"])][0]["drugs"].append(row)
+    for key in ("conditions", "side_effects"):
+        # a fixed order of the shared endpoints makes lock cycles between partitions rare
+        target = "condition" if key == "conditions" else "effect"
+        for row in sorted(params[key], key=lambda r: r[target]):
+            parts[part_of(row["drug"])][0][key].append(row)
+    for name in clear:
+        parts[part_of(name)][1].append(name)
+    return [p for p in parts if p[0]["drugs"]]
+
+
+def _write_chunk(meta_rows: List[Dict[str, Any]], embeddings, clear: List[str] = (),
+                 writers: Optional[ThreadPoolExecutor] = None, run: str = "") -> int:
+    """
+    Write one chunk of drugs (with their conditions and side-effect edges) in its
+    own transaction. The managed transaction retries transient errors for up to
+    NEO4J_MAX_TRANSACTION_RETRY_TIME, so a failure never replays previously
+    committed chunks.
+    Drugs in `clear` first lose their existing edges (delta ingest). `run`
+    identifies the ingest, so rows of one drug spread over several chunks are
+    hashed together.
+
+    With `writers` (INGEST_WRITE_PARTITIONS > 1) the chunk's Condition and
+    SideEffect nodes are merged first, then the drugs are split by name into
+    partitions written in concurrent transactions. Deadlocks between them are
+    transient errors and are retried like any other.
+    """
+    params = _chunk_params(meta_rows, embeddings)
+    if writers is None:
+        execute_write(_write_chunk_tx, params, clear, False, run)
+        return len(meta_rows)
+
+    execute_write(
+        _run_tx, _MERGE_SHARED_NODES,
+        conditions=sorted({r["condition"] for r in params["conditions"]}),
+        effects=sorted({r["effect"] for r in params["side_effects"]}),
+    )
+    futures = [
+        writers.submit(execute_write, _write_chunk_tx, part, part_clear, True, run)
+        for part, part_clear in _partition(params, list(clear), settings.INGEST_WRITE_PARTITIONS)
+    ]
+    for future in futures:
+        future.result()
+    return len(meta_rows)
+
+
+def _prepare_chunk(df) -> Dict[str, Any]:
+    meta_rows, texts = build_drug_records(df)
+    namespace = embedding_namespace()
+    for meta, text in zip(meta_rows, texts):
+        meta["hash"] = _digest(f"{namespace}\0{text}")
+    return {"meta": meta_rows, "texts": texts}
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _embed_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    chunk["embeddings"] = embed_texts(chunk.pop("texts"), as_array=True)
+    return chunk
+
+
+def _submit_embeddings(chunks, pool: EmbeddingPool):
+    for chunk in chunks:
+        chunk["embeddings"] = pool.submit(chunk.pop("texts"))
+        yield chunk
+
+
+def _await_embeddings(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    chunk["embeddings"] = chunk["embeddings"].result()
+    return chunk
+
+
+def _store_chunk(chunk: Dict[str, Any], writers: Optional[ThreadPoolExecutor] = None,
+                 run: str = "") -> Dict[str, Any]:
+    meta_rows = chunk["meta"]
+    clear = chunk.get("clear", [])
+    _write_chunk(meta_rows, chunk["embeddings"], clear, writers, run)
+    if len(meta_rows):
+        # creates the Neo4j vector index with the first chunk (no-op for the in-process backend)
+        use_neo4j_vector_index(chunk["embeddings"].shape[1])
+    if clear:
+        # rewritten from scratch below, not merged with the old terms / description
+        for index in (_vector_index, _lexical_index):
+            if index is not None:
+                index.remove(clear)
+    if _vector_index is not None:
+        _vector_index.upsert(
+            [m["drug"] for m in meta_rows],
+            chunk["embeddings"],
+            [m["review"][:1000] for m in meta_rows],
+        )
+    if _lexical_index is not None:
+        _lexical_index.upsert(
+            [m["drug"] for m in meta_rows],
+            [m["condition"] for m in meta_rows],
+            [m["effects"] for m in meta_rows],
+        )
+    if index_snapshot.enabled():
+        _unpublished.extend(m["drug"] for m in meta_rows)
+    _notify_ingested([m["drug"] for m in meta_rows])
+    return chunk
+
+
+def _log_progress(stats: Dict[str, Dict[str, Any]]):
+    logger.info(
+        "Ingest progress: %s",
+        ", ".join(f"{name} {s['rows']} rows ({s['rows_per_sec']:.0f} rows/s)" for name, s in stats.items()),
+    )
+
+
+def _run_ingest(chunks, progress: Optional[Callable[[Dict[str, Dict[str, Any]]], None]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Run chunks through embed -> write. With INGEST_EMBED_PROCESSES > 0 chunks
+    are submitted to an EmbeddingPool as they are read, and the embed stage
+    only collects results in order, so up to that many chunks encode at once.
+    INGEST_WRITE_PARTITIONS > 1 writes each chunk in concurrent partitions.
+    Drugs written on several rows get their combined content hash at the end.
+    """
+    def report(stats):
+        _log_progress(stats)
+        if progress is not None:
+            progress(stats)
+
+    processes = settings.INGEST_EMBED_PROCESSES
+    partitions = settings.INGEST_WRITE_PARTITIONS
+    run = uuid.uuid4().hex
+    pool = EmbeddingPool(processes) if processes > 0 else None
+    writers = ThreadPoolExecutor(partitions, thread_name_prefix="ingest-writer") if partitions > 1 else None
+    try:
+        return run_pipeline(
+            _submit_embeddings(chunks, pool) if pool else chunks,
+            [("embed", _await_embeddings if pool else _embed_chunk),
+             ("write", partial(_store_chunk, writers=writers, run=run))],
+            count=lambda chunk: len(chunk["meta"]),
+            # chunks queued behind the embed stage are the ones encoding in the pool
+            queue_size=max(settings.INGEST_QUEUE_SIZE, processes),
+            progress=report,
+        )
+    finally:
+        if writers is not None:
+            writers.shutdown(wait=True)
+        if pool is not None:
+            pool.shutdown()
+        # also after a failed or cancelled ingest, for the chunks it committed
+        try:
+            _finalize_content_hashes()
+        except Exception:
+            logger.exception("Could not finalize content hashes of multi-row drugs")
+        _refresh_graph_projection()
+
+
+def ingest_drug_file(path: str, progress: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None) -> int:
     """
     Read dataset at `path` and create nodes/edges in Neo4j.
     Expected columns from CSV: Medicine Name, Uses, Side_effects, Excellent Review %, Average Review %, Poor Review %
-    This function:
-    - loads dataframe
+    This function streams the file through a read -> embed -> write pipeline:
+    - reads INGEST_BATCH_SIZE rows at a time
     - generates a small textual description per row
-    - computes embeddings
+    - computes embeddings for the chunk
     - creates (Drug) nodes, (Condition) nodes, (SideEffect) nodes, and relationships
+      with UNWIND statements, committing once per chunk
+    Stages overlap and at most INGEST_QUEUE_SIZE chunks wait between them, so
+    memory stays flat regardless of file size. `progress` receives per-stage
+    stats (rows, rows/s) after every committed chunk. Each Drug node stores the
+    same content_hash a later delta ingest compares against.
     """
-    df = load_drug_dataframe(path)
-    if df is None or df.shape[0] == 0:
-        raise RuntimeError("No rows found in data file.")
+    _create_constraints()
+    if index_snapshot.enabled():
+        # load the shared indexes now so chunks update them and the result can be published
+        get_vector_index()
 
-    texts = []
-    meta_rows = []
-
-    for _, row in df.iterrows():
-        drug = str(row.get("Medicine Name", "")).strip()
-        cond = str(row.get("Uses", "")).strip()
-        effects = str(row.get("Side_effects", "")).strip()
-        # For description, we can include reviews as well
-        review = str(row.get("Excellent Review %", "")) + "%" if "Excellent Review %" in row else ""
-        desc = " | ".join(filter(None, [drug, cond, review, effects]))
-
-        texts.append(desc)
-        meta_rows.append({
-            "drug": drug,
-            "condition": cond,
-            "effects": effects,
-            "review": review
-        })
-
-    embeddings = embed_texts(texts)
-
-    driver = get_driver()
-    with driver.session() as session:
-        _create_constraints(session)
-        tx = session.begin_transaction()
-        count = 0
-
-        for meta, emb in zip(meta_rows, embeddings):
-            drug = meta["drug"]
-            cond = meta["condition"] or None
-            effects = meta["effects"] or None
-
-            # Create drug node
-            tx.run(
-                """
-                MERGE (d:Drug {name: $name})
-                SET d.description = coalesce(d.description, $desc),
-                    d.embedding = $embedding
-                """,
-                name=drug,
-                desc=meta["review"][:1000],
-                embedding=list(map(float, emb)),
-            )
-
-            # Create condition node and relationship
-            if cond:
-                tx.run(
-                    """
-                    MERGE (c:Condition {name: $cname})
-                    MERGE (d:Drug {name: $dname})
-                    MERGE (d)-[:TREATS]->(c)
-                    """,
-                    cname=cond,
-                    dname=drug,
-                )
-
-            # Create side effect nodes and relationships
-            if effects:
-                for e in [x.strip() for x in effects.split(",") if x.strip()]:
-                    tx.run(
-                        """
-                        MERGE (s:SideEffect {name: $sname})
-                        MERGE (d:Drug {name: $dname})
-                        MERGE (d)-[:HAS_SIDE_EFFECT]->(s)
-                        """,
-                        sname=e,
-                        dname=drug,
-                    )
-
-            count += 1
-
-        tx.commit()
+    batch_size = max(1, settings.INGEST_BATCH_SIZE)
+    chunks = (_prepare_chunk(df) for df in iter_drug_dataframes(path, batch_size))
+    stats = _run_ingest(chunks, progress)
+    count = stats["write"]["rows"]
+    if count == 0:
+        raise RuntimeError("No rows found in data file.")
 
     logger.info(f"Ingested {count} rows into Neo4j.")
+    if index_snapshot.enabled():
+        publish_shared_indexes()
     return count
 
+
+def _drug_hash(row_hashes: List[str]) -> str:
+    """Content hash of one drug from the hashes of its rows, in file order."""
+    return row_hashes[0] if len(row_hashes) == 1 else _digest("\0".join(row_hashes))
+
+
+def _file_hashes(path: str, batch_size: int) -> Dict[str, str]:
+    """Content hash per drug in the file, as stored on its Drug node by full and delta ingests."""
+    hashes: Dict[str, List[str]] = {}
+    for df in iter_drug_dataframes(path, batch_size):
+        for meta in _prepare_chunk(df)["meta"]:
+            hashes.setdefault(meta["drug"], []).append(meta["hash"])
+    return {name: _drug_hash(h) for name, h in hashes.items()}
+
+
+def _finalize_content_hashes():
+    """Fold the row hashes collected on multi-row drugs into their content_hash."""
+    rows = execute_read(_fetch_tx, _MULTI_ROW_HASHES)
+    if rows:
+        execute_write(_run_tx, _SET_CONTENT_HASHES,
+                      rows=[{"name": r["name"], "content_hash": _drug_hash(r["row_hashes"])} for r in rows])
+
+
+def _remove_drugs(names: List[str], batch_size: int):
+    try:
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            execute_write(_run_tx, _DELETE_DRUGS, names=batch)
+            for index in (_vector_index, _lexical_index):
+                if index is not None:
+                    index.remove(batch)
+            if index_snapshot.enabled():
+                _unpublished.extend(batch)
+            _notify_ingested(batch)
+    finally:
+        _refresh_graph_projection()
+
+
+def _delete_orphans(batch_size: int) -> int:
+    """Delete Condition / SideEffect nodes no drug points to any more, `batch_size` per transaction."""
+    deleted = 0
+    for query in _DELETE_ORPHANS.values():
+        while True:
+            res = execute_write(_fetch_tx, query, limit=batch_size)
+            n = res[0]["deleted"] if res else 0
+            deleted += n
+            if n < batch_size:
+                break
+    return deleted
+
+
+def ingest_drug_file_delta(path: str,
+                           progress: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None) -> Dict[str, Any]:
+    """
+    Bring the graph in line with the dataset at `path`, touching only what changed.
+
+    Each drug's rows are hashed (together with the embedding model) and compared
+    with the content_hash stored on its Drug node. Added and changed drugs go
+    through the normal embed -> write pipeline; changed ones lose their old
+    edges first, so side effects dropped from the file disappear. Drugs missing
+    from the file are deleted in batches of INGEST_BATCH_SIZE, followed by the
+    Condition / SideEffect nodes left without edges. Returns a report with
+    added / changed / unchanged / removed drug counts.
+    """
+    started = time.perf_counter()
+    _create_constraints()
+    if index_snapshot.enabled():
+        get_vector_index()
+
+    batch_size = max(1, settings.INGEST_BATCH_SIZE)
+    file_hashes = _file_hashes(path, batch_size)
+    if not file_hashes:
+        # never treat an empty or unreadable file as "every drug was removed"
+        raise RuntimeError("No rows found in data file.")
+    stored = {r["name"]: r["content_hash"] for r in execute_read(_fetch_tx, _CONTENT_HASHES)}
+
+    added = [name for name in file_hashes if name not in stored]
+    changed = [name for name, h in file_hashes.items() if name in stored and stored[name] != h]
+    removed = [name for name in stored if name not in file_hashes]
+    todo = set(added).union(changed)
+    to_clear = set(changed)
+
+    def select(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        keep = [i for i, meta in enumerate(chunk["meta"]) if meta["drug"] in todo]
+        meta_rows = [chunk["meta"][i] for i in keep]
+        # only the first chunk holding a changed drug clears it; later rows add to it
+        clear = [name for name in dict.fromkeys(m["drug"] for m in meta_rows) if name in to_clear]
+        to_clear.difference_update(clear)
+        return {"meta": meta_rows, "texts": [chunk["texts"][i] for i in keep], "clear": clear}
+
+    written = 0
+    if todo:
+        chunks = (c for c in (select(_prepare_chunk(df)) for df in iter_drug_dataframes(path, batch_size)) if c["meta"])
+        written = _run_ingest(chunks, progress).get("write", {}).get("rows", 0)
+    _remove_drugs(removed, batch_size)
+    orphans = _delete_orphans(batch_size) if changed or removed else 0
+
+    report = {
+        "added": len(added),
+        "changed": len(changed),
+        "unchanged": len(file_hashes) - len(todo),
+        "removed": len(removed),
+        "rows_written": written,
+        "orphans_removed": orphans,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info("Delta ingest of %s: %s", path, report)
+    if index_snapshot.enabled() and (todo or removed):
+        publish_shared_indexes()
+    return report
+
+def get_graph_projection() -> GraphProjection:
+    """
+    Return the in-memory projection of the drug graph, loading it from Neo4j
+    the first time it is needed. Ingests rebuild it once they finish.
+    """
+    global _graph_projection
+    if _graph_projection is None:
+        with _graph_projection_lock:
+            if _graph_projection is None:
+                _graph_projection = _build_graph_projection()
+    return _graph_projection
+
+
+async def aget_graph_projection() -> GraphProjection:
+    """Async variant of `get_graph_projection`; only the one-off build leaves the event loop."""
+    if _graph_projection is None:
+        await asyncio.get_running_loop().run_in_executor(None, get_graph_projection)
+    return _graph_projection
+
+
+def _build_graph_projection() -> GraphProjection:
+    global _graph_projection_stale
+    _graph_projection_stale = False
+    started = time.perf_counter()
+    projection = GraphProjection.from_records(execute_read(_fetch_tx, _DRUG_TERMS))
+    logger.info("Loaded graph projection: %d drugs, %d KiB of adjacency in %.2fs",
+                len(projection), projection.nbytes // 1024, time.perf_counter() - started)
+    return projection
+
+
+def _refresh_graph_projection():
+    """Rebuild a loaded projection if the graph changed; readers keep the old one until the swap."""
+    global _graph_projection
+    if _graph_projection is None or not _graph_projection_stale:
+        return
+    try:
+        projection = _build_graph_projection()
+    except Exception:
+        logger.exception("Graph projection refresh failed; keeping the previous one")
+        return
+    _graph_projection = projection
+
+
 def get_side_effects(drug_name: str) -> List[str]:
-    driver = get_driver()
-    with driver.session() as session:
-        res = session.run(
-            """
-            MATCH (d:Drug {name: $name})-[:HAS_SIDE_EFFECT]->(s:SideEffect)
-            RETURN s.name as name
-            """,
-            name=drug_name,
-        )
-        return [r["name"] for r in res]
+    return get_graph_projection().side_effects(drug_name)
+
+
+def get_conditions(drug_name: str) -> List[str]:
+    """Conditions `drug_name` treats."""
+    return get_graph_projection().conditions(drug_name)
+
+
+def get_drugs_treating(condition: str, limit: Optional[int] = None) -> List[str]:
+    return get_graph_projection().drugs_treating(condition, limit)
+
 
+def get_drugs_with_side_effect(effect: str, limit: Optional[int] = None) -> List[str]:
+    return get_graph_projection().drugs_with_side_effect(effect, limit)
 
-def _cosine(a: List[float], b: List[float]) -> float:
-    a = np.array(a)
-    b = np.array(b)
-    if np.linalg.norm(a) == 0 or np.linalg.norm(b) == 0:
-        return 0.0
-    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
+def get_drugs_sharing_side_effects(drug_name: str, top_k: int = 10) -> List[Dict[str, Any]]:
+    """Drugs with the most side effects in common with `drug_name`, as {"name", "shared"} dicts."""
+    return [{"name": name, "shared": shared}
+            for name, shared in get_graph_projection().drugs_sharing_side_effects(drug_name, top_k)]
 
-def semantic_search_by_embedding(query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
+
+_DRUG_CONTEXT_BY_NAME = """
+UNWIND range(0, size($names) - 1) AS idx
+MATCH (d:Drug {name: $names[idx]})
+"""
+
+# top-k from the Neo4j vector index, followed by the same context expansion
+_DRUG_CONTEXT_BY_VECTOR = """
+CALL db.index.vector.queryNodes($index_name, $top_k, $embedding) YIELD node AS d, score
+"""
+
+_DRUG_CONTEXT = """
+OPTIONAL MATCH (d)-[:TREATS]->(c:Condition)
+WITH {key}, d, collect(DISTINCT c.name) AS conditions
+OPTIONAL MATCH (d)-[:HAS_SIDE_EFFECT]->(s:SideEffect)
+WITH {key}, d, conditions, collect(DISTINCT s.name)[..$max_side_effects] AS side_effects
+"""
+
+_DRUG_CONTEXT_RELATED = """
+OPTIONAL MATCH (d)-[:TREATS]->(:Condition)<-[:TREATS]-(o:Drug)
+WHERE o <> d
+WITH {key}, d, conditions, side_effects, collect(DISTINCT o.name)[..$max_related] AS related
+"""
+
+_DRUG_CONTEXT_RETURN = """
+RETURN d.name AS name, d.description AS description, conditions, side_effects{related}{score}
+ORDER BY {order}
+"""
+
+
+def _drug_context_query(expand_neighbours: bool, by_vector: bool = False) -> str:
+    key = "score" if by_vector else "idx"
+    query = (_DRUG_CONTEXT_BY_VECTOR if by_vector else _DRUG_CONTEXT_BY_NAME) + _DRUG_CONTEXT.format(key=key)
+    if expand_neighbours:
+        query += _DRUG_CONTEXT_RELATED.format(key=key)
+    return query + _DRUG_CONTEXT_RETURN.format(
+        related=", related" if expand_neighbours else "",
+        score=", score" if by_vector else "",
+        order="score DESC" if by_vector else "idx",
+    )
+
+
+def _drug_context_item(record, expand_neighbours: bool) -> Dict[str, Any]:
+    item = {
+        "description": record["description"],
+        "conditions": record["conditions"],
+        "side_effects": record["side_effects"],
+    }
+    if expand_neighbours:
+        item["related"] = record["related"]
+    return item
+
+
+def get_drug_context(names: List[str], max_side_effects: int = 10,
+                     expand_neighbours: bool = False, max_related: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch description, conditions and side effects (at most `max_side_effects`
+    per drug) for all `names` in one query. With `expand_neighbours`, each drug
+    also gets up to `max_related` other drugs treating the same condition.
+    Returns {name: {"description", "conditions", "side_effects"[, "related"]}}
+    in the order of `names`; unknown drugs are omitted.
+    """
+    if not names:
+        return {}
+    res = execute_read(
+        _fetch_tx,
+        _drug_context_query(expand_neighbours),
+        names=list(names),
+        max_side_effects=max_side_effects,
+        max_related=max_related,
+    )
+    return {r["name"]: _drug_context_item(r, expand_neighbours) for r in res}
+
+
+async def aget_drug_context(names: List[str], max_side_effects: int = 10,
+                            expand_neighbours: bool = False, max_related: int = 5) -> Dict[str, Dict[str, Any]]:
     """
-    Naive vector search on embeddings stored in Neo4j nodes.
-    This pulls back candidate nodes' embeddings and computes cosine similarity in Python.
-    For large datasets replace with a vector DB or use Neo4j vector index features.
+    Async variant of `get_drug_context` using the async Neo4j driver.
     """
-    driver = get_driver()
-    with driver.session() as session:
-        res = session.run("MATCH (d:Drug) RETURN d.name as name, d.embedding as embedding, d.description as description")
+    if not names:
+        return {}
+    res = await aexecute_read(
+        _afetch_tx,
+        _drug_context_query(expand_neighbours),
+        names=list(names),
+        max_side_effects=max_side_effects,
+        max_related=max_related,
+    )
+    return {r["name"]: _drug_context_item(r, expand_neighbours) for r in res}
+
+
+_VECTOR_INDEX_OPTIONS = """
+SHOW INDEXES YIELD name, type, options WHERE name = $index_name
+RETURN type, options
+"""
+
+# Neo4j 5.13+; index name and options cannot be query parameters
+_CREATE_VECTOR_INDEX = """
+CREATE VECTOR INDEX `{name}` IF NOT EXISTS FOR (d:Drug) ON (d.embedding)
+OPTIONS {{indexConfig: {{`vector.dimensions`: {dimensions}, `vector.similarity_function`: '{similarity}'}}}}
+"""
+
+# Neo4j 5.11 / 5.12
+_CREATE_VECTOR_INDEX_PROCEDURE = """
+CALL db.index.vector.createNodeIndex($index_name, 'Drug', 'embedding', $dimensions, $similarity)
+"""
+
+_MISSING_EMBEDDING_LISTS = """
+MATCH (d:Drug) WHERE d.embedding IS NULL AND d.embedding_blob IS NOT NULL
+RETURN d.name AS name, d.embedding_blob AS blob, d.embedding_dtype AS dtype
+LIMIT $limit
+"""
+
+_SET_EMBEDDING_LISTS = """
+UNWIND $rows AS row
+MATCH (d:Drug {name: row.name})
+SET d.embedding = row.embedding
+"""
+
+_VECTOR_SIMILARITIES = ("cosine", "euclidean")
+
+
+def _vector_index_dimensions(options) -> Optional[int]:
+    config = (options or {}).get("indexConfig") or {}
+    dimensions = config.get("vector.dimensions")
+    return int(dimensions) if dimensions is not None else None
+
+
+def _backfill_embedding_lists(batch_size: int = 1000) -> int:
+    """Give drugs ingested with only the packed blob the float-list property the vector index covers."""
+    done = 0
+    while True:
+        res = execute_read(_fetch_tx, _MISSING_EMBEDDING_LISTS, limit=batch_size)
+        if not res:
+            return done
         rows = []
         for r in res:
-            emb = r["embedding"]
-            if emb is None:
-                continue
-            score = _cosine(query_embedding, emb)
-            rows.append({"name": r["name"], "score": score, "description": r.get("description")})
-        rows = sorted(rows, key=lambda x: x["score"], reverse=True)
-        return rows[:top_k]
+            emb = decode_embeddings([r["blob"]], r["dtype"] or "float32")[0]
+            rows.append({"name": r["name"], "embedding": emb.astype(float).tolist()})
+        execute_write(_run_tx, _SET_EMBEDDING_LISTS, rows=rows)
+        done += len(rows)
+        logger.info("Backfilled Drug.embedding lists: %d", done)
+
+
+def ensure_neo4j_vector_index(dimensions: int) -> bool:
+    """
+    Create the Neo4j vector index on Drug.embedding (NEO4J_VECTOR_INDEX_NAME)
+    if it does not exist, and backfill the embedding lists it indexes.
+    Returns False if the server has no vector index support or the existing
+    index was built for another dimension; vector search then stays in-process.
+    """
+    name = settings.NEO4J_VECTOR_INDEX_NAME
+    similarity = settings.NEO4J_VECTOR_SIMILARITY
+    if similarity not in _VECTOR_SIMILARITIES:
+        raise ValueError(f"NEO4J_VECTOR_SIMILARITY must be one of {_VECTOR_SIMILARITIES}, got {similarity!r}")
+    try:
+        existing = execute_read(_fetch_tx, _VECTOR_INDEX_OPTIONS, index_name=name)
+        if existing:
+            if existing[0]["type"] != "VECTOR":
+                logger.warning("Index %s exists but is a %s index; using the in-process vector index",
+                               name, existing[0]["type"])
+                return False
+            indexed = _vector_index_dimensions(existing[0]["options"])
+            if indexed is not None and indexed != dimensions:
+                logger.warning("Vector index %s has %d dimensions but embeddings have %d; drop it to rebuild. "
+                               "Using the in-process vector index", name, indexed, dimensions)
+                return False
+        else:
+            try:
+                execute_write(_run_tx, _CREATE_VECTOR_INDEX.format(
+                    name=name.replace("`", ""), dimensions=int(dimensions), similarity=similarity))
+            except ClientError as e:
+                logger.info("CREATE VECTOR INDEX not supported (%s); trying db.index.vector.createNodeIndex", e.code)
+                execute_write(_run_tx, _CREATE_VECTOR_INDEX_PROCEDURE,
+                              index_name=name, dimensions=int(dimensions), similarity=similarity)
+            logger.info("Created Neo4j vector index %s (%d dimensions, %s)", name, dimensions, similarity)
+        _backfill_embedding_lists()
+    except Neo4jError as e:
+        logger.warning("Neo4j vector index unavailable (%s); using the in-process vector index", e)
+        return False
+    return True
+
+
+def use_neo4j_vector_index(dimensions: int) -> bool:
+    """True if VECTOR_SEARCH_BACKEND is "neo4j" and the server's vector index is usable (checked once)."""
+    global _neo4j_vector_ready
+    if settings.VECTOR_SEARCH_BACKEND != "neo4j":
+        return False
+    if _neo4j_vector_ready is None:
+        with _neo4j_vector_lock:
+            if _neo4j_vector_ready is None:
+                _neo4j_vector_ready = ensure_neo4j_vector_index(dimensions)
+    return _neo4j_vector_ready
+
+
+async def ause_neo4j_vector_index(dimensions: int) -> bool:
+    if settings.VECTOR_SEARCH_BACKEND == "neo4j" and _neo4j_vector_ready is None:
+        await asyncio.get_running_loop().run_in_executor(None, use_neo4j_vector_index, dimensions)
+    return settings.VECTOR_SEARCH_BACKEND == "neo4j" and bool(_neo4j_vector_ready)
+
+
+def _neo4j_vector_params(query_embedding, top_k: int, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    context = context or {}
+    return {
+        "index_name": settings.NEO4J_VECTOR_INDEX_NAME,
+        "top_k": int(top_k),
+        "embedding": np.asarray(query_embedding, dtype=float).reshape(-1).tolist(),
+        "max_side_effects": context.get("max_side_effects", 10),
+        "max_related": context.get("max_related", 5),
+    }
+
+
+def _neo4j_vector_hit(record, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    score = record["score"]
+    if settings.NEO4J_VECTOR_SIMILARITY == "cosine":
+        # Neo4j reports (1 + cos) / 2; use the raw cosine like the in-process index
+        score = 2.0 * score - 1.0
+    hit = {"name": record["name"], "score": score, "description": record["description"]}
+    if context is not None:
+        hit["context"] = _drug_context_item(record, context.get("expand_neighbours", False))
+    return hit
+
+
+def neo4j_vector_search(query_embedding, top_k: int = 5,
+                        context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Top-k drugs from the Neo4j vector index with their graph context, in one
+    statement. `context` takes the `get_drug_context` keyword arguments; each
+    hit then carries it under "context".
+    """
+    expand = bool(context and context.get("expand_neighbours"))
+    res = execute_read(_fetch_tx, _drug_context_query(expand, by_vector=True),
+                       **_neo4j_vector_params(query_embedding, top_k, context))
+    return [_neo4j_vector_hit(r, context) for r in res]
+
+
+async def aneo4j_vector_search(query_embedding, top_k: int = 5,
+                               context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Async variant of `neo4j_vector_search`."""
+    expand = bool(context and context.get("expand_neighbours"))
+    res = await aexecute_read(_afetch_tx, _drug_context_query(expand, by_vector=True),
+                              **_neo4j_vector_params(query_embedding, top_k, context))
+    return [_neo4j_vector_hit(r, context) for r in res]
+
+
+def get_vector_index() -> VectorIndex:
+    """
+    Return the in-process vector index, loading every Drug embedding from Neo4j
+    the first time it is needed. Later ingests update it incrementally.
+    """
+    global _vector_index
+    if _vector_index is None:
+        with _vector_index_lock:
+            if _vector_index is None:
+                if index_snapshot.enabled():
+                    _load_shared_indexes()
+                else:
+                    _vector_index = _build_vector_index()
+    return _vector_index
+
+
+def _build_vector_index() -> VectorIndex:
+    index = VectorIndex.from_settings()
+    res = execute_read(
+        _fetch_tx,
+        """
+        MATCH (d:Drug) WHERE d.embedding_blob IS NOT NULL OR d.embedding IS NOT NULL
+        RETURN d.name as name, d.embedding_blob as blob, d.embedding_dtype as dtype,
+               d.embedding as embedding, d.description as description
+        """,
+    )
+    # packed blobs grouped by dtype; float lists from older ingests kept apart
+    packed: Dict[str, Dict[str, list]] = {}
+    legacy = {"names": [], "embeddings": [], "descriptions": []}
+    for r in res:
+        if r["blob"] is not None:
+            group = packed.setdefault(r["dtype"] or "float32", {"names": [], "blobs": [], "descriptions": []})
+            group["names"].append(r["name"])
+            group["blobs"].append(r["blob"])
+            group["descriptions"].append(r["description"])
+        else:
+            legacy["names"].append(r["name"])
+            legacy["embeddings"].append(r["embedding"])
+            legacy["descriptions"].append(r["description"])
+    del res
+
+    for dtype, group in packed.items():
+        index.upsert(group["names"], decode_embeddings(group["blobs"], dtype), group["descriptions"])
+    if legacy["names"]:
+        index.upsert(legacy["names"], legacy["embeddings"], legacy["descriptions"])
+    logger.info("Loaded %d drug embeddings into the vector index", len(index))
+    return index
+
+
+# every drug with its condition and side-effect names (lexical index, graph projection)
+_DRUG_TERMS = """
+MATCH (d:Drug)
+OPTIONAL MATCH (d)-[:TREATS]->(c:Condition)
+WITH d, collect(c.name) AS conditions
+OPTIONAL MATCH (d)-[:HAS_SIDE_EFFECT]->(s:SideEffect)
+RETURN d.name AS name, conditions, collect(s.name) AS side_effects
+"""
+
+
+def get_lexical_index() -> LexicalIndex:
+    """
+    Return the lexical index, loading every drug with its conditions and side
+    effects from Neo4j the first time it is needed. Later ingests update it.
+    """
+    global _lexical_index
+    if _lexical_index is None and index_snapshot.enabled():
+        get_vector_index()
+    if _lexical_index is None:
+        with _lexical_index_lock:
+            if _lexical_index is None:
+                _lexical_index = _build_lexical_index()
+    return _lexical_index
+
+
+def _build_lexical_index() -> LexicalIndex:
+    index = LexicalIndex(fuzzy=settings.LEXICAL_FUZZY)
+    res = execute_read(_fetch_tx, _DRUG_TERMS)
+    index.upsert(
+        [r["name"] for r in res],
+        [" ".join(r["conditions"]) for r in res],
+        [" ".join(r["side_effects"]) for r in res],
+    )
+    logger.info("Loaded %d drugs into the lexical index", len(index))
+    return index
+
+
+def _load_shared_indexes():
+    """
+    Load both indexes from the live shared snapshot, building it from Neo4j
+    first if no worker has published one yet. Call with _vector_index_lock held.
+    """
+    global _vector_index, _lexical_index, _snapshot_generation
+    with index_snapshot.locked():
+        generation = index_snapshot.current_generation()
+        if generation == 0:
+            generation = index_snapshot.write(_build_vector_index(), _build_lexical_index(), [])
+    _vector_index, _lexical_index = index_snapshot.load(generation)
+    _snapshot_generation = generation
+    logger.info("Loaded shared index snapshot generation %d (%d drugs)", generation, len(_vector_index))
+
+
+def publish_shared_indexes():
+    """
+    Publish this worker's indexes, including rows ingested here, as a new
+    shared snapshot and switch to the memory-mapped copy. If another worker
+    published since our snapshot was loaded, neither copy has all rows, so
+    the indexes are rebuilt from Neo4j instead.
+    """
+    global _vector_index, _lexical_index, _snapshot_generation
+    with _vector_index_lock:
+        changed = list(_unpublished)
+        del _unpublished[:]
+        with index_snapshot.locked():
+            if index_snapshot.current_generation() != _snapshot_generation or _vector_index is None:
+                vector, lexical = _build_vector_index(), _build_lexical_index()
+            else:
+                vector, lexical = _vector_index, _lexical_index
+            generation = index_snapshot.write(vector, lexical, changed)
+        _vector_index, _lexical_index = index_snapshot.load(generation)
+        _snapshot_generation = generation
+
+
+def refresh_shared_indexes() -> bool:
+    """
+    Switch to a snapshot published by another worker, if there is a newer
+    one, and notify ingest listeners so caches drop answers about the drugs
+    it changed. Returns True if a new snapshot was loaded.
+    """
+    global _vector_index, _lexical_index, _snapshot_generation
+    if _vector_index is None or index_snapshot.current_generation() <= _snapshot_generation:
+        return False
+    with _vector_index_lock:
+        old = _snapshot_generation
+        generation = index_snapshot.current_generation()
+        if generation <= old:
+            return False
+        _vector_index, _lexical_index = index_snapshot.load(generation)
+        _snapshot_generation = generation
+    changed = index_snapshot.changed_since(old, generation)
+    logger.info("Switched to index snapshot generation %d", generation)
+    _notify_ingested(_vector_index.names if changed is None else changed)
+    # another worker changed the graph
+    _refresh_graph_projection()
+    return True
+
+
+def _refresh_loop(interval: float):
+    while not _refresh_stop.wait(interval):
+        try:
+            refresh_shared_indexes()
+        except Exception:
+            logger.exception("Index snapshot refresh failed")
+
+
+def start_index_refresh() -> Optional[threading.Thread]:
+    """In multi-worker mode, poll for snapshots published by other workers every INDEX_REFRESH_INTERVAL."""
+    if not index_snapshot.enabled() or settings.INDEX_REFRESH_INTERVAL <= 0:
+        return None
+    _refresh_stop.clear()
+    thread = threading.Thread(target=_refresh_loop, args=(settings.INDEX_REFRESH_INTERVAL,),
+                              name="index-refresh", daemon=True)
+    thread.start()
+    return thread
+
+
+def stop_index_refresh():
+    _refresh_stop.set()
+
+
+def semantic_search_by_embedding(query_embedding: List[float], top_k: int = 5,
+                                 context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Vector search over Drug embeddings. With VECTOR_SEARCH_BACKEND="neo4j" the
+    Neo4j vector index answers, and hits carry their graph context (see
+    `neo4j_vector_search`). Otherwise the in-process index is used: Neo4j is
+    only read once to build it, and queries never touch the database.
+    """
+    if use_neo4j_vector_index(len(query_embedding)):
+        try:
+            return neo4j_vector_search(query_embedding, top_k=top_k, context=context)
+        except Neo4jError as e:
+            # e.g. the index is still populating
+            logger.warning("Neo4j vector search failed (%s); using the in-process index", e)
+    return get_vector_index().search(query_embedding, top_k=top_k)
+
+
+async def asemantic_search_by_embedding(query_embedding: List[float], top_k: int = 5,
+                                        context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Async variant of `semantic_search_by_embedding`. The in-process search
+    itself stays on the event loop; only the one-off build from Neo4j is moved off it.
+    """
+    if await ause_neo4j_vector_index(len(query_embedding)):
+        try:
+            return await aneo4j_vector_search(query_embedding, top_k=top_k, context=context)
+        except Neo4jError as e:
+            logger.warning("Neo4j vector search failed (%s); using the in-process index", e)
+    if _vector_index is None:
+        await asyncio.get_running_loop().run_in_executor(None, get_vector_index)
+    return _vector_index.search(query_embedding, top_k=top_k)
+
+
+async def asemantic_search_batch(query_embeddings, top_k: int = 5,
+                                 context: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Top-k hits for many query embeddings, scored with one matrix multiply per
+    block; with the Neo4j backend, one concurrent vector query per embedding.
+    """
+    if len(query_embeddings) and await ause_neo4j_vector_index(len(query_embeddings[0])):
+        return list(await asyncio.gather(*(
+            asemantic_search_by_embedding(emb, top_k=top_k, context=context) for emb in query_embeddings
+        )))
+    if _vector_index is None:
+        await asyncio.get_running_loop().run_in_executor(None, get_vector_index)
+    return _vector_index.search_batch(query_embeddings, top_k=top_k)
+
+
+def drug_embeddings(names: List[str]) -> Optional[np.ndarray]:
+    """
+    Normalized embeddings of `names` from the vector index, or None when the
+    index is not loaded (it is never built just for this).
+    """
+    index = _vector_index
+    if index is None or index.dim is None:
+        return None
+    return index.vectors(names)
+
+
+def exact_drug_hits(question: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Drugs named verbatim in `question` (see LexicalIndex.exact_matches), as
+    hits with score 1.0. Empty when no drug is named or the fast path is off.
+    """
+    if not (settings.HYBRID_SEARCH_ENABLED and settings.HYBRID_EXACT_NAME_FAST_PATH):
+        return []
+    names = get_lexical_index().exact_matches(question)[:top_k]
+    return [{"name": name, "score": 1.0, "description": None} for name in names]
+
+
+def _fuse(question: str, vector_hits: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+    lexical_hits = _lexical_index.search(question, top_k=settings.HYBRID_CANDIDATES)
+    return reciprocal_rank_fusion([vector_hits, lexical_hits], k=settings.HYBRID_RRF_K, top_k=top_k)
+
+
+def hybrid_search(question: str, query_embedding, top_k: int = 5,
+                  context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Vector and BM25 hits fused with reciprocal rank fusion. Falls back to
+    plain vector search when HYBRID_SEARCH_ENABLED is off. `context` is
+    passed on to `semantic_search_by_embedding`.
+    """
+    if not settings.HYBRID_SEARCH_ENABLED:
+        return semantic_search_by_embedding(query_embedding, top_k=top_k, context=context)
+    get_lexical_index()
+    vector_hits = semantic_search_by_embedding(
+        query_embedding, top_k=max(top_k, settings.HYBRID_CANDIDATES), context=context)
+    return _fuse(question, vector_hits, top_k)
+
+
+async def _aensure_lexical_index():
+    if settings.HYBRID_SEARCH_ENABLED and _lexical_index is None:
+        await asyncio.get_running_loop().run_in_executor(None, get_lexical_index)
+
+
+async def aexact_drug_hits(question: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """Async variant of `exact_drug_hits`; only the one-off index build leaves the event loop."""
+    await _aensure_lexical_index()
+    return exact_drug_hits(question, top_k=top_k)
+
+
+async def ahybrid_search(question: str, query_embedding, top_k: int = 5,
+                         context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Async variant of `hybrid_search`."""
+    if not settings.HYBRID_SEARCH_ENABLED:
+        return await asemantic_search_by_embedding(query_embedding, top_k=top_k, context=context)
+    await _aensure_lexical_index()
+    vector_hits = await asemantic_search_by_embedding(
+        query_embedding, top_k=max(top_k, settings.HYBRID_CANDIDATES), context=context)
+    return _fuse(question, vector_hits, top_k)
+
+
+async def ahybrid_search_batch(questions: List[str], query_embeddings, top_k: int = 5,
+                               context: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+    """Batched `ahybrid_search`: one matrix multiply for the vector side, then per-question fusion."""
+    if not settings.HYBRID_SEARCH_ENABLED:
+        return await asemantic_search_batch(query_embeddings, top_k=top_k, context=context)
+    await _aensure_lexical_index()
+    all_vector_hits = await asemantic_search_batch(
+        query_embeddings, top_k=max(top_k, settings.HYBRID_CANDIDATES), context=context)
+    return [_fuse(q, hits, top_k) for q, hits in zip(questions, all_vector_hits)]
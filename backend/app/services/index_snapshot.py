@@ -0,0 +1,131 @@
+# backend/app/services/index_snapshot.py
+"""
+On-disk snapshots of the vector and lexical indexes, shared by every worker
+process of a multi-worker deployment (INDEX_SNAPSHOT_DIR set).
+
+The embedding matrix is stored as .npy and memory-mapped read-only, so N
+workers keep one copy of it in the page cache instead of N private copies.
+Snapshots are immutable generations; CURRENT names the live one and is
+replaced atomically, so a reader never sees a half-written snapshot.
+
+    <dir>/CURRENT      generation number of the live snapshot
+    <dir>/gen-<n>/     matrix.npy, meta.json, [centroids.npy, assign.npy],
+                       lexical.pkl, changed.json (drugs ingested since gen n-1)
+    <dir>/.lock        flock held while building or publishing
+"""
+import fcntl
+import json
+import logging
+import os
+import pickle
+import shutil
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.lexical_index import LexicalIndex
+from app.services.vector_index import VectorIndex
+
+logger = logging.getLogger("medical-chatbot.services.index_snapshot")
+
+
+def enabled() -> bool:
+    return bool(settings.INDEX_SNAPSHOT_DIR)
+
+
+def _path(*parts: str) -> str:
+    return os.path.join(settings.INDEX_SNAPSHOT_DIR, *parts)
+
+
+def _generation_dir(generation: int) -> str:
+    return _path(f"gen-{generation}")
+
+
+def current_generation() -> int:
+    """Generation of the live snapshot; 0 when none has been published yet."""
+    try:
+        with open(_path("CURRENT"), encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+@contextmanager
+def locked():
+    """Exclusive lock across processes, so only one worker builds or publishes at a time."""
+    os.makedirs(settings.INDEX_SNAPSHOT_DIR, exist_ok=True)
+    with open(_path(".lock"), "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write(vector: VectorIndex, lexical: Optional[LexicalIndex], changed: List[str]) -> int:
+    """
+    Write a new generation and make it current. Call with `locked()` held.
+    Returns the new generation number.
+    """
+    generation = current_generation() + 1
+    final = _generation_dir(generation)
+    tmp = final + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    vector.save(tmp)
+    if lexical is not None:
+        with open(os.path.join(tmp, "lexical.pkl"), "wb") as f:
+            pickle.dump(lexical, f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(os.path.join(tmp, "changed.json"), "w", encoding="utf-8") as f:
+        json.dump(changed, f)
+    shutil.rmtree(final, ignore_errors=True)
+    os.rename(tmp, final)
+
+    current_tmp = _path("CURRENT.tmp")
+    with open(current_tmp, "w", encoding="utf-8") as f:
+        f.write(str(generation))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(current_tmp, _path("CURRENT"))
+    _prune(generation)
+    logger.info("Published index snapshot generation %d (%d drugs)", generation, len(vector))
+    return generation
+
+
+def _prune(generation: int):
+    # workers still mapping a removed generation keep reading it: unlinked files live until unmapped
+    keep = max(1, settings.INDEX_SNAPSHOT_KEEP)
+    for entry in os.listdir(settings.INDEX_SNAPSHOT_DIR):
+        if entry.startswith("gen-") and not entry.endswith(".tmp"):
+            try:
+                old = int(entry[4:])
+            except ValueError:
+                continue
+            if old <= generation - keep:
+                shutil.rmtree(_path(entry), ignore_errors=True)
+
+
+def load(generation: int) -> Tuple[VectorIndex, Optional[LexicalIndex]]:
+    """Load a generation, memory-mapping its embedding matrix."""
+    path = _generation_dir(generation)
+    vector = VectorIndex.load(path, mmap=True)
+    lexical = None
+    lexical_path = os.path.join(path, "lexical.pkl")
+    if os.path.exists(lexical_path):
+        with open(lexical_path, "rb") as f:
+            lexical = pickle.load(f)
+    return vector, lexical
+
+
+def changed_since(generation: int, newer: int) -> Optional[List[str]]:
+    """
+    Drugs ingested after `generation` up to `newer`, or None if an
+    intermediate generation was already pruned.
+    """
+    names: List[str] = []
+    for g in range(generation + 1, newer + 1):
+        try:
+            with open(os.path.join(_generation_dir(g), "changed.json"), encoding="utf-8") as f:
+                names.extend(json.load(f))
+        except FileNotFoundError:
+            return None
+    return names
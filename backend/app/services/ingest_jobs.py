@@ -0,0 +1,186 @@
+# backend/app/services/ingest_jobs.py
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Any, Optional
+
+from app.core.config import settings
+from app.services import graph_service
+
+logger = logging.getLogger("medical-chatbot.services.ingest_jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FULL = "full"
+DELTA = "delta"
+MODES = (FULL, DELTA)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class IngestJob:
+    def __init__(self, path: str, mode: str = FULL):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.mode = mode
+        self.state = QUEUED
+        self.rows = 0
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.error: Optional[str] = None
+        # delta ingest summary: added / changed / unchanged / removed drugs
+        self.report: Optional[Dict[str, Any]] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (SUCCEEDED, FAILED, CANCELLED)
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "file": self.path,
+            "mode": self.mode,
+            "rows_processed": self.rows,
+            "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+            "rows_per_sec": round(self.rows / elapsed, 1) if elapsed else 0.0,
+            "stages": self.stages,
+            "error": self.error,
+            "report": self.report,
+        }
+
+
+class IngestJobManager:
+    """
+    Runs `graph_service.ingest_drug_file` in a bounded worker pool so that at
+    most `max_concurrent` ingests run at once; further jobs wait in the queue.
+    """
+
+    def __init__(self, max_concurrent: int = 1, history: int = 100):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent), thread_name_prefix="ingest-job")
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._history = history
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, mode: str = FULL,
+               on_done: Optional[Callable[[IngestJob], None]] = None) -> IngestJob:
+        """
+        Queue an ingest of `path`. `on_done(job)` is called once the job has
+        succeeded, failed or been cancelled (also before it started), e.g. to
+        delete an uploaded file.
+        """
+        job = IngestJob(path, mode)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        job.future = self._executor.submit(self._run, job)
+        if on_done is not None:
+            job.future.add_done_callback(lambda _: self._finish(job, on_done))
+        logger.info("Queued %s ingest job %s for %s", mode, job.id, path)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[IngestJob]:
+        """
+        Cancel a job. Queued jobs never start; running jobs stop after the
+        chunk currently being written (already committed chunks are kept).
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            job.state = CANCELLED
+            job.finished_at = time.time()
+        return job
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if not job.finished:
+                self.cancel(job.id)
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _finish(job: IngestJob, on_done: Callable[[IngestJob], None]):
+        try:
+            on_done(job)
+        except Exception:
+            logger.exception("Cleanup of ingest job %s failed", job.id)
+
+    def _prune(self):
+        finished = [jid for jid, j in self._jobs.items() if j.finished]
+        while len(self._jobs) > self._history and finished:
+            self._jobs.pop(finished.pop(0), None)
+
+    def _run(self, job: IngestJob):
+        if job.cancel_event.is_set():
+            job.state = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.state = RUNNING
+        job.started_at = time.time()
+
+        def progress(stats):
+            job.stages = stats
+            job.rows = stats.get("write", {}).get("rows", 0)
+            if job.cancel_event.is_set():
+                raise JobCancelled()
+
+        try:
+            if job.mode == DELTA:
+                job.report = graph_service.ingest_drug_file_delta(job.path, progress=progress)
+                job.rows = job.report["rows_written"]
+            else:
+                job.rows = graph_service.ingest_drug_file(job.path, progress=progress)
+            job.state = SUCCEEDED
+        except JobCancelled:
+            job.state = CANCELLED
+            logger.info("Ingest job %s cancelled after %d rows", job.id, job.rows)
+        except Exception as e:
+            job.state = FAILED
+            job.error = str(e)
+            logger.exception("Ingest job %s failed", job.id)
+        finally:
+            job.finished_at = time.time()
+
+
+# helper singleton
+_manager = None
+
+
+def get_job_manager() -> IngestJobManager:
+    global _manager
+    if _manager is None:
+        _manager = IngestJobManager(
+            max_concurrent=settings.INGEST_MAX_CONCURRENT_JOBS,
+            history=settings.INGEST_JOB_HISTORY,
+        )
+    return _manager
+
+
+def shutdown_job_manager():
+    global _manager
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
@@ -0,0 +1,156 @@
+# backend/app/services/ingest_pipeline.py
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core import metrics
+
+logger = logging.getLogger("medical-chatbot.services.ingest_pipeline")
+
+_DONE = object()
+
+
+class StageStats:
+    """Rows handled and busy time of one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.chunks = 0
+        self.busy = 0.0
+
+    def add(self, rows: int, seconds: float):
+        self.rows += rows
+        self.chunks += 1
+        self.busy += seconds
+        metrics.INGEST_ROWS.inc(rows, stage=self.name)
+        metrics.INGEST_BUSY.inc(seconds, stage=self.name)
+        metrics.INGEST_RATE.set(self.rows_per_sec, stage=self.name)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.busy if self.busy > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "seconds": round(self.busy, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+        }
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def run_pipeline(
+    source: Iterable[Any],
+    stages: List[Tuple[str, Callable[[Any], Any]]],
+    count: Callable[[Any], int] = len,
+    queue_size: int = 2,
+    progress: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Push chunks from `source` through `stages` ((name, fn) pairs), each stage
+    running in its own thread and connected by queues of `queue_size` chunks,
+    so reading, embedding and writing overlap while at most a few chunks are
+    held in memory. The last stage runs in the calling thread.
+
+    `count(chunk)` gives the number of rows in a chunk. After every chunk
+    leaves the last stage, `progress` (if given) receives per-stage stats.
+    The first exception raised by any stage stops the pipeline and is re-raised.
+    """
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    stats = [StageStats("read")] + [StageStats(name) for name, _ in stages]
+    queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+
+    def snapshot() -> Dict[str, Dict[str, Any]]:
+        return {s.name: s.as_dict() for s in stats}
+
+    def fail(exc: BaseException):
+        if not errors:
+            errors.append(exc)
+        stop.set()
+
+    def read():
+        st = stats[0]
+        it = iter(source)
+        try:
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                try:
+                    chunk = next(it)
+                except StopIteration:
+                    break
+                st.add(count(chunk), time.perf_counter() - t0)
+                if not _put(queues[0], chunk, stop):
+                    return
+        except BaseException as e:
+            fail(e)
+            return
+        _put(queues[0], _DONE, stop)
+
+    def work(i: int, last: bool):
+        _, fn = stages[i]
+        st = stats[i + 1]
+        inbox = queues[i]
+        try:
+            while True:
+                chunk = _get(inbox, stop)
+                if chunk is _DONE:
+                    break
+                t0 = time.perf_counter()
+                out = fn(chunk)
+                st.add(count(out), time.perf_counter() - t0)
+                if last:
+                    if progress is not None:
+                        progress(snapshot())
+                elif not _put(queues[i + 1], out, stop):
+                    return
+        except BaseException as e:
+            fail(e)
+            return
+        if not last:
+            _put(queues[i + 1], _DONE, stop)
+
+    threads = [threading.Thread(target=read, name="ingest-read", daemon=True)]
+    for i in range(len(stages) - 1):
+        threads.append(threading.Thread(target=work, args=(i, False), name=f"ingest-{stages[i][0]}", daemon=True))
+
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    work(len(stages) - 1, True)
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+
+    result = snapshot()
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Pipeline finished in %.1fs: %s",
+        elapsed,
+        ", ".join(f"{s.name} {s.rows} rows @ {s.rows_per_sec:.0f} rows/s" for s in stats),
+    )
+    return result
@@ -0,0 +1,205 @@
+# backend/app/services/intent_router.py
+"""
+Fast path for templated graph questions, answered from the in-memory graph
+projection without embedding, retrieval or an LLM call:
+
+    side_effects  "side effects of X", "X side effects"
+    uses          "what is X used for", "uses of X", "what does X treat"
+    drugs_for     "drugs for Y", "what treats Y", "medicines used for Y"
+
+A question is only answered here when the whole question matches a template
+and its entity resolves to known Drug / Condition names (a drug's full name,
+or its name without the dosage form if at most top_k drugs share it); a
+"drugs for" answer lists the first top_k drugs.
+Anything else, including extra constraints such as "... that does not cause
+nausea", falls back to full RAG. Outcomes are counted per intent in
+metrics.INTENT_ROUTES and the running hit rate in metrics.INTENT_HIT_RATIO.
+"""
+import asyncio
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.services import graph_service
+from app.services.graph_projection import GraphProjection
+from app.services.lexical_index import name_key
+
+logger = logging.getLogger("medical-chatbot.services.intent_router")
+
+_SIDE_EFFECTS = r"(?:side[- ]?effects?|adverse (?:effects?|reactions?))"
+_DRUGS = r"(?:drugs?|medicines?|medications?|meds|tablets?)"
+
+# matched against the whole lower-cased question, without trailing punctuation
+TEMPLATES: List[Tuple[str, re.Pattern]] = [(intent, re.compile(pattern)) for intent, pattern in [
+    ("side_effects", rf"^(?:what are |list |tell me )?(?:the )?(?:common |possible |known )?{_SIDE_EFFECTS} "
+                     rf"(?:of|for|from) (?P<entity>.+)$"),
+    ("side_effects", rf"^what {_SIDE_EFFECTS} (?:does|can) (?P<entity>.+?) (?:have|cause)$"),
+    ("side_effects", rf"^(?P<entity>.+?) {_SIDE_EFFECTS}$"),
+    ("uses", r"^what (?:is|are) (?P<entity>.+?) used (?:for|to treat)$"),
+    ("uses", r"^(?:what (?:is|are) )?(?:the )?(?:uses?|indications?) (?:of|for) (?P<entity>.+)$"),
+    ("uses", r"^what does (?P<entity>.+?) treat$"),
+    ("uses", r"^(?P<entity>.+?) uses?$"),
+    ("drugs_for", rf"^(?:what |which )?(?:are (?:the )?)?(?:{_DRUGS}|treatments?) (?:are )?(?:used )?"
+                  rf"(?:for|to treat|that treat|treating) (?P<entity>.+)$"),
+    ("drugs_for", r"^what (?:treats|is used for|is used to treat|can i take for|helps with|is good for) (?P<entity>.+)$"),
+]]
+INTENTS = tuple(dict.fromkeys(intent for intent, _ in TEMPLATES))
+
+# "Treatment of Acne Prevention of Heart attack" -> "Treatment of Acne", "Prevention of Heart attack"
+_USE_SPLIT_RE = re.compile(r"\s+(?=(?:treatment|prevention|management|relief|control) of\b)", re.I)
+_USE_PREFIX_RE = re.compile(r"^(?:treatment|prevention|management|relief|control) of\s+", re.I)
+_ARTICLE_RE = re.compile(r"^(?:a|an|the|my)\s+")
+
+# drug / condition lookup tables for the current projection, rebuilt when it is replaced
+_vocabulary: Optional[Tuple[GraphProjection, Dict[str, List[str]], Dict[Tuple[str, ...], List[str]],
+                            Dict[str, List[str]]]] = None
+_vocabulary_lock = threading.Lock()
+_seen = 0
+_answered = 0
+_counts_lock = threading.Lock()
+
+
+def match_intent(question: str) -> Optional[Tuple[str, str]]:
+    """(intent, entity text) of the first template matching the whole question, or None."""
+    text = " ".join((question or "").lower().split()).rstrip("?.! ")
+    for intent, pattern in TEMPLATES:
+        m = pattern.match(text)
+        if m:
+            entity = _ARTICLE_RE.sub("", m.group("entity").strip())
+            if entity:
+                return intent, entity
+    return None
+
+
+def _uses(condition: str) -> List[str]:
+    return [part.strip() for part in _USE_SPLIT_RE.split(condition) if part.strip()]
+
+
+def _topic(use: str) -> str:
+    return _USE_PREFIX_RE.sub("", use).strip().lower()
+
+
+def _get_vocabulary(projection: GraphProjection):
+    global _vocabulary
+    vocabulary = _vocabulary
+    if vocabulary is not None and vocabulary[0] is projection:
+        return vocabulary
+    with _vocabulary_lock:
+        if _vocabulary is None or _vocabulary[0] is not projection:
+            by_name: Dict[str, List[str]] = {}
+            by_key: Dict[Tuple[str, ...], List[str]] = {}
+            for name in projection.drug_names:
+                by_name.setdefault(name.lower(), []).append(name)
+                by_key.setdefault(name_key(name), []).append(name)
+            by_topic: Dict[str, List[str]] = {}
+            for condition in projection.condition_names:
+                for use in _uses(condition):
+                    by_topic.setdefault(_topic(use), []).append(condition)
+            _vocabulary = (projection, by_name, by_key, by_topic)
+        return _vocabulary
+
+
+def warm():
+    """Load the graph projection and build the router's lookup tables for it."""
+    if settings.INTENT_ROUTER_ENABLED:
+        _get_vocabulary(graph_service.get_graph_projection())
+
+
+def _resolve_drugs(entity: str, vocabulary, top_k: int) -> List[str]:
+    _, by_name, by_key, _ = vocabulary
+    names = by_name.get(entity) or by_key.get(name_key(entity), [])
+    # more candidates than would be cited means the name is too vague
+    return names if len(names) <= top_k else []
+
+
+def _resolve_conditions(entity: str, vocabulary) -> Tuple[str, List[str]]:
+    by_topic = vocabulary[3]
+    for topic in (entity, entity + "s", entity[:-1] if entity.endswith("s") else None):
+        if topic and topic in by_topic:
+            return topic, by_topic[topic]
+    return entity, []
+
+
+def _cite(name: str) -> str:
+    return f"{name} [Drug:{name}]"
+
+
+def _answer(intent: str, entity: str, projection: GraphProjection, top_k: int) -> Optional[Tuple[str, List[str]]]:
+    vocabulary = _get_vocabulary(projection)
+    if intent == "drugs_for":
+        topic, conditions = _resolve_conditions(entity, vocabulary)
+        drugs = list(dict.fromkeys(d for c in conditions for d in projection.drugs_treating(c)))
+        if not drugs:
+            return None
+        shown = drugs[:max(1, top_k)]
+        more = f" (and {len(drugs) - len(shown)} more)" if len(drugs) > len(shown) else ""
+        text = f"Drugs used for {topic}: {', '.join(_cite(d) for d in shown)}{more}."
+        return text, [f"Drug:{d}" for d in shown]
+
+    lines, sources = [], []
+    for drug in _resolve_drugs(entity, vocabulary, top_k):
+        if intent == "side_effects":
+            facts = projection.side_effects(drug)
+            line = f"Side effects of {_cite(drug)}: {', '.join(facts)}."
+        else:
+            facts = [use for condition in projection.conditions(drug) for use in _uses(condition)]
+            line = f"{_cite(drug)} is used for: {'; '.join(facts)}."
+        if facts:
+            lines.append(line)
+            sources.append(f"Drug:{drug}")
+    if not lines:
+        return None
+    return "\n".join(lines), sources
+
+
+def _record(intent: Optional[str], answered: bool):
+    global _seen, _answered
+    metrics.INTENT_ROUTES.inc(intent=intent or "none", outcome="answered" if answered else "fallback")
+    if answered:
+        metrics.ANSWERS.inc(source="graph")
+    with _counts_lock:
+        _seen += 1
+        _answered += answered
+        metrics.INTENT_HIT_RATIO.set(_answered / _seen)
+
+
+def _routed(matched: Optional[Tuple[str, str]], top_k: int, load_projection) -> Optional[Tuple[str, List[str]]]:
+    answer = None
+    if matched is not None:
+        try:
+            answer = _answer(*matched, load_projection(), top_k)
+        except Exception:
+            logger.exception("Intent router failed; falling back to RAG")
+    _record(matched[0] if matched else None, answer is not None)
+    return answer
+
+
+def route(question: str, top_k: int = 5) -> Optional[Tuple[str, List[str]]]:
+    """
+    (answer, sources) for a templated question the graph answers exactly, or
+    None to fall back to RAG. Sources use the RAG "Drug:<name>" format.
+    """
+    if not settings.INTENT_ROUTER_ENABLED:
+        return None
+    return _routed(match_intent(question), top_k, graph_service.get_graph_projection)
+
+
+async def aroute(question: str, top_k: int = 5) -> Optional[Tuple[str, List[str]]]:
+    """Async variant of `route`; loading the projection or its lookup tables runs off the event loop."""
+    if not settings.INTENT_ROUTER_ENABLED:
+        return None
+    matched = match_intent(question)
+    if matched is None:
+        return _routed(None, top_k, None)
+    try:
+        projection = await graph_service.aget_graph_projection()
+        if _vocabulary is None or _vocabulary[0] is not projection:
+            await asyncio.get_running_loop().run_in_executor(None, _get_vocabulary, projection)
+    except Exception:
+        logger.exception("Graph projection unavailable; falling back to RAG")
+        _record(matched[0], False)
+        return None
+    return _routed(matched, top_k, lambda: projection)
@@ -0,0 +1,263 @@
+# backend/app/services/lexical_index.py
+import bisect
+import difflib
+import heapq
+import logging
+import math
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger("medical-chatbot.services.lexical_index")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+# question words that carry no retrieval signal
+STOPWORDS = frozenset(
+    "a an and are can could do does for from how i in is it me my of on or should the to "
+    "what when which who why with you your about any common take taking used uses use "
+    "side effect effects drug drugs medicine medicines".split()
+)
+
+# dosage-form words dropped from the end of drug names when matching them in questions,
+# so "Augmentin 625 Duo side effects" finds "Augmentin 625 Duo Tablet"
+FORM_WORDS = frozenset(
+    "tablet tablets tab capsule capsules cap injection syrup suspension solution drops cream gel "
+    "ointment lotion spray inhaler respules powder sachet kit infusion vial dt sr er xr cr md".split()
+)
+
+# field weights: a term in the drug name counts as this many occurrences
+NAME_WEIGHT = 3
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def name_key(name: str) -> Tuple[str, ...]:
+    tokens = tokenize(name)
+    while len(tokens) > 1 and tokens[-1] in FORM_WORDS:
+        tokens.pop()
+    return tuple(tokens)
+
+
+class LexicalIndex:
+    """
+    In-memory inverted index over drug names, uses and side effects.
+
+    `search` ranks drugs with BM25; query terms missing from the vocabulary
+    are expanded to vocabulary terms they prefix or closely resemble, which
+    handles truncated and misspelled drug names. `exact_matches` finds drugs
+    whose full name (minus dosage-form words) appears verbatim in a question.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, fuzzy: bool = True):
+        self.k1 = k1
+        self.b = b
+        self.fuzzy = fuzzy
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._doc_terms: List[Dict[str, int]] = []
+        self._doc_len: List[int] = []
+        self._total_len = 0
+        self._live = 0
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # name key -> drug names, and first key token -> name keys
+        self._by_key: Dict[Tuple[str, ...], Set[str]] = {}
+        self._keys_by_first: Dict[str, Set[Tuple[str, ...]]] = {}
+        self._vocab: Optional[List[str]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __getstate__(self):
+        # pickled into shared index snapshots; the lock is per process
+        with self._lock:
+            state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        doc = self._ids.get(name)
+        return doc is not None and self._doc_len[doc] > 0
+
+    # ---- mutation ---------------------------------------------------------
+
+    def upsert(self, names: Sequence[str], conditions: Sequence[str], side_effects: Sequence[str]):
+        """
+        Index (or re-index) drugs. Conditions and side effects of a drug that is
+        already indexed are merged with what it had, as MERGE does in Neo4j.
+        """
+        with self._lock:
+            for name, cond, effects in zip(names, conditions, side_effects):
+                if not name:
+                    continue
+                terms: Dict[str, int] = {}
+                for tok in tokenize(name):
+                    terms[tok] = terms.get(tok, 0) + NAME_WEIGHT
+                for tok in tokenize(cond) + tokenize(effects):
+                    terms[tok] = terms.get(tok, 0) + 1
+                if not terms:
+                    continue
+
+                doc = self._ids.get(name)
+                if doc is None:
+                    doc = len(self._names)
+                    self._ids[name] = doc
+                    self._names.append(name)
+                    self._doc_terms.append({})
+                    self._doc_len.append(0)
+                    self._add_name(name)
+                old = self._doc_terms[doc]
+                if not old:
+                    self._live += 1
+                for term, tf in terms.items():
+                    if old.get(term, 0) >= tf:
+                        continue
+                    delta = tf - old.get(term, 0)
+                    old[term] = tf
+                    self._doc_len[doc] += delta
+                    self._total_len += delta
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = {}
+                        self._vocab = None
+                    postings[doc] = tf
+
+    def remove(self, names: Sequence[str]) -> int:
+        """Drop drugs from the index. Returns the number removed."""
+        removed = 0
+        with self._lock:
+            for name in dict.fromkeys(names):
+                doc = self._ids.pop(name, None)
+                if doc is None:
+                    continue
+                for term in self._doc_terms[doc]:
+                    postings = self._postings[term]
+                    del postings[doc]
+                    if not postings:
+                        del self._postings[term]
+                        self._vocab = None
+                if self._doc_terms[doc]:
+                    self._live -= 1
+                self._total_len -= self._doc_len[doc]
+                # the slot stays as a tombstone; re-adding the drug gets a new one
+                self._doc_terms[doc] = {}
+                self._doc_len[doc] = 0
+                self._remove_name(name)
+                removed += 1
+        return removed
+
+    def _remove_name(self, name: str):
+        key = name_key(name)
+        names = self._by_key.get(key)
+        if names is None:
+            return
+        names.discard(name)
+        if not names:
+            del self._by_key[key]
+            keys = self._keys_by_first[key[0]]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_first[key[0]]
+
+    def _add_name(self, name: str):
+        key = name_key(name)
+        if not key or all(t in STOPWORDS for t in key):
+            return
+        self._by_key.setdefault(key, set()).add(name)
+        self._keys_by_first.setdefault(key[0], set()).add(key)
+
+    # ---- exact name fast path ---------------------------------------------
+
+    def exact_matches(self, question: str) -> List[str]:
+        """
+        Drug names whose key occurs as a contiguous token run in `question`.
+        Only the longest matches are kept, so "Augmentin 625 Duo" wins over a
+        drug called plain "Augmentin". Runs in time linear in the question length.
+        """
+        tokens = tokenize(question)
+        spans: List[Tuple[int, int, Tuple[str, ...]]] = []
+        with self._lock:
+            for i, tok in enumerate(tokens):
+                for key in self._keys_by_first.get(tok, ()):
+                    if tuple(tokens[i:i + len(key)]) == key:
+                        spans.append((i, i + len(key), key))
+            if not spans:
+                return []
+            spans.sort(key=lambda s: (s[0] - s[1], s[0]))
+            taken: List[Tuple[int, int]] = []
+            names: List[str] = []
+            for start, end, key in spans:
+                if any(start >= s and end <= e for s, e in taken):
+                    continue
+                taken.append((start, end))
+                names.extend(sorted(self._by_key[key]))
+            return names
+
+    # ---- BM25 ---------------------------------------------------------------
+
+    def _expand(self, term: str) -> List[str]:
+        if term in self._postings:
+            return [term]
+        if not self.fuzzy or len(term) < 4:
+            return []
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        lo = bisect.bisect_left(self._vocab, term)
+        prefixed = []
+        for word in self._vocab[lo:lo + 20]:
+            if not word.startswith(term):
+                break
+            prefixed.append(word)
+        if prefixed:
+            return prefixed
+        # typo tolerance: only compare against words sharing the first letter
+        lo = bisect.bisect_left(self._vocab, term[0])
+        hi = bisect.bisect_left(self._vocab, chr(ord(term[0]) + 1))
+        return difflib.get_close_matches(term, self._vocab[lo:hi], n=2, cutoff=0.8)
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict[str, float]]:
+        """Return the `top_k` best BM25 matches as {"name", "score"} dicts."""
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t not in STOPWORDS]
+        if top_k <= 0 or not terms:
+            return []
+        scores: Dict[int, float] = {}
+        with self._lock:
+            n = self._live
+            if n == 0:
+                return []
+            avgdl = self._total_len / n
+            for term in terms:
+                for word in self._expand(term):
+                    postings = self._postings[word]
+                    idf = math.log(1.0 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc, tf in postings.items():
+                        norm = tf + self.k1 * (1.0 - self.b + self.b * self._doc_len[doc] / avgdl)
+                        scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1.0) / norm
+            best = heapq.nlargest(top_k, scores.items(), key=lambda kv: kv[1])
+            return [{"name": self._names[doc], "score": score} for doc, score in best]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Dict]], k: int = 60,
+                           top_k: Optional[int] = None) -> List[Dict]:
+    """
+    Fuse ranked hit lists with RRF: each hit scores sum(1 / (k + rank)) over
+    the lists it appears in. The first occurrence of a name supplies the
+    other fields (e.g. the vector hit's description); "score" becomes the
+    fused score.
+    """
+    fused: Dict[str, Dict] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            entry = fused.get(hit["name"])
+            if entry is None:
+                entry = fused[hit["name"]] = {**hit, "score": 0.0}
+            entry["score"] += 1.0 / (k + rank)
+    hits = sorted(fused.values(), key=lambda h: -h["score"])
+    return hits[:top_k] if top_k is not None else hits
@@ -1,40 +1,91 @@
 # backend/app/services/llm_service.py
 import os
 import logging
-from typing import List, Optional
+from typing import List, Optional, Iterator, AsyncIterator, Union
 
+from app.core import metrics
 from app.core.config import settings
 
 logger = logging.getLogger("medical-chatbot.services.llm_service")
 
-try:
-    # Official Groq Python package (docs: console.groq.com/docs/quickstart)
-    from groq import Groq
-    _GROQ_AVAILABLE = True
-except Exception:
-    _GROQ_AVAILABLE = False
-    logger.warning("groq package not available. Ensure `pip install groq` or your uv env has it.")
-
 
 class LLMService:
     def __init__(self, api_key: Optional[str] = None):
         api_key = api_key or settings.GROQ_API_KEY
         if not api_key:
             raise RuntimeError("GROQ_API_KEY is not set in environment/config.")
-        if not _GROQ_AVAILABLE:
-            raise RuntimeError("groq python package not installed.")
+        try:
+            # Official Groq Python package (docs: console.groq.com/docs/quickstart).
+            # Imported here so that importing this module stays cheap.
+            from groq import Groq, AsyncGroq
+        except Exception as e:
+            logger.warning("groq package not available. Ensure `pip install groq` or your uv env has it.")
+            raise RuntimeError("groq python package not installed.") from e
         self.client = Groq(api_key=api_key)
+        self.async_client = AsyncGroq(api_key=api_key)
 
-    def chat_completion(self, messages: List[dict], model: str = "openai/gpt-oss-20b", temperature: float = 0.0) -> str:
+    def chat_completion(self, messages: List[dict], model: str = "openai/gpt-oss-20b", temperature: float = 0.0,
+                        stream: bool = False) -> Union[str, Iterator[str]]:
         """
         messages: list of {"role": "system|user|assistant", "content": "..."}
+        With stream=True, returns a generator of content deltas as Groq produces them.
         """
         logger.info("Requesting chat completion from Groq")
+        metrics.LLM_REQUESTS.inc(mode="stream" if stream else "sync")
         resp = self.client.chat.completions.create(
             messages=messages,
             model=model,
             temperature=temperature,
+            stream=stream,
+        )
+        if stream:
+            return self._iter_deltas(resp)
+        _record_usage(getattr(resp, "usage", None))
+        return self._content(resp)
+
+    @staticmethod
+    def _iter_deltas(chunks) -> Iterator[str]:
+        for chunk in chunks:
+            _record_usage(_chunk_usage(chunk))
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    async def achat_completion(self, messages: List[dict], model: str = "openai/gpt-oss-20b", temperature: float = 0.0) -> str:
+        """
+        Async variant of `chat_completion` using the AsyncGroq client.
+        """
+        logger.info("Requesting async chat completion from Groq")
+        metrics.LLM_REQUESTS.inc(mode="async")
+        resp = await self.async_client.chat.completions.create(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+        )
+        _record_usage(getattr(resp, "usage", None))
+        return self._content(resp)
+
+    async def astream_chat_completion(self, messages: List[dict], model: str = "openai/gpt-oss-20b",
+                                      temperature: float = 0.0) -> AsyncIterator[str]:
+        """
+        Async generator of content deltas from a streamed Groq completion.
+        """
+        logger.info("Requesting streamed chat completion from Groq")
+        metrics.LLM_REQUESTS.inc(mode="stream")
+        resp = await self.async_client.chat.completions.create(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            stream=True,
         )
+        async for chunk in resp:
+            _record_usage(_chunk_usage(chunk))
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    @staticmethod
+    def _content(resp) -> str:
         # Groq response format: resp.choices[0].message.content
         try:
             return resp.choices[0].message.content
@@ -44,6 +95,18 @@ class LLMService:
             return str(resp)
 
 
+def _chunk_usage(chunk):
+    # streamed responses report usage once, on the final chunk (Groq puts it under x_groq)
+    return getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+
+
+def _record_usage(usage):
+    if usage is None:
+        return
+    metrics.LLM_TOKENS.inc(getattr(usage, "prompt_tokens", 0) or 0, kind="prompt")
+    metrics.LLM_TOKENS.inc(getattr(usage, "completion_tokens", 0) or 0, kind="completion")
+
+
 # helper singleton
 _llm_service = None
 
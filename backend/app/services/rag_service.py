@@ -1,48 +1,86 @@
 # backend/app/services/rag_service.py
+import asyncio
 import logging
-from typing import List, Tuple
-from app.utils.embeddings import embed_texts
-from app.services.graph_service import semantic_search_by_embedding, get_side_effects
+import time
+from typing import List, Tuple, AsyncIterator, Any, Dict, Optional
+from app.core import metrics
+from app.core.config import settings
+from app.utils.embeddings import embed_texts, aembed_texts
+from app.services.graph_service import (
+    exact_drug_hits,
+    aexact_drug_hits,
+    hybrid_search,
+    ahybrid_search,
+    ahybrid_search_batch,
+    get_drug_context,
+    aget_drug_context,
+    drug_embeddings,
+    add_ingest_listener,
+)
+from app.services.context_builder import aload_encoding, build_context, count_tokens
+from app.services import intent_router
 from app.services.llm_service import get_llm_service
+from app.services.answer_cache import get_answer_cache
 
 logger = logging.getLogger("medical-chatbot.services.rag_service")
 
+LLM_MODEL = "openai/gpt-oss-20b"
 
-def truncate_context(context_lines: List[str], max_chars: int = 4000) -> List[str]:
+
+def _invalidate_cached_answers(drug_names: List[str]):
+    get_answer_cache().invalidate_drugs(drug_names)
+
+
+add_ingest_listener(_invalidate_cached_answers)
+
+
+def _answer_cache():
+    return get_answer_cache() if settings.ANSWER_CACHE_ENABLED else None
+
+
+def _context_kwargs():
+    return {
+        "max_side_effects": settings.RAG_MAX_SIDE_EFFECTS,
+        "expand_neighbours": settings.RAG_EXPAND_NEIGHBOURS,
+        "max_related": settings.RAG_MAX_RELATED,
+    }
+
+
+def _prefetched_context(hits: List[dict]) -> Tuple[dict, List[str]]:
     """
-    Ensure the combined context does not exceed max_chars.
-    Keep top items and trim the rest.
+    Graph context that came with the hits (Neo4j vector search), and the
+    names of the remaining hits that still need a context query.
     """
-    result = []
-    total = 0
-    for line in context_lines:
-        if total + len(line) > max_chars:
-            break
-        result.append(line)
-        total += len(line)
-    return result
+    context = {h["name"]: h["context"] for h in hits if "context" in h}
+    missing = list(dict.fromkeys(h["name"] for h in hits if h["name"] not in context))
+    return context, missing
 
 
-def answer_question(question: str, top_k: int = 5) -> Tuple[str, List[str]]:
-    query_emb = embed_texts([question])[0]
-    hits = semantic_search_by_embedding(query_emb, top_k=top_k)
-
-    context_lines = []
-    sources = []
-    for hit in hits:
-        name = hit["name"]
-        score = hit["score"]
-        desc = hit.get("description") or ""
-        context_lines.append(f"Drug: {name} (score={score:.3f}) - {desc}")
-        sfx = get_side_effects(name)
-        if sfx:
-            context_lines.append(f"Side effects of {name}: {', '.join(sfx[:10])}")  # limit long lists
-        sources.append(f"Drug:{name}")
-    
-    logger.info("Context lines for question '%s': %s", question, context_lines)
-
-    # ✅ truncate context before sending to LLM
-    context_lines = truncate_context(context_lines, max_chars=4000)
+def _graph_context(hits: List[dict]) -> dict:
+    context, missing = _prefetched_context(hits)
+    if missing:
+        context.update(get_drug_context(missing, **_context_kwargs()))
+    return context
+
+
+async def _agraph_context(hits: List[dict]) -> dict:
+    context, missing = _prefetched_context(hits)
+    if missing:
+        context.update(await aget_drug_context(missing, **_context_kwargs()))
+    return context
+
+
+def _build_messages(question: str, hits: List[dict], graph_context: dict) -> Tuple[List[dict], List[str]]:
+    """
+    Prompt messages and the sources they cite. Context is packed by
+    context_builder within RAG_CONTEXT_TOKENS; only drugs that made it into
+    the context are returned as sources.
+    """
+    embeddings = drug_embeddings([h["name"] for h in hits]) if hits else None
+    context_lines, names, context_tokens = build_context(hits, graph_context, embeddings)
+    sources = [f"Drug:{name}" for name in names]
+    logger.info("Context for question '%s': %d of %d drugs, %d tokens", question, len(names), len(hits), context_tokens)
+    logger.debug("Context lines: %s", context_lines)
 
     system_prompt = (
         "You are a medical knowledge assistant. Use the provided context facts and only those facts "
@@ -55,8 +93,249 @@ def answer_question(question: str, top_k: int = 5) -> Tuple[str, List[str]]:
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
+    metrics.CONTEXT_TOKENS.observe(context_tokens, part="context")
+    metrics.CONTEXT_TOKENS.observe(count_tokens(system_prompt) + count_tokens(user_prompt), part="prompt")
+    return messages, sources
+
+
+def _cached_exact(cache, question: str, top_k: int):
+    if cache is None:
+        return None
+    with metrics.stage("answer_cache"):
+        cached = cache.get(question, top_k)
+    if cached is not None:
+        metrics.ANSWERS.inc(source="cache_exact")
+    return cached
+
+
+def _cached_similar(cache, query_emb, top_k: int):
+    if cache is None:
+        return None
+    with metrics.stage("answer_cache"):
+        cached = cache.get_similar(query_emb, top_k)
+    if cached is not None:
+        metrics.ANSWERS.inc(source="cache_similar")
+    return cached
+
+
+def _retrieve(cache, question: str, top_k: int):
+    """
+    Returns (cached_answer, hits, query_embedding). Templated graph questions
+    are answered by the intent router and come back like a cached answer. A
+    drug named verbatim in the question is answered from the lexical index
+    alone, without embedding the question; otherwise vector and BM25 hits are fused.
+    """
+    cached = _cached_exact(cache, question, top_k)
+    if cached is not None:
+        return cached, [], None
+    with metrics.stage("intent_router"):
+        routed = intent_router.route(question, top_k)
+    if routed is not None:
+        return routed, [], None
+    with metrics.stage("exact_name"):
+        hits = exact_drug_hits(question, top_k=top_k)
+    if hits:
+        metrics.RETRIEVALS.inc(path="exact_name")
+        return None, hits, None
+
+    with metrics.stage("embed"):
+        query_emb = embed_texts([question], as_array=True)[0]
+    cached = _cached_similar(cache, query_emb, top_k)
+    if cached is not None:
+        return cached, [], query_emb
+    with metrics.stage("vector_search"):
+        hits = hybrid_search(question, query_emb, top_k=top_k, context=_context_kwargs())
+    metrics.RETRIEVALS.inc(path="hybrid" if settings.HYBRID_SEARCH_ENABLED else "vector")
+    return None, hits, query_emb
+
+
+async def _aretrieve(cache, question: str, top_k: int):
+    """Async variant of `_retrieve`."""
+    cached = _cached_exact(cache, question, top_k)
+    if cached is not None:
+        return cached, [], None
+    with metrics.stage("intent_router"):
+        routed = await intent_router.aroute(question, top_k)
+    if routed is not None:
+        return routed, [], None
+    with metrics.stage("exact_name"):
+        hits = await aexact_drug_hits(question, top_k=top_k)
+    if hits:
+        metrics.RETRIEVALS.inc(path="exact_name")
+        return None, hits, None
+
+    with metrics.stage("embed"):
+        query_emb = (await aembed_texts([question], as_array=True))[0]
+    cached = _cached_similar(cache, query_emb, top_k)
+    if cached is not None:
+        return cached, [], query_emb
+    with metrics.stage("vector_search"):
+        hits = await ahybrid_search(question, query_emb, top_k=top_k, context=_context_kwargs())
+    metrics.RETRIEVALS.inc(path="hybrid" if settings.HYBRID_SEARCH_ENABLED else "vector")
+    return None, hits, query_emb
+
+
+def answer_question(question: str, top_k: int = 5) -> Tuple[str, List[str]]:
+    cache = _answer_cache()
+    cached, hits, query_emb = _retrieve(cache, question, top_k)
+    if cached is not None:
+        return cached
+
+    with metrics.stage("graph_context"):
+        graph_context = _graph_context(hits)
+    messages, sources = _build_messages(question, hits, graph_context)
 
     llm = get_llm_service()
-    answer_text = llm.chat_completion(messages=messages, model="openai/gpt-oss-20b", temperature=0.0)
+    with metrics.stage("llm"):
+        answer_text = llm.chat_completion(messages=messages, model=LLM_MODEL, temperature=0.0)
+    metrics.ANSWERS.inc(source="generated")
 
+    if cache is not None:
+        cache.put(question, top_k, answer_text, sources, [h["name"] for h in hits], embedding=query_emb)
     return answer_text, sources
+
+
+async def aanswer_question(question: str, top_k: int = 5) -> Tuple[str, List[str]]:
+    """
+    Async variant of `answer_question`: encoding runs on the embedding executor,
+    graph context comes from the async Neo4j driver and the completion from the
+    async Groq client, so no threadpool thread is held while waiting.
+    """
+    cache = _answer_cache()
+    cached, hits, query_emb = await _aretrieve(cache, question, top_k)
+    if cached is not None:
+        return cached
+
+    with metrics.stage("graph_context"):
+        graph_context = await _agraph_context(hits)
+    await aload_encoding()
+    messages, sources = _build_messages(question, hits, graph_context)
+
+    llm = get_llm_service()
+    with metrics.stage("llm"):
+        answer_text = await llm.achat_completion(messages=messages, model=LLM_MODEL, temperature=0.0)
+    metrics.ANSWERS.inc(source="generated")
+
+    if cache is not None:
+        cache.put(question, top_k, answer_text, sources, [h["name"] for h in hits], embedding=query_emb)
+    return answer_text, sources
+
+
+async def astream_answer(question: str, top_k: int = 5) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming variant of `aanswer_question`. Yields ("sources", [...]) as soon as
+    retrieval is done, then ("token", text) for each completion delta. Cached
+    answers are sent as a single token. The full answer is cached at the end.
+    """
+    cache = _answer_cache()
+    cached, hits, query_emb = await _aretrieve(cache, question, top_k)
+    if cached is not None:
+        yield "sources", cached[1]
+        yield "token", cached[0]
+        return
+
+    with metrics.stage("graph_context"):
+        graph_context = await _agraph_context(hits)
+    await aload_encoding()
+    messages, sources = _build_messages(question, hits, graph_context)
+    yield "sources", sources
+
+    llm = get_llm_service()
+    parts = []
+    started = time.perf_counter()
+    # "llm" includes time the client takes to read each token
+    with metrics.stage("llm"):
+        async for delta in llm.astream_chat_completion(messages=messages, model=LLM_MODEL, temperature=0.0):
+            if not parts:
+                metrics.STAGE_LATENCY.observe(time.perf_counter() - started, stage="llm_first_token")
+            parts.append(delta)
+            yield "token", delta
+    metrics.ANSWERS.inc(source="generated")
+
+    if cache is not None:
+        cache.put(question, top_k, "".join(parts), sources, [h["name"] for h in hits], embedding=query_emb)
+
+
+async def aanswer_batch(questions: List[str], top_k: int = 5,
+                        concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Answer many questions at once and yield one result dict per question as
+    soon as it is ready (not in input order). Templated graph questions are
+    answered by the intent router up front. Uncached questions that do not
+    name a drug are embedded in one batch and searched with one matrix
+    multiply; all share a single graph-context query for the union of their
+    hits; completions then
+    run concurrently, at most `concurrency` (BATCH_LLM_CONCURRENCY) at a time.
+    A failing item yields {"index", "question", "error"} without affecting others.
+    """
+    cache = _answer_cache()
+    pending = []
+    for i, question in enumerate(questions):
+        cached = _cached_exact(cache, question, top_k)
+        if cached is not None:
+            yield {"index": i, "question": question, "answer": cached[0], "sources": cached[1], "cached": True}
+            continue
+        with metrics.stage("intent_router"):
+            routed = await intent_router.aroute(question, top_k)
+        if routed is not None:
+            yield {"index": i, "question": question, "answer": routed[0], "sources": routed[1], "cached": False}
+        else:
+            pending.append(i)
+    if not pending:
+        return
+
+    try:
+        # questions naming a drug skip embedding; the rest share one batched search
+        found: Dict[int, List[dict]] = {}
+        for i in pending:
+            hits = await aexact_drug_hits(questions[i], top_k=top_k)
+            if hits:
+                found[i] = hits
+        to_embed = [i for i in pending if i not in found]
+        embedded = {}
+        if to_embed:
+            with metrics.stage("embed"):
+                embeddings = await aembed_texts([questions[i] for i in to_embed], as_array=True)
+            with metrics.stage("vector_search"):
+                batch_hits = await ahybrid_search_batch([questions[i] for i in to_embed], embeddings,
+                                                        top_k=top_k, context=_context_kwargs())
+            found.update(zip(to_embed, batch_hits))
+            embedded.update(zip(to_embed, embeddings))
+        all_hits = [found[i] for i in pending]
+        with metrics.stage("graph_context"):
+            graph_context = await _agraph_context([h for hits in all_hits for h in hits])
+        await aload_encoding()
+    except Exception as e:
+        logger.exception("Batch retrieval failed")
+        for i in pending:
+            yield {"index": i, "question": questions[i], "error": str(e)}
+        return
+
+    llm = get_llm_service()
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.BATCH_LLM_CONCURRENCY))
+
+    async def answer_one(i: int, hits: List[dict], embedding) -> Dict[str, Any]:
+        question = questions[i]
+        try:
+            messages, sources = _build_messages(question, hits, graph_context)
+            async with semaphore:
+                with metrics.stage("llm"):
+                    answer_text = await llm.achat_completion(messages=messages, model=LLM_MODEL, temperature=0.0)
+        except Exception as e:
+            logger.exception("Batch item %d failed", i)
+            return {"index": i, "question": question, "error": str(e)}
+        metrics.ANSWERS.inc(source="generated")
+        if cache is not None:
+            cache.put(question, top_k, answer_text, sources, [h["name"] for h in hits], embedding=embedding)
+        return {"index": i, "question": question, "answer": answer_text, "sources": sources, "cached": False}
+
+    tasks = [
+        asyncio.ensure_future(answer_one(i, hits, emb))
+        for i, hits, emb in zip(pending, all_hits, [embedded.get(i) for i in pending])
+    ]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,382 @@
+# backend/app/services/vector_index.py
+import json
+import logging
+import os
+import threading
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger("medical-chatbot.services.vector_index")
+
+
+def _normalize_rows(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+class VectorIndex:
+    """
+    In-process vector index over Drug embeddings.
+
+    Rows live in one contiguous float32 matrix and are L2-normalized on insert,
+    so cosine similarity is a single matrix-vector product. Small indexes are
+    searched exactly; once `min_train_size` rows are present an IVF structure
+    (spherical k-means coarse quantizer + inverted lists) is trained and
+    queries only scan the `nprobe` closest lists.
+    """
+
+    def __init__(self, dim: Optional[int] = None, nlist: int = 0, nprobe: int = 8,
+                 min_train_size: int = 2048, use_ivf: bool = True):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.use_ivf = use_ivf
+
+        self.names: List[str] = []
+        self.descriptions: List[Optional[str]] = []
+        self._row: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+
+        # IVF state
+        self._centroids: Optional[np.ndarray] = None
+        self._assign: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._list_arrays: Dict[int, np.ndarray] = {}
+        self._trained_size = 0
+        self._training = False
+        # bumped by every upsert / remove, so a retrain can tell its snapshot went stale
+        self._version = 0
+
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_settings(cls) -> "VectorIndex":
+        return cls(
+            nlist=settings.VECTOR_INDEX_NLIST,
+            nprobe=settings.VECTOR_INDEX_NPROBE,
+            min_train_size=settings.VECTOR_INDEX_MIN_TRAIN_SIZE,
+            use_ivf=settings.VECTOR_INDEX_MODE == "ivf",
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._row
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Normalized embeddings of all rows (view, do not mutate)."""
+        if self._matrix is None:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return self._matrix[: self._size]
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    # ---- mutation ---------------------------------------------------------
+
+    def _ensure_capacity(self, extra: int):
+        needed = self._size + extra
+        if self._matrix is None:
+            self._matrix = np.zeros((max(needed, 1024), self.dim), dtype=np.float32)
+            self._assign = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        elif needed > self._matrix.shape[0] or not self._matrix.flags.writeable:
+            # a memory-mapped snapshot is read-only: the first write copies it into private memory
+            capacity = max(needed, self._matrix.shape[0] * 2) if needed > self._matrix.shape[0] else needed
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+            assign = np.full(capacity, -1, dtype=np.int32)
+            assign[: self._size] = self._assign[: self._size]
+            self._assign = assign
+
+    def upsert(self, names: Sequence[str], embeddings, descriptions: Optional[Sequence[Optional[str]]] = None):
+        """
+        Insert or replace rows. Existing descriptions are kept, mirroring the
+        `coalesce(d.description, $desc)` used when writing Drug nodes.
+        """
+        if len(names) == 0:
+            return
+        vecs = np.asarray(embeddings, dtype=np.float32)
+        if vecs.ndim == 1:
+            vecs = vecs.reshape(1, -1)
+        if self.dim is None:
+            self.dim = vecs.shape[1]
+        if vecs.shape[1] != self.dim:
+            raise ValueError(f"embedding dimension {vecs.shape[1]} does not match index dimension {self.dim}")
+        vecs = _normalize_rows(vecs)
+        if descriptions is None:
+            descriptions = [None] * len(names)
+
+        retrain = False
+        with self._lock:
+            self._ensure_capacity(len(names))
+            self._version += 1
+            new_rows = []
+            for name, vec, desc in zip(names, vecs, descriptions):
+                row = self._row.get(name)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._row[name] = row
+                    self.names.append(name)
+                    self.descriptions.append(desc)
+                elif self.descriptions[row] is None:
+                    self.descriptions[row] = desc
+                self._matrix[row] = vec
+                new_rows.append(row)
+
+            if self.is_trained:
+                # searchable through the current lists until a retrain swaps them
+                self._assign_rows(np.asarray(new_rows, dtype=np.int64))
+                retrain = self._size >= 2 * self._trained_size
+            else:
+                retrain = self.use_ivf and self._size >= self.min_train_size
+        if retrain:
+            self.train()
+
+    def remove(self, names: Sequence[str]) -> int:
+        """
+        Delete rows by name. The last row is moved into each hole so the matrix
+        stays contiguous. Returns the number of rows removed.
+        """
+        with self._lock:
+            names = [n for n in dict.fromkeys(names) if n in self._row]
+            if not names:
+                return 0
+            # copies a read-only mapped matrix before writing to it
+            self._ensure_capacity(0)
+            self._version += 1
+            for name in names:
+                row = self._row.pop(name)
+                last = self._size - 1
+                self._unlist(row)
+                if row != last:
+                    moved = self.names[last]
+                    self._matrix[row] = self._matrix[last]
+                    self.names[row] = moved
+                    self.descriptions[row] = self.descriptions[last]
+                    self._row[moved] = row
+                    lst = int(self._assign[last])
+                    if lst >= 0:
+                        self._lists[lst][self._lists[lst].index(last)] = row
+                        self._list_arrays.pop(lst, None)
+                    self._assign[row] = lst
+                    self._assign[last] = -1
+                self.names.pop()
+                self.descriptions.pop()
+                self._size -= 1
+            return len(names)
+
+    def _unlist(self, row: int):
+        lst = int(self._assign[row])
+        if lst >= 0:
+            self._lists[lst].remove(row)
+            self._list_arrays.pop(lst, None)
+            self._assign[row] = -1
+
+    def _assign_rows(self, rows: np.ndarray):
+        lists = np.argmax(self._matrix[rows] @ self._centroids.T, axis=1)
+        for row, lst in zip(rows.tolist(), lists.tolist()):
+            old = int(self._assign[row])
+            if old == lst:
+                continue
+            if old >= 0:
+                self._lists[old].remove(row)
+                self._list_arrays.pop(old, None)
+            self._lists[lst].append(row)
+            self._list_arrays.pop(lst, None)
+            self._assign[row] = lst
+
+    def _set_lists(self, assign: np.ndarray, nlist: int):
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+        self._lists = [order[bounds[lst]:bounds[lst + 1]].tolist() for lst in range(nlist)]
+        self._list_arrays = {}
+
+    def train(self, iterations: int = 10, seed: int = 0):
+        """
+        Fit the IVF coarse quantizer with spherical k-means and rebuild the lists.
+        The k-means runs outside the lock, so searches and upserts carry on with
+        the previous lists meanwhile; the lock is only held to sample the rows
+        and to swap in the result. If rows changed in between, they are
+        reassigned to the new centroids under the lock.
+        """
+        with self._lock:
+            n = self._size
+            if n == 0 or self._training:
+                return
+            version = self._version
+            data = self.matrix
+            nlist = min(self.nlist or max(1, int(np.sqrt(n))), n)
+            rng = np.random.default_rng(seed)
+            sample = data[rng.choice(n, size=min(n, nlist * 64), replace=False)]
+            self._training = True
+        try:
+            centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                empty = np.bincount(labels, minlength=nlist) == 0
+                sums[empty] = centroids[empty]
+                centroids = _normalize_rows(sums).astype(np.float32)
+            # `data` may be written concurrently; the result is only kept if it was not
+            assign = np.argmax(data @ centroids.T, axis=1).astype(np.int32)
+
+            with self._lock:
+                if self._version != version:
+                    assign = np.argmax(self.matrix @ centroids.T, axis=1).astype(np.int32)
+                n = self._size
+                self._centroids = centroids
+                self._assign[:] = -1
+                self._assign[:n] = assign
+                self._set_lists(assign, nlist)
+                self._trained_size = n
+        finally:
+            self._training = False
+        logger.info("Trained IVF vector index: %d rows, %d lists", n, nlist)
+
+    def vectors(self, names: Sequence[str]) -> np.ndarray:
+        """Normalized embeddings of `names`; zero rows for names not in the index."""
+        with self._lock:
+            out = np.zeros((len(names), self.dim or 0), dtype=np.float32)
+            for i, name in enumerate(names):
+                row = self._row.get(name)
+                if row is not None:
+                    out[i] = self._matrix[row]
+        return out
+
+    # ---- persistence ------------------------------------------------------
+
+    def save(self, path: str):
+        """
+        Write the index to directory `path`: the normalized matrix as .npy (so
+        it can be memory-mapped), IVF state, and names/descriptions as JSON.
+        """
+        os.makedirs(path, exist_ok=True)
+        with self._lock:
+            np.save(os.path.join(path, "matrix.npy"), self.matrix)
+            if self.is_trained:
+                np.save(os.path.join(path, "centroids.npy"), self._centroids)
+                np.save(os.path.join(path, "assign.npy"), self._assign[: self._size])
+            meta = {
+                "dim": self.dim, "nlist": self.nlist, "nprobe": self.nprobe,
+                "min_train_size": self.min_train_size, "use_ivf": self.use_ivf,
+                "trained_size": self._trained_size, "names": self.names, "descriptions": self.descriptions,
+            }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "VectorIndex":
+        """
+        Load an index written by `save`. With `mmap` the matrix is mapped
+        read-only, so every process loading the same file shares one copy
+        in the page cache; it is copied only if this process modifies it.
+        """
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(dim=meta["dim"], nlist=meta["nlist"], nprobe=meta["nprobe"],
+                    min_train_size=meta["min_train_size"], use_ivf=meta["use_ivf"])
+        index.names = meta["names"]
+        index.descriptions = meta["descriptions"]
+        index._row = {name: i for i, name in enumerate(index.names)}
+        index._size = len(index.names)
+        if index._size:
+            index._matrix = np.load(os.path.join(path, "matrix.npy"), mmap_mode="r" if mmap else None)
+        index._assign = np.full(index._size, -1, dtype=np.int32)
+        centroids_path = os.path.join(path, "centroids.npy")
+        if os.path.exists(centroids_path):
+            index._centroids = np.load(centroids_path)
+            index._assign[:] = np.load(os.path.join(path, "assign.npy"))
+            index._set_lists(index._assign, index._centroids.shape[0])
+            index._trained_size = meta["trained_size"]
+        return index
+
+    # ---- search -----------------------------------------------------------
+
+    def _candidates(self, q: np.ndarray, nprobe: int) -> np.ndarray:
+        probes = np.argsort(-(self._centroids @ q))[:nprobe]
+        arrays = []
+        for p in probes.tolist():
+            arr = self._list_arrays.get(p)
+            if arr is None:
+                arr = np.asarray(self._lists[p], dtype=np.int64)
+                self._list_arrays[p] = arr
+            arrays.append(arr)
+        return np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+
+    def search(self, query_embedding, top_k: int = 5, exact: bool = False,
+               nprobe: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return the `top_k` most similar rows as {"name", "score", "description"} dicts.
+        `exact=True` forces the vectorized brute-force scan even when IVF is trained.
+        """
+        if top_k <= 0 or self._size == 0:
+            return []
+        q = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(q)
+        if norm == 0:
+            return []
+        q = q / norm
+
+        with self._lock:
+            if self.is_trained and not exact:
+                rows = self._candidates(q, nprobe or self.nprobe)
+                scores = self._matrix[rows] @ q
+            else:
+                rows = None
+                scores = self.matrix @ q
+
+            k = min(top_k, scores.shape[0])
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            if rows is not None:
+                top_rows = rows[top]
+            else:
+                top_rows = top
+            return [
+                {"name": self.names[r], "score": float(s), "description": self.descriptions[r]}
+                for r, s in zip(top_rows.tolist(), scores[top].tolist())
+            ]
+
+    def search_batch(self, query_embeddings, top_k: int = 5, block_size: int = 256) -> List[List[Dict[str, Any]]]:
+        """
+        Exact top-k for many queries at once: each block of `block_size` queries
+        is scored against the whole matrix with one matrix multiply.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        if top_k <= 0 or self._size == 0 or queries.shape[0] == 0:
+            return [[] for _ in range(queries.shape[0])]
+        queries = _normalize_rows(queries)
+
+        results: List[List[Dict[str, Any]]] = []
+        with self._lock:
+            matrix = self.matrix
+            k = min(top_k, matrix.shape[0])
+            for start in range(0, queries.shape[0], block_size):
+                scores = queries[start:start + block_size] @ matrix.T
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                top_scores = np.take_along_axis(scores, top, axis=1)
+                order = np.argsort(-top_scores, axis=1)
+                top = np.take_along_axis(top, order, axis=1)
+                top_scores = np.take_along_axis(top_scores, order, axis=1)
+                for rows, row_scores in zip(top.tolist(), top_scores.tolist()):
+                    results.append([
+                        {"name": self.names[r], "score": float(sc), "description": self.descriptions[r]}
+                        for r, sc in zip(rows, row_scores)
+                    ])
+        return results
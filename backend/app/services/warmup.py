@@ -0,0 +1,100 @@
+# backend/app/services/warmup.py
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.core import readiness
+from app.core.config import settings
+
+logger = logging.getLogger("medical-chatbot.services.warmup")
+
+
+def _warm_neo4j():
+    from app.db.neo4j_driver import get_driver
+    get_driver().verify_connectivity()
+
+
+def _warm_embeddings():
+    from app.utils.embeddings import prewarm_model
+    prewarm_model()
+
+
+def _warm_tokenizer():
+    from app.services.context_builder import load_encoding
+    load_encoding()
+
+
+def _warm_vector_index():
+    from app.services.graph_service import get_vector_index, get_lexical_index, use_neo4j_vector_index
+    from app.utils.embeddings import embed_texts
+    # the Neo4j backend only needs its index checked; the in-process one is built here
+    neo4j_ready = settings.VECTOR_SEARCH_BACKEND == "neo4j" and use_neo4j_vector_index(
+        embed_texts(["warmup"], as_array=True).shape[1])
+    if not neo4j_ready:
+        get_vector_index()
+    if settings.HYBRID_SEARCH_ENABLED:
+        get_lexical_index()
+
+
+def _warm_graph_projection():
+    from app.services.graph_service import get_graph_projection
+    from app.services.intent_router import warm
+    get_graph_projection()
+    warm()
+
+
+def _warm_llm():
+    from app.services.llm_service import get_llm_service
+    get_llm_service()
+
+
+# Run in this order: the indexes and graph projection need Neo4j, the rest are independent
+COMPONENTS: Dict[str, Callable[[], None]] = {
+    "neo4j": _warm_neo4j,
+    "embeddings": _warm_embeddings,
+    "tokenizer": _warm_tokenizer,
+    "vector_index": _warm_vector_index,
+    "graph_projection": _warm_graph_projection,
+    "llm": _warm_llm,
+}
+
+
+def _selected() -> List[str]:
+    wanted = [c.strip() for c in settings.PREWARM_COMPONENTS.split(",") if c.strip()]
+    return [c for c in COMPONENTS if c in wanted]
+
+
+def prewarm(started_at: float):
+    """
+    Load every selected component in turn, recording readiness and timings.
+    `started_at` is the perf_counter value at process start, for time-to-ready.
+    """
+    for name in _selected():
+        readiness.mark_loading(name)
+        try:
+            COMPONENTS[name]()
+            readiness.mark_ready(name)
+            logger.info("Prewarmed %s in %.2fs", name, readiness.snapshot()[name]["seconds"])
+        except Exception as e:
+            readiness.mark_failed(name, str(e))
+            logger.exception("Prewarm of %s failed", name)
+    state = "ready" if readiness.is_ready() else "NOT ready"
+    logger.info("Application %s %.2fs after process start", state, time.perf_counter() - started_at)
+
+
+def start_prewarm(started_at: float) -> Optional[threading.Thread]:
+    """
+    Register components for /api/ready and, if PREWARM_ON_STARTUP is set,
+    warm them in a background thread so startup itself is not delayed.
+    """
+    selected = _selected()
+    for name in COMPONENTS:
+        prewarmed = settings.PREWARM_ON_STARTUP and name in selected
+        readiness.register(name, readiness.PENDING if prewarmed else readiness.LAZY)
+    if not settings.PREWARM_ON_STARTUP or not selected:
+        logger.info("Prewarm disabled; components load on first use")
+        return None
+    thread = threading.Thread(target=prewarm, args=(started_at,), name="prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,5 @@
+# backend/app/tests/conftest.py
+import os
+
+# Tests run without a Neo4j server: fail fast instead of retrying unreachable connections.
+os.environ.setdefault("NEO4J_MAX_TRANSACTION_RETRY_TIME", "0")
@@ -0,0 +1,30 @@
+# backend/app/tests/test_answer_cache.py
+import numpy as np
+from app.services.answer_cache import AnswerCache
+
+
+def test_exact_and_near_duplicate_hits():
+    cache = AnswerCache(similarity_threshold=0.9)
+    emb = np.array([1.0, 0.0, 0.0])
+    cache.put("Side effects of paracetamol?", 5, "nausea", ["Drug:Paracetamol"], ["Paracetamol"], embedding=emb)
+
+    assert cache.get("  side effects of PARACETAMOL ", 5) == ("nausea", ["Drug:Paracetamol"])
+    assert cache.get("side effects of paracetamol", 3) is None
+    assert cache.get_similar(np.array([0.99, 0.05, 0.0]), 5)[0] == "nausea"
+    assert cache.get_similar(np.array([0.0, 1.0, 0.0]), 5) is None
+
+
+def test_invalidation_ttl_and_size_limits():
+    cache = AnswerCache(max_entries=2, ttl=0)
+    cache.put("q1", 5, "a1", [], ["Aspirin"])
+    cache.put("q2", 5, "a2", [], ["Ibuprofen"])
+    cache.put("q3", 5, "a3", [], ["Aspirin"])  # evicts q1
+    assert cache.get("q1", 5) is None
+
+    assert cache.invalidate_drugs(["Aspirin"]) == 1
+    assert cache.get("q3", 5) is None
+    assert cache.get("q2", 5) is not None
+
+    expiring = AnswerCache(ttl=1e-9)
+    expiring.put("q", 5, "a", [], [])
+    assert expiring.get("q", 5) is None
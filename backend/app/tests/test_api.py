@@ -2,6 +2,7 @@
 from fastapi.testclient import TestClient
 import sys
 import os
+import time
 
 # Ensure package import path covers app
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
@@ -23,3 +24,61 @@ def test_ask_placeholder():
     resp = client.post("/api/ask", json={"question": "What are common side effects of aspirin?", "top_k": 3})
     # If external services are unavailable, we should still get a 500 (but not 404)
     assert resp.status_code in (200, 500)
+
+
+def test_unknown_ingest_job():
+    resp = client.get("/api/admin/jobs/does-not-exist")
+    assert resp.status_code == 404
+
+
+def test_uploaded_file_is_removed_after_job(monkeypatch):
+    from app.services import graph_service, ingest_jobs
+
+    def failing_ingest(path, progress=None):
+        assert os.path.exists(path)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(graph_service, "ingest_drug_file", failing_ingest)
+    monkeypatch.setattr(ingest_jobs, "_manager", None)
+    resp = client.post("/api/admin/upload_and_ingest", files={"file": ("drugs.csv", b"Medicine Name\nA\n")})
+    assert resp.status_code == 202
+    job = ingest_jobs.get_job_manager().get(resp.json()["job_id"])
+    job.future.result(timeout=10)
+    assert job.state == ingest_jobs.FAILED
+    # done callbacks may run just after result() returns
+    deadline = time.time() + 5
+    while os.path.exists(job.path) and time.time() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(job.path)
+    ingest_jobs.shutdown_job_manager()
+
+
+def test_ask_stream_is_event_stream():
+    resp = client.post("/api/ask/stream", json={"question": "What is paracetamol used for?", "top_k": 3})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    # without Neo4j/LLM configured the stream ends with an error event instead of a 500
+    assert "event: done" in resp.text or "event: error" in resp.text
+
+
+def test_ready_reports_components():
+    resp = client.get("/api/ready")
+    assert resp.status_code in (200, 503)
+    assert "components" in resp.json()
+
+
+def test_metrics_endpoint():
+    client.get("/api/health")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'medchat_http_requests_total{path="/api/health",method="GET",status="200"}' in resp.text
+
+
+def test_feedback_is_accepted():
+    resp = client.post("/api/feedback", json={
+        "question": "What is paracetamol used for?", "answer": "Fever and pain.", "rating": 5,
+        "sources": ["Drug:Paracetamol"],
+    })
+    assert resp.status_code == 202
+    assert resp.json()["answer_id"]
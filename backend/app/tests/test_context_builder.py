@@ -0,0 +1,60 @@
+# backend/app/tests/test_context_builder.py
+import numpy as np
+
+from app.services.context_builder import build_context, count_tokens, mmr_order
+
+
+def _drug(effects, conditions=("Fever",)):
+    return {"description": "", "conditions": list(conditions), "side_effects": list(effects), "related": []}
+
+
+def test_shared_facts_are_stated_once():
+    hits = [{"name": "A", "score": 0.9}, {"name": "B", "score": 0.8}]
+    ctx = {"A": _drug(["Nausea", "Headache", "Rash"]), "B": _drug(["Nausea", "Headache", "Cough"])}
+    lines, names, tokens = build_context(hits, ctx, max_tokens=10000)
+    assert names == ["A", "B"]
+    text = "\n".join(lines)
+    assert text.count("Nausea") == 1 and text.count("Fever") == 1
+    assert "Side effects of A, B: Nausea, Headache" in lines
+    assert "Side effects of B: Cough" in lines
+    assert tokens == count_tokens(text)
+
+
+def test_packing_respects_the_budget():
+    hits = [{"name": f"D{i}", "score": 1.0 - i / 10} for i in range(5)]
+    ctx = {h["name"]: _drug([f"Effect{h['name']}{j}" for j in range(20)], [h["name"]]) for h in hits}
+    full, _, full_tokens = build_context(hits, ctx, max_tokens=10000)
+    lines, names, tokens = build_context(hits, ctx, max_tokens=full_tokens // 2)
+    assert names[0] == "D0" and tokens <= full_tokens // 2
+    # drugs that do not fit whole are kept without their side effects
+    assert 0 < sum(line.startswith("Side effects of") for line in lines) < 5
+    # the top drug is kept even when nothing fits
+    _, names, _ = build_context(hits, ctx, max_tokens=1)
+    assert names == ["D0"]
+
+
+def test_mmr_prefers_diverse_hits():
+    a = np.array([1.0, 0.0], dtype=np.float32)
+    b = np.array([0.0, 1.0], dtype=np.float32)
+    embeddings = np.stack([a, a, b])
+    assert mmr_order([0.9, 0.89, 0.8], embeddings, 0.5) == [0, 2, 1]
+    assert mmr_order([0.9, 0.89, 0.8], embeddings, 1.0) == [0, 1, 2]
+    assert mmr_order([0.9, 0.89, 0.8], None, 0.5) == [0, 1, 2]
+
+
+def test_encoding_loads_off_the_event_loop(monkeypatch):
+    import asyncio
+    import threading
+    from app.services import context_builder
+
+    loaded_in = []
+
+    def fake_get_encoding():
+        loaded_in.append(threading.current_thread())
+        context_builder._encoding = False
+
+    monkeypatch.setattr(context_builder, "_encoding", None)
+    monkeypatch.setattr(context_builder, "_get_encoding", fake_get_encoding)
+    asyncio.run(context_builder.aload_encoding())
+    asyncio.run(context_builder.aload_encoding())
+    assert len(loaded_in) == 1 and loaded_in[0] is not threading.main_thread()
@@ -0,0 +1,21 @@
+# backend/app/tests/test_embedding_backends.py
+import numpy as np
+import pytest
+from app.utils.embedding_backends import HashingBackend, create_backend
+
+
+def test_hashing_backend_is_deterministic_and_normalized():
+    backend = HashingBackend("unused", dim=64)
+    a = backend.encode(["paracetamol relieves fever", "amoxicillin may cause diarrhea"])
+    b = backend.encode(["paracetamol relieves fever", "amoxicillin may cause diarrhea"])
+    assert a.dtype == np.float32 and a.shape == (2, 64)
+    assert np.array_equal(a, b)
+    assert np.allclose(np.linalg.norm(a, axis=1), 1.0)
+    # shared words make texts closer than unrelated ones
+    c = backend.encode(["paracetamol fever dose", "diarrhea"])
+    assert float(a[0] @ c[0]) > float(a[0] @ c[1])
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        create_backend("does-not-exist")
@@ -0,0 +1,22 @@
+# backend/app/tests/test_embedding_cache.py
+import numpy as np
+from app.utils.embedding_cache import EmbeddingCache, cache_key
+
+
+def test_cache_key_depends_on_model_and_text():
+    assert cache_key("m1", "aspirin") == cache_key("m1", "aspirin")
+    assert cache_key("m1", "aspirin") != cache_key("m2", "aspirin")
+
+
+def test_memory_tier_lru_and_counters():
+    cache = EmbeddingCache(max_items=2, persist=False)
+    cache.put_many({"a": np.ones(3), "b": np.zeros(3)})
+    assert set(cache.get_many(["a", "c"])) == {"a"}
+
+    cache.put_many({"c": np.full(3, 2.0)})  # evicts "b", the least recently used
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 3
+    assert stats["misses"] == 2
+    assert stats["memory_items"] == 2
@@ -0,0 +1,68 @@
+# backend/app/tests/test_feedback.py
+import pytest
+
+from app.core.config import settings
+from app.db import database
+from app.utils.feedback import FeedbackWriter, query_feedback, feedback_summary_by_drug, answer_id
+
+
+@pytest.fixture
+def sqlite_path(tmp_path, monkeypatch):
+    database.close_all()
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "feedback.db"))
+    yield settings.SQLITE_PATH
+    database.close_all()
+
+
+def test_write_behind_batches_and_queries(sqlite_path):
+    writer = FeedbackWriter(batch_size=100, flush_interval=0.05)
+    aid = answer_id("q", "a")
+    for i in range(1000):
+        assert writer.submit(f"q{i}", "a", rating=i % 5, answer_id=f"id-{i % 10}", drugs=["Crocin"])
+    writer.submit("q", "a", rating=5, answer_id=aid, drugs=["Augmentin 625 Duo Tablet", "Crocin"])
+    assert writer.flush(timeout=10)
+    writer.close()
+
+    assert writer.stats() == {"pending": 0, "written": 1001, "dropped": 0}
+    with database.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    rows = query_feedback(answer_id=aid)
+    assert len(rows) == 1 and rows[0]["drugs"] == ["Augmentin 625 Duo Tablet", "Crocin"]
+    assert len(query_feedback(drug="Augmentin 625 Duo Tablet")) == 1
+    assert len(query_feedback(answer_id="id-3", drug="Crocin", limit=1000)) == 100
+    assert feedback_summary_by_drug()[0] == {"drug": "Crocin", "feedback": 1001, "avg_rating": pytest.approx(2.0, abs=0.01)}
+
+
+def test_full_queue_drops(sqlite_path):
+    writer = FeedbackWriter(queue_size=1, flush_interval=5)
+    writer._ensure_started = lambda: None  # keep the writer thread from draining the queue
+    assert writer.submit("q", "a")
+    assert not writer.submit("q", "a")
+    assert writer.dropped == 1
+
+
+def test_connections_are_pooled_across_threads(sqlite_path, monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(settings, "SQLITE_POOL_SIZE", 2)
+    database.close_all()
+
+    def query():
+        with database.connection() as conn:
+            return conn.execute("SELECT count(*) FROM feedback").fetchone()[0]
+
+    threads = [threading.Thread(target=query) for _ in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert database.open_connections() <= 2
+
+    # a surviving worker keeps working across close_all()
+    with ThreadPoolExecutor(1) as pool:
+        assert pool.submit(query).result() == 0
+        database.close_all()
+        assert database.open_connections() == 0
+        assert pool.submit(query).result() == 0
@@ -0,0 +1,31 @@
+# backend/app/tests/test_graph_projection.py
+from app.services.graph_projection import GraphProjection
+
+
+def _projection():
+    return GraphProjection(
+        ["Augmentin 625 Duo Tablet", "Azithral 500 Tablet", "Crocin Advance Tablet", "Vitamin D3 Drops"],
+        [["Bacterial infections"], ["Bacterial infections"], ["Pain relief", "Fever"], []],
+        [["Vomiting", "Nausea", "Diarrhea"], ["Nausea", "Diarrhea", "Nausea"], ["Nausea"], None],
+    )
+
+
+def test_lookups_in_both_directions():
+    projection = _projection()
+    assert len(projection) == 4 and "Vitamin D3 Drops" in projection
+    assert projection.side_effects("Augmentin 625 Duo Tablet") == ["Vomiting", "Nausea", "Diarrhea"]
+    assert projection.side_effects("Augmentin 625 Duo Tablet", limit=1) == ["Vomiting"]
+    assert projection.side_effects("Azithral 500 Tablet") == ["Nausea", "Diarrhea"]
+    assert projection.conditions("Crocin Advance Tablet") == ["Pain relief", "Fever"]
+    assert projection.drugs_treating("Bacterial infections") == ["Augmentin 625 Duo Tablet", "Azithral 500 Tablet"]
+    assert projection.drugs_with_side_effect("Nausea", limit=2) == ["Augmentin 625 Duo Tablet", "Azithral 500 Tablet"]
+    assert projection.side_effects("Vitamin D3 Drops") == []
+    assert projection.side_effects("Unknown") == [] and projection.drugs_treating("Unknown") == []
+
+
+def test_drugs_sharing_side_effects():
+    projection = _projection()
+    assert projection.drugs_sharing_side_effects("Augmentin 625 Duo Tablet") == [
+        ("Azithral 500 Tablet", 2), ("Crocin Advance Tablet", 1)]
+    assert projection.drugs_sharing_side_effects("Crocin Advance Tablet", top_k=1) == [("Augmentin 625 Duo Tablet", 1)]
+    assert projection.drugs_sharing_side_effects("Vitamin D3 Drops") == []
@@ -0,0 +1,28 @@
+# backend/app/tests/test_ingest_pipeline.py
+import pytest
+from app.services.ingest_pipeline import run_pipeline
+
+
+def test_pipeline_runs_stages_in_order():
+    chunks = [[i, i + 1] for i in range(0, 20, 2)]
+    written = []
+    progress = []
+
+    stats = run_pipeline(
+        iter(chunks),
+        [("double", lambda c: [x * 2 for x in c]), ("write", lambda c: written.extend(c) or c)],
+        queue_size=1,
+        progress=progress.append,
+    )
+
+    assert written == [x * 2 for x in range(20)]
+    assert stats["read"]["rows"] == stats["double"]["rows"] == stats["write"]["rows"] == 20
+    assert len(progress) == len(chunks)
+
+
+def test_pipeline_propagates_stage_errors():
+    def boom(chunk):
+        raise ValueError("bad chunk")
+
+    with pytest.raises(ValueError):
+        run_pipeline(iter([[1]] * 50), [("embed", boom), ("write", lambda c: c)], queue_size=1)
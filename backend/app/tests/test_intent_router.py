@@ -0,0 +1,50 @@
+# backend/app/tests/test_intent_router.py
+import pytest
+
+from app.core import metrics
+from app.services import graph_service, intent_router
+from app.services.graph_projection import GraphProjection
+
+
+@pytest.fixture
+def projection(monkeypatch):
+    projection = GraphProjection(
+        ["Augmentin 625 Duo Tablet", "Azithral 500 Tablet", "Crocin Advance Tablet", "Crocin Advance Syrup"],
+        [["Treatment of Bacterial infections"], ["Treatment of Bacterial infections"],
+         ["Pain relief Treatment of Fever"], ["Treatment of Fever"]],
+        [["Vomiting", "Nausea", "Diarrhea"], ["Nausea"], ["Nausea"], []],
+    )
+    monkeypatch.setattr(graph_service, "get_graph_projection", lambda: projection)
+    return projection
+
+
+def test_match_intent():
+    assert intent_router.match_intent("What are the side effects of Augmentin 625 Duo?") == \
+        ("side_effects", "augmentin 625 duo")
+    assert intent_router.match_intent("what is  azithral 500 used for") == ("uses", "azithral 500")
+    assert intent_router.match_intent("Which drugs are used for the fever?") == ("drugs_for", "fever")
+    assert intent_router.match_intent("Is it safe to take crocin with azithral?") is None
+
+
+def test_route_answers_from_the_graph(projection):
+    answer, sources = intent_router.route("Side effects of Augmentin 625 Duo Tablet?")
+    assert sources == ["Drug:Augmentin 625 Duo Tablet"]
+    assert "Vomiting, Nausea, Diarrhea" in answer and "[Drug:Augmentin 625 Duo Tablet]" in answer
+
+    answer, sources = intent_router.route("What is Crocin Advance Tablet used for?")
+    assert answer.endswith("Pain relief; Treatment of Fever.")
+
+    # the dosage form may be left out; drugs without side effects are not cited
+    assert intent_router.route("crocin advance side effects")[1] == ["Drug:Crocin Advance Tablet"]
+
+    answer, sources = intent_router.route("drugs for bacterial infection", top_k=1)
+    assert sources == ["Drug:Augmentin 625 Duo Tablet"] and answer.endswith("(and 1 more).")
+
+
+def test_route_falls_back_when_unsure(projection):
+    before = metrics.INTENT_ROUTES.value(intent="drugs_for", outcome="fallback")
+    assert intent_router.route("What can I take for fever that does not cause nausea?") is None
+    assert metrics.INTENT_ROUTES.value(intent="drugs_for", outcome="fallback") == before + 1
+    assert intent_router.route("side effects of crocin advance", top_k=1) is None  # two products match
+    assert intent_router.route("side effects of paracetamol") is None
+    assert intent_router.route("How should I store insulin?") is None
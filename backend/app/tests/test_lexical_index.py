@@ -0,0 +1,47 @@
+# backend/app/tests/test_lexical_index.py
+from app.services.lexical_index import LexicalIndex, reciprocal_rank_fusion
+
+
+def _index():
+    index = LexicalIndex()
+    index.upsert(
+        ["Augmentin 625 Duo Tablet", "Augmentin 375 Tablet", "Azithral 500 Tablet", "Crocin Advance Tablet"],
+        ["Treatment of Bacterial infections", "Treatment of Bacterial infections",
+         "Treatment of Bacterial infections", "Pain relief Treatment of Fever"],
+        ["Vomiting Nausea Diarrhea", "Vomiting Nausea Diarrhea", "Nausea Abdominal pain", "Nausea Allergic reaction"],
+    )
+    return index
+
+
+def test_exact_match_ignores_dosage_form_and_prefers_longest_name():
+    index = _index()
+    assert index.exact_matches("Augmentin 625 Duo side effects") == ["Augmentin 625 Duo Tablet"]
+    assert index.exact_matches("Is crocin advance safe with azithral 500?") == \
+        ["Crocin Advance Tablet", "Azithral 500 Tablet"]
+    assert index.exact_matches("what treats a fever?") == []
+
+
+def test_bm25_ranks_name_terms_and_expands_prefixes_and_typos():
+    index = _index()
+    assert index.search("fever pain", top_k=1)[0]["name"] == "Crocin Advance Tablet"
+    assert index.search("azithr", top_k=1)[0]["name"] == "Azithral 500 Tablet"
+    assert index.search("augmentn 625", top_k=1)[0]["name"] == "Augmentin 625 Duo Tablet"
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    vector = [{"name": "a", "description": "d"}, {"name": "b"}, {"name": "c"}]
+    lexical = [{"name": "b"}, {"name": "c"}]
+    fused = reciprocal_rank_fusion([vector, lexical], k=60, top_k=2)
+    assert [h["name"] for h in fused] == ["b", "c"]
+    assert reciprocal_rank_fusion([vector], top_k=1)[0]["description"] == "d"
+
+
+def test_remove_drops_terms_and_exact_names():
+    index = _index()
+    assert index.remove(["Azithral 500 Tablet", "unknown"]) == 1
+    assert len(index) == 3 and "Azithral 500 Tablet" not in index
+    assert index.exact_matches("azithral 500 dose") == []
+    assert "azithral" not in index._postings
+    index.upsert(["Azithral 500 Tablet"], ["Treatment of Typhoid"], [""])
+    assert index.exact_matches("azithral 500 dose") == ["Azithral 500 Tablet"]
+    assert index.search("typhoid", top_k=1)[0]["name"] == "Azithral 500 Tablet"
@@ -0,0 +1,36 @@
+# backend/app/tests/test_metrics.py
+from app.core import metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = metrics.Histogram("test_latency_seconds", "test", ("stage",), buckets=(0.1, 1.0))
+    hist.observe(0.05, stage="embed")
+    hist.observe(0.5, stage="embed")
+    hist.observe(5.0, stage="embed")
+    lines = hist.render()
+    assert 'medchat_test_latency_seconds_bucket{stage="embed",le="0.1"} 1' in lines
+    assert 'medchat_test_latency_seconds_bucket{stage="embed",le="1"} 2' in lines
+    assert 'medchat_test_latency_seconds_bucket{stage="embed",le="+Inf"} 3' in lines
+    assert 'medchat_test_latency_seconds_count{stage="embed"} 3' in lines
+
+
+def test_stage_counts_errors():
+    before = metrics.STAGE_ERRORS.value(stage="test-stage")
+    try:
+        with metrics.stage("test-stage"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert metrics.STAGE_ERRORS.value(stage="test-stage") == before + 1
+    assert metrics.STAGE_LATENCY.count(stage="test-stage") >= 1
+
+
+def test_round_trips_only_counted_inside_a_request():
+    metrics.record_round_trip()  # no request context: ignored
+    token = metrics._round_trips.set([0])
+    try:
+        metrics.record_round_trip()
+        metrics.record_round_trip()
+        assert metrics._round_trips.get() == [2]
+    finally:
+        metrics._round_trips.reset(token)
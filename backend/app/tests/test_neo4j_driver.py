@@ -0,0 +1,64 @@
+# backend/app/tests/test_neo4j_driver.py
+import pytest
+from neo4j.exceptions import ServiceUnavailable
+from app.db import neo4j_driver
+
+
+class _FlakySession:
+    """Like the real driver: connecting is deferred to execute_*, which retries internally."""
+
+    def __init__(self, driver_retries, gives_up):
+        self.driver_retries = driver_retries
+        self.gives_up = gives_up
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_read(self, work, *args, **kwargs):
+        if self.gives_up:
+            # no server reachable within NEO4J_MAX_TRANSACTION_RETRY_TIME: `work` never runs
+            raise ServiceUnavailable("Couldn't connect to 127.0.0.1:1")
+        # each earlier attempt failed after `work` ran and was retried by the driver
+        for _ in range(self.driver_retries + 1):
+            result = work(None, *args, **kwargs)
+        return result
+
+
+class _FakeDriver:
+    def __init__(self, driver_retries=0, gives_up=False):
+        self.driver_retries = driver_retries
+        self.gives_up = gives_up
+        self.access_modes = []
+
+    def session(self, default_access_mode=None, **kwargs):
+        self.access_modes.append(default_access_mode)
+        return _FlakySession(self.driver_retries, self.gives_up)
+
+
+def test_execute_read_counts_driver_retries(monkeypatch):
+    driver = _FakeDriver(driver_retries=2)
+    monkeypatch.setattr(neo4j_driver, "get_driver", lambda: driver)
+
+    before = neo4j_driver.pool_stats()
+    assert neo4j_driver.execute_read(lambda tx, x: x * 2, 21) == 42
+    assert driver.access_modes == [neo4j_driver.READ_ACCESS]
+
+    after = neo4j_driver.pool_stats()
+    assert after["retries"] - before["retries"] == 2
+    assert after["in_use"] == 0
+
+
+def test_driver_errors_are_not_retried_again(monkeypatch):
+    driver = _FakeDriver(gives_up=True)
+    monkeypatch.setattr(neo4j_driver, "get_driver", lambda: driver)
+
+    before = neo4j_driver.pool_stats()
+    with pytest.raises(ServiceUnavailable):
+        neo4j_driver.execute_read(lambda tx: None)
+    # one session: the wait is bounded by the driver's retry time alone
+    assert len(driver.access_modes) == 1
+    after = neo4j_driver.pool_stats()
+    assert after["failures"] - before["failures"] == 1 and after["in_use"] == 0
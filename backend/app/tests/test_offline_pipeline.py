@@ -0,0 +1,187 @@
+# backend/app/tests/test_offline_pipeline.py
+"""End-to-end ingest + /api/ask against the in-process Neo4j/Groq stand-ins from benchmarks/."""
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.core.config import settings  # noqa: E402
+from app.db import neo4j_driver  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import graph_service, index_snapshot, llm_service  # noqa: E402
+from app.utils import embeddings  # noqa: E402
+from benchmarks import fakes  # noqa: E402
+from benchmarks.synth_data import write_csv, generate_rows  # noqa: E402
+
+
+@pytest.fixture
+def offline_app(tmp_path, monkeypatch):
+    for module, attr in ((neo4j_driver, "_driver"), (neo4j_driver, "_async_driver"), (llm_service, "_llm_service"),
+                         (embeddings, "_model"), (graph_service, "_vector_index"), (graph_service, "_lexical_index")):
+        monkeypatch.setattr(module, attr, None)
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "hashing")
+    monkeypatch.setattr(settings, "ANSWER_CACHE_ENABLED", False)
+    graph = fakes.install(neo4j_latency=0.0, llm_latency=0.0)
+    csv_path = write_csv(str(tmp_path / "drugs.csv"), rows=200, seed=1)
+    return graph, csv_path
+
+
+def test_ingest_and_ask_offline(offline_app):
+    graph, csv_path = offline_app
+    assert graph_service.ingest_drug_file(csv_path) == 200
+    assert len(graph.drugs) == 200
+
+    name = next(generate_rows(1, seed=1))["Medicine Name"]
+    client = TestClient(app)
+    resp = client.post("/api/ask", json={"question": f"Side effects of {name}?", "top_k": 3})
+    assert resp.status_code == 200
+    assert resp.json()["sources"][0] == f"Drug:{name}"
+
+    resp = client.post("/api/ask", json={"question": "What helps with a migraine?", "top_k": 3})
+    assert resp.status_code == 200
+    assert len(resp.json()["sources"]) == 3
+
+
+def test_workers_share_index_snapshots(offline_app, tmp_path, monkeypatch):
+    graph, csv_path = offline_app
+    monkeypatch.setattr(settings, "INDEX_SNAPSHOT_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(graph_service, "_snapshot_generation", 0)
+    monkeypatch.setattr(graph_service, "_unpublished", [])
+
+    # one worker loads the (empty) snapshot before another ingests
+    graph_service.get_vector_index()
+    stale = (graph_service._vector_index, graph_service._lexical_index, graph_service._snapshot_generation)
+    assert stale[2] == 1 and len(stale[0]) == 0
+
+    assert graph_service.ingest_drug_file(csv_path) == 200
+    assert index_snapshot.current_generation() == 2
+    assert not graph_service._vector_index.matrix.flags.writeable
+
+    graph_service._vector_index, graph_service._lexical_index, graph_service._snapshot_generation = stale
+    assert graph_service.refresh_shared_indexes()
+    assert len(graph_service.get_vector_index()) == 200
+    assert len(graph_service.get_lexical_index()) == 200
+    assert not graph_service.refresh_shared_indexes()
+
+
+def test_delta_ingest_rewrites_only_changes(offline_app, tmp_path):
+    import csv
+
+    graph, csv_path = offline_app
+    graph_service.ingest_drug_file(csv_path)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    removed, changed = rows[:10], rows[10]
+    changed["Side_effects"] = "Hiccups"
+    added = dict(rows[11], **{"Medicine Name": "Brandnew 10 Tablet"})
+    delta_path = str(tmp_path / "delta.csv")
+    with open(delta_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows[10:] + [added])
+
+    report = graph_service.ingest_drug_file_delta(delta_path)
+    assert (report["added"], report["changed"], report["unchanged"], report["removed"]) == (1, 1, 189, 10)
+    assert report["rows_written"] == 2
+    assert all(r["Medicine Name"] not in graph.drugs for r in removed)
+    assert graph.side_effects[changed["Medicine Name"]] == ["Hiccups"]
+    used = {e for effects in graph.side_effects.values() for e in effects}
+    assert graph.nodes["SideEffect"] == used
+
+    report = graph_service.ingest_drug_file_delta(delta_path)
+    assert report["unchanged"] == 191 and report["rows_written"] == 0
+
+
+def test_delta_after_full_ingest_with_duplicate_names(offline_app, tmp_path):
+    import csv
+
+    graph, csv_path = offline_app
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    # the same drug listed again with different side effects
+    rows.append(dict(rows[5], Side_effects="Hiccups"))
+    dup_path = str(tmp_path / "duplicates.csv")
+    with open(dup_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    assert graph_service.ingest_drug_file(dup_path) == 201
+    report = graph_service.ingest_drug_file_delta(dup_path)
+    assert (report["added"], report["changed"], report["unchanged"], report["removed"]) == (0, 0, 200, 0)
+    assert report["rows_written"] == 0
+
+
+def test_parallel_ingest_matches_sequential(offline_app, tmp_path, monkeypatch):
+    graph, csv_path = offline_app
+    graph_service.ingest_drug_file(csv_path)
+    expected = {name: sorted(effects) for name, effects in graph.side_effects.items()}
+
+    parallel = fakes.install(neo4j_latency=0.0, llm_latency=0.0)
+    monkeypatch.setattr(graph_service, "_vector_index", None)
+    monkeypatch.setattr(settings, "INGEST_EMBED_PROCESSES", 2)
+    monkeypatch.setattr(settings, "INGEST_WRITE_PARTITIONS", 4)
+    monkeypatch.setattr(settings, "INGEST_BATCH_SIZE", 50)
+    assert graph_service.ingest_drug_file(csv_path) == 200
+    assert {name: sorted(effects) for name, effects in parallel.side_effects.items()} == expected
+    assert parallel.nodes == graph.nodes
+    assert len(graph_service.get_vector_index()) == 200
+
+
+def test_parallel_ingest_uses_embedding_cache(offline_app, monkeypatch):
+    from app.utils.embedding_cache import get_embedding_cache
+
+    graph, csv_path = offline_app
+    monkeypatch.setattr(settings, "INGEST_EMBED_PROCESSES", 2)
+    monkeypatch.setattr(settings, "INGEST_BATCH_SIZE", 50)
+    assert graph_service.ingest_drug_file(csv_path) == 200
+    first = {name: drug["embedding_blob"] for name, drug in graph.drugs.items()}
+    before = get_embedding_cache().stats()
+
+    # a re-ingest of the same file is served from the parent's cache
+    assert graph_service.ingest_drug_file(csv_path) == 200
+    after = get_embedding_cache().stats()
+    assert after["misses"] == before["misses"]
+    assert after["memory_hits"] + after["disk_hits"] - before["memory_hits"] - before["disk_hits"] == 200
+    assert {name: drug["embedding_blob"] for name, drug in graph.drugs.items()} == first
+
+
+@pytest.mark.parametrize("support", ["statement", "procedure", None])
+def test_neo4j_vector_backend(offline_app, monkeypatch, support):
+    graph, csv_path = offline_app
+    graph.vector_index_support = support
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_BACKEND", "neo4j")
+    monkeypatch.setattr(graph_service, "_neo4j_vector_ready", None)
+    graph_service.ingest_drug_file(csv_path)
+    assert graph_service._neo4j_vector_ready is (support is not None)
+
+    query = embeddings.embed_texts(["What helps with a migraine?"], as_array=True)[0]
+    context = {"max_side_effects": 3, "expand_neighbours": False, "max_related": 5}
+    hits = graph_service.semantic_search_by_embedding(query, top_k=5, context=context)
+    exact = graph_service.get_vector_index().search(query, top_k=5, exact=True)
+    assert [h["name"] for h in hits] == [h["name"] for h in exact]
+    if support is None:
+        assert "context" not in hits[0]
+    else:
+        assert graph.vector_indexes["drug_embedding"]["dimensions"] == settings.EMBEDDING_DIM
+        assert hits[0]["score"] == pytest.approx(exact[0]["score"], abs=1e-5)
+        assert hits[0]["context"]["side_effects"] == graph.side_effects[hits[0]["name"]][:3]
+
+
+def test_graph_projection_follows_ingests(offline_app, tmp_path, monkeypatch):
+    graph, csv_path = offline_app
+    monkeypatch.setattr(graph_service, "_graph_projection", None)
+    assert len(graph_service.get_graph_projection()) == 0
+
+    graph_service.ingest_drug_file(csv_path)
+    name = next(generate_rows(1, seed=1))["Medicine Name"]
+    assert graph_service.get_side_effects(name) == graph.side_effects[name]
+    condition = graph.treats[name][0]
+    assert name in graph_service.get_drugs_treating(condition)
+
+    delta_path = write_csv(str(tmp_path / "fewer.csv"), rows=50, seed=1)
+    graph_service.ingest_drug_file_delta(delta_path)
+    assert len(graph_service.get_graph_projection()) == len(graph.drugs) == 50
@@ -0,0 +1,134 @@
+# backend/app/tests/test_vector_index.py
+import numpy as np
+from app.services.vector_index import VectorIndex
+
+
+def _random_vectors(n, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, dim)).astype(np.float32)
+
+
+def test_exact_search_matches_bruteforce_cosine():
+    vecs = _random_vectors(200)
+    names = [f"drug-{i}" for i in range(len(vecs))]
+    index = VectorIndex(use_ivf=False)
+    index.upsert(names, vecs)
+
+    query = vecs[17] + 0.01
+    hits = index.search(query, top_k=3)
+    assert hits[0]["name"] == "drug-17"
+    normed = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+    expected = normed @ (query / np.linalg.norm(query))
+    assert abs(hits[0]["score"] - float(expected.max())) < 1e-5
+
+
+def test_ivf_search_and_incremental_upsert():
+    vecs = _random_vectors(600)
+    index = VectorIndex(nlist=8, nprobe=8, min_train_size=500)
+    index.upsert([f"drug-{i}" for i in range(len(vecs))], vecs)
+    assert index.is_trained
+
+    # probing every list must agree with the exact scan
+    query = vecs[42]
+    assert [h["name"] for h in index.search(query, top_k=5)] == \
+        [h["name"] for h in index.search(query, top_k=5, exact=True)]
+
+    index.upsert(["new-drug"], _random_vectors(1, seed=1), ["desc"])
+    assert len(index) == 601
+    hit = index.search(_random_vectors(1, seed=1)[0], top_k=1)[0]
+    assert hit["name"] == "new-drug" and hit["description"] == "desc"
+
+
+def test_search_batch_matches_single_queries():
+    vecs = _random_vectors(300)
+    index = VectorIndex(use_ivf=False)
+    index.upsert([f"drug-{i}" for i in range(len(vecs))], vecs)
+
+    queries = _random_vectors(10, seed=3)
+    batch = index.search_batch(queries, top_k=4, block_size=3)
+    assert [[h["name"] for h in hits] for hits in batch] == \
+        [[h["name"] for h in index.search(q, top_k=4, exact=True)] for q in queries]
+
+
+def test_packed_embeddings_roundtrip():
+    from app.services.graph_service import encode_embedding, decode_embeddings
+
+    vecs = _random_vectors(5, dim=16)
+    blobs = [encode_embedding(v) for v in vecs]
+    assert all(len(b) == 16 * 4 for b in blobs)
+    decoded = decode_embeddings(blobs, "float32")
+    assert decoded.flags["C_CONTIGUOUS"] and np.array_equal(decoded, vecs)
+
+    half = decode_embeddings([v.astype(np.float16).tobytes() for v in vecs], "float16")
+    assert half.dtype == np.float32 and np.allclose(half, vecs, atol=1e-2)
+
+
+def test_save_and_memory_mapped_load(tmp_path):
+    vecs = _random_vectors(300)
+    names = [f"drug{i}" for i in range(300)]
+    index = VectorIndex(min_train_size=100, nlist=8, nprobe=8)
+    index.upsert(names, vecs, names)
+    index.save(str(tmp_path))
+
+    loaded = VectorIndex.load(str(tmp_path))
+    assert not loaded.matrix.flags.writeable
+    assert loaded.is_trained
+    q = vecs[7]
+    assert [h["name"] for h in loaded.search(q, top_k=5)] == [h["name"] for h in index.search(q, top_k=5)]
+
+    # writes copy the mapped matrix instead of failing
+    loaded.upsert(["drug7", "new"], vecs[:2])
+    assert loaded.matrix.flags.writeable and len(loaded) == 301
+    assert loaded.search(vecs[0], top_k=1)[0]["name"] in ("drug0", "drug7")
+
+
+def test_remove_keeps_ivf_lists_consistent():
+    vecs = _random_vectors(600)
+    index = VectorIndex(nlist=8, nprobe=8, min_train_size=500)
+    index.upsert([f"drug-{i}" for i in range(len(vecs))], vecs)
+    assert index.remove(["drug-0", "drug-42", "drug-599", "missing"]) == 3
+    assert len(index) == 597 and "drug-42" not in index
+    assert sorted(row for lst in index._lists for row in lst) == list(range(597))
+
+    query = vecs[42]
+    hits = index.search(query, top_k=5)
+    assert "drug-42" not in [h["name"] for h in hits]
+    assert [h["name"] for h in hits] == [h["name"] for h in index.search(query, top_k=5, exact=True)]
+    assert index.search(vecs[598], top_k=1)[0]["name"] == "drug-598"
+
+
+def test_search_and_upsert_proceed_while_training(monkeypatch):
+    import threading
+    from app.services import vector_index
+
+    vecs = _random_vectors(600)
+    index = VectorIndex(nlist=8, nprobe=8, min_train_size=500)
+    index.upsert([f"drug-{i}" for i in range(len(vecs))], vecs)
+
+    started, release = threading.Event(), threading.Event()
+    normalize = vector_index._normalize_rows
+
+    def slow_normalize(mat):
+        started.set()
+        release.wait(5)
+        return normalize(mat)
+
+    monkeypatch.setattr(vector_index, "_normalize_rows", slow_normalize)
+    trainer = threading.Thread(target=index.train)
+    trainer.start()
+    assert started.wait(5)
+    monkeypatch.setattr(vector_index, "_normalize_rows", normalize)
+
+    # k-means is parked outside the lock: the old lists keep serving
+    done = []
+    worker = threading.Thread(target=lambda: done.append(index.search(vecs[42], top_k=1)))
+    worker.start()
+    worker.join(1)
+    assert done and done[0][0]["name"] == "drug-42"
+    index.upsert(["new-drug"], _random_vectors(1, seed=1))
+
+    release.set()
+    trainer.join(5)
+    # the row added mid-training is assigned to the new centroids
+    assert index.search(_random_vectors(1, seed=1)[0], top_k=1)[0]["name"] == "new-drug"
+    assert sum(len(lst) for lst in index._lists) == 601
@@ -0,0 +1,186 @@
+# backend/app/utils/embedding_backends.py
+import logging
+import re
+import zlib
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger("medical-chatbot.utils.embedding_backends")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class EmbeddingBackend:
+    """
+    Turns texts into float32 embedding matrices. Backends load their model
+    lazily on first use. `namespace` identifies the vector space (backend +
+    model) and is part of every embedding cache key.
+    """
+
+    name = "base"
+    # safe to load in a parent process that later forks workers
+    fork_safe = True
+
+    def __init__(self, model_name: str, batch_size: int = 32, threads: int = 0, max_seq_length: int = 0):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.threads = threads
+        self.max_seq_length = max_seq_length
+
+    @property
+    def namespace(self) -> str:
+        return f"{self.name}:{self.model_name}"
+
+    def load(self):
+        """Load the model now instead of on the first `encode` call."""
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Full-precision PyTorch SentenceTransformer (the original behaviour)."""
+
+    name = "torch"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._model = None
+
+    @property
+    def namespace(self) -> str:
+        # keep cache keys of the default backend equal to the bare model name
+        return self.model_name
+
+    def _create_model(self):
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(self.model_name, device="cpu")
+
+    def load(self):
+        if self._model is not None:
+            return self._model
+        try:
+            import torch
+        except Exception as e:
+            raise RuntimeError("Install sentence-transformers to use local embeddings: pip install sentence-transformers") from e
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        try:
+            model = self._create_model()
+        except ImportError as e:
+            raise RuntimeError(f"Embedding backend '{self.name}' is missing a dependency: {e}") from e
+        if self.max_seq_length:
+            model.max_seq_length = self.max_seq_length
+        logger.info("Loaded embedding backend %s (%s)", self.name, self.model_name)
+        self._model = model
+        return model
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        model = self.load()
+        embs = model.encode(texts, batch_size=self.batch_size, show_progress_bar=False, convert_to_numpy=True)
+        return np.asarray(embs, dtype=np.float32)
+
+
+class QuantizedTorchBackend(SentenceTransformerBackend):
+    """Same model with its Linear layers dynamically quantized to int8."""
+
+    name = "torch-int8"
+
+    @property
+    def namespace(self) -> str:
+        return f"{self.name}:{self.model_name}"
+
+    def _create_model(self):
+        import torch
+        model = super()._create_model()
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxBackend(SentenceTransformerBackend):
+    """
+    ONNX Runtime export of the same model (sentence-transformers >= 3.2 with
+    `optimum[onnxruntime]`). EMBEDDING_ONNX_FILE selects a pre-quantized file,
+    e.g. "onnx/model_qint8_avx512_vnni.onnx".
+    """
+
+    name = "onnx"
+    # ONNX Runtime sessions own thread pools that do not survive fork()
+    fork_safe = False
+
+    def __init__(self, *args, onnx_file: str = "", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.onnx_file = onnx_file
+
+    @property
+    def namespace(self) -> str:
+        return f"{self.name}:{self.model_name}:{self.onnx_file}"
+
+    def _create_model(self):
+        from sentence_transformers import SentenceTransformer
+        model_kwargs = {"file_name": self.onnx_file} if self.onnx_file else {}
+        if self.threads:
+            import onnxruntime
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = self.threads
+            model_kwargs["session_options"] = options
+        return SentenceTransformer(self.model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs or None)
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Deterministic, dependency-free embedder for tests and offline runs:
+    signed feature hashing of word unigrams and bigrams into `dim` buckets.
+    Captures lexical overlap only.
+    """
+
+    name = "hashing"
+
+    def __init__(self, *args, dim: int = 384, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dim = dim
+
+    @property
+    def namespace(self) -> str:
+        return f"{self.name}:{self.dim}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall(text.lower())
+            if self.max_seq_length:
+                tokens = tokens[: self.max_seq_length]
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feat in features:
+                h = zlib.crc32(feat.encode("utf-8"))
+                out[i, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+BACKENDS: Dict[str, Type[EmbeddingBackend]] = {
+    SentenceTransformerBackend.name: SentenceTransformerBackend,
+    QuantizedTorchBackend.name: QuantizedTorchBackend,
+    OnnxBackend.name: OnnxBackend,
+    HashingBackend.name: HashingBackend,
+}
+
+
+def create_backend(name: Optional[str] = None) -> EmbeddingBackend:
+    """Build the backend named `name` (default EMBEDDING_BACKEND) from settings."""
+    name = name or settings.EMBEDDING_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{name}', expected one of {sorted(BACKENDS)}")
+    kwargs = {
+        "batch_size": settings.EMBEDDING_BATCH_SIZE,
+        "threads": settings.EMBEDDING_THREADS,
+        "max_seq_length": settings.EMBEDDING_MAX_SEQ_LENGTH,
+    }
+    if name == OnnxBackend.name:
+        kwargs["onnx_file"] = settings.EMBEDDING_ONNX_FILE
+    if name == HashingBackend.name:
+        kwargs["dim"] = settings.EMBEDDING_DIM
+    return BACKENDS[name](settings.EMBEDDING_MODEL, **kwargs)
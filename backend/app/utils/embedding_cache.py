@@ -0,0 +1,135 @@
+# backend/app/utils/embedding_cache.py
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import connection
+
+logger = logging.getLogger("medical-chatbot.utils.embedding_cache")
+
+# SQLite's default limit on bound parameters per statement is 999
+_SQLITE_BATCH = 500
+
+
+def cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache: an in-memory LRU tier in front of the
+    `embedding_cache` table of the local metadata DB. Vectors are stored as
+    raw float32 bytes.
+    """
+
+    def __init__(self, max_items: int = 10000, persist: bool = True):
+        self.max_items = max_items
+        self.persist = persist
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        pending: List[str] = []
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                vec = self._memory.get(key)
+                if vec is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vec
+                    self.memory_hits += 1
+                elif key not in pending:
+                    pending.append(key)
+
+            if pending and self.persist:
+                for key, vec in self._load(pending).items():
+                    found[key] = vec
+                    self._remember(key, vec)
+                    self.disk_hits += 1
+            self.misses += sum(1 for k in pending if k not in found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        with self._lock:
+            for key, vec in items.items():
+                self._remember(key, np.asarray(vec, dtype=np.float32))
+            if self.persist:
+                with connection() as conn, conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embedding_cache (key, dim, vector) VALUES (?, ?, ?)",
+                        [(k, int(v.shape[0]), np.asarray(v, dtype=np.float32).tobytes()) for k, v in items.items()],
+                    )
+
+    def stats(self) -> Dict[str, int]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_items": len(self._memory),
+        }
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, key: str, vec: np.ndarray):
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        out = {}
+        with connection() as conn:
+            for start in range(0, len(keys), _SQLITE_BATCH):
+                batch = keys[start:start + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    out[key] = np.frombuffer(blob, dtype=np.float32)
+        return out
+
+
+# helper singleton
+_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache(
+            max_items=settings.EMBEDDING_CACHE_SIZE,
+            persist=settings.EMBEDDING_CACHE_PERSIST,
+        )
+    return _cache
+
+
+def _collect_metrics():
+    if _cache is None:
+        return
+    stats = _cache.stats()
+    yield "embedding_cache_lookups_total", "counter", "Embedding cache lookups by result.", [
+        ({"result": "memory_hit"}, stats["memory_hits"]),
+        ({"result": "disk_hit"}, stats["disk_hits"]),
+        ({"result": "miss"}, stats["misses"]),
+    ]
+
+
+metrics.register_collector(_collect_metrics)
@@ -0,0 +1,93 @@
+# backend/app/utils/embedding_pool.py
+"""
+Process pool that shards ingest encoding across CPU cores.
+
+Each worker process loads its own copy of the embedding backend once (in the
+pool initializer) and encodes whole chunks; intra-op threads are split
+between workers so N processes do not oversubscribe the machine. Processes
+are spawned, not forked, so no model or thread pool state is inherited.
+The embedding cache stays in the parent: each chunk is looked up there first,
+only the misses are sent to a worker, and their vectors are written back.
+"""
+import logging
+import multiprocessing as mp
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.utils.embedding_backends import EmbeddingBackend, create_backend
+from app.utils.embedding_cache import cache_key, get_embedding_cache
+
+logger = logging.getLogger("medical-chatbot.utils.embedding_pool")
+
+# backend of the current worker process
+_worker_backend: Optional[EmbeddingBackend] = None
+
+
+def _init_worker(backend: EmbeddingBackend, threads: int):
+    global _worker_backend
+    backend.threads = threads
+    backend.load()
+    _worker_backend = backend
+
+
+def _encode(texts: List[str]) -> np.ndarray:
+    return _worker_backend.encode(texts)
+
+
+def _stack(keys: List[str], vectors: Dict[str, np.ndarray]) -> np.ndarray:
+    if not keys:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.stack([vectors[k] for k in keys]).astype(np.float32, copy=False)
+
+
+class EmbeddingPool:
+    def __init__(self, processes: int, backend: Optional[EmbeddingBackend] = None):
+        self.processes = max(1, processes)
+        # an unloaded backend pickles as plain settings
+        backend = backend or create_backend()
+        self._namespace = backend.namespace
+        threads = settings.EMBEDDING_THREADS or max(1, (os.cpu_count() or 1) // self.processes)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(backend, threads),
+        )
+        logger.info("Started %d embedding processes (%d threads each)", self.processes, threads)
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        Encode `texts`; the future resolves to a float32 matrix in input order.
+        Cached vectors are used as they are and only the misses go to a worker.
+        """
+        cache = get_embedding_cache()
+        keys = [cache_key(self._namespace, t) for t in texts]
+        found = cache.get_many(keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        result: Future = Future()
+        if not missing:
+            result.set_result(_stack(keys, found))
+            return result
+
+        def merge(encoded: Future):
+            try:
+                computed = dict(zip(missing.keys(), encoded.result()))
+                cache.put_many(computed)
+                found.update(computed)
+                result.set_result(_stack(keys, found))
+            except BaseException as e:  # includes cancellation at shutdown
+                result.set_exception(e)
+
+        self._executor.submit(_encode, list(missing.values())).add_done_callback(merge)
+        return result
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,30 +1,112 @@
 # backend/app/utils/embeddings.py
+import asyncio
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Union
+
+import numpy as np
+
 from app.core.config import settings
+from app.utils.embedding_cache import get_embedding_cache, cache_key
+from app.utils.embedding_backends import EmbeddingBackend, create_backend
 
 logger = logging.getLogger("medical-chatbot.utils.embeddings")
 
-# Lazy import (heavy model)
-_model = None
+# Lazy import (heavy model); the backend is chosen by EMBEDDING_BACKEND
+_model: EmbeddingBackend = None
+# Dedicated pool for CPU-bound encoding on the async request path
+_executor: ThreadPoolExecutor = None
 
 
-def _init_model():
+def _init_model() -> EmbeddingBackend:
     global _model
     if _model is None:
-        try:
-            from sentence_transformers import SentenceTransformer
-        except Exception as e:
-            raise RuntimeError("Install sentence-transformers to use local embeddings: pip install sentence-transformers") from e
-        _model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        _model = create_backend()
     return _model
 
 
-def embed_texts(texts: List[str]) -> List[List[float]]:
+def embedding_namespace() -> str:
+    """Identifies the configured vector space (backend + model) without loading the model."""
+    return _init_model().namespace
+
+
+def prewarm_model():
+    """Load the embedding backend and run one encode so the first request is fast."""
+    model = _init_model()
+    model.load()
+    model.encode(["warmup"])
+
+
+def preload_model() -> bool:
+    """
+    Load the embedding weights without encoding anything, in a parent process
+    about to fork workers: the workers then share the weights copy-on-write.
+    Encoding is left to the workers so no thread pool is started before fork.
+    Returns False for backends that cannot be loaded before fork.
+    """
+    model = _init_model()
+    if not model.fork_safe:
+        return False
+    model.load()
+    return True
+
+
+def embed_texts(texts: List[str], as_array: bool = False,
+                dtype=np.float32) -> Union[List[List[float]], np.ndarray]:
     """
     Return embeddings for a list of texts.
+    Vectors are looked up in the embedding cache first; only the misses are
+    sent to the model, in one batch.
+    With `as_array=True` the result is one contiguous (len(texts), dim) numpy
+    array of `dtype` (float32, or float16 for compact storage) instead of
+    lists of Python floats.
     """
     model = _init_model()
-    logger.info("Computing embeddings for %d texts", len(texts))
-    embs = model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
-    return [list(map(float, e)) for e in embs]
+    cache = get_embedding_cache()
+    keys = [cache_key(model.namespace, t) for t in texts]
+    found = cache.get_many(keys)
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found:
+            missing.setdefault(key, text)
+    if missing:
+        logger.info("Computing embeddings for %d texts (%d cached)", len(missing), len(texts) - len(missing))
+        embs = model.encode(list(missing.values()))
+        computed = dict(zip(missing.keys(), embs))
+        cache.put_many(computed)
+        found.update(computed)
+
+    if as_array:
+        if not keys:
+            return np.zeros((0, 0), dtype=dtype)
+        return np.stack([found[k] for k in keys]).astype(dtype, copy=False)
+    return [list(map(float, found[k])) for k in keys]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.EMBEDDING_EXECUTOR_WORKERS),
+            thread_name_prefix="embed",
+        )
+    return _executor
+
+
+async def aembed_texts(texts: List[str], as_array: bool = False,
+                      dtype=np.float32) -> Union[List[List[float]], np.ndarray]:
+    """
+    Async variant of `embed_texts`: encoding runs on a dedicated executor so
+    it neither blocks the event loop nor holds a Starlette threadpool thread.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(embed_texts, texts, as_array=as_array, dtype=dtype))
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
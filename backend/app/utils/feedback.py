@@ -1,15 +1,219 @@
 # backend/app/utils/feedback.py
+import hashlib
 import logging
-from app.db.database import get_conn
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import connection
 
 logger = logging.getLogger("medical-chatbot.utils.feedback")
 
+_INSERT_FEEDBACK = "INSERT INTO feedback (question, answer, rating, comment, answer_id) VALUES (?, ?, ?, ?, ?)"
+_INSERT_DRUG = "INSERT INTO feedback_drug (feedback_id, drug) VALUES (?, ?)"
+
+_STOP = object()
+
+
+def answer_id(question: str, answer: str) -> str:
+    """Stable id of an answer, returned with every response and sent back with feedback."""
+    return hashlib.sha256(f"{question}\0{answer}".encode("utf-8")).hexdigest()[:16]
+
+
+def drugs_from_sources(sources: Iterable[str]) -> List[str]:
+    return [s.split(":", 1)[1] for s in sources if s.startswith("Drug:")]
+
+
+class FeedbackWriter:
+    """
+    Write-behind feedback queue. `submit` only enqueues; a background thread
+    drains the queue and writes up to `batch_size` rows per transaction, so
+    bursts of submissions cost one SQLite commit per batch instead of per row.
+    """
+
+    def __init__(self, queue_size: int = 100000, batch_size: int = 1000, flush_interval: float = 0.5):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+                    self._thread.start()
+
+    def submit(self, question: str, answer: str, rating: Optional[int] = None, comment: Optional[str] = None,
+               answer_id: Optional[str] = None, drugs: Iterable[str] = ()) -> bool:
+        """Queue one feedback row. Returns False (and drops it) when the queue is full."""
+        self._ensure_started()
+        row = (question, answer, rating, comment, answer_id, list(drugs))
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            metrics.FEEDBACK.inc(outcome="dropped")
+            return False
+        metrics.FEEDBACK.inc(outcome="queued")
+        return True
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is written. Returns False on timeout."""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Write what is queued and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            batch = []
+            stop = False
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: List[tuple]):
+        try:
+            with connection() as conn, conn:
+                drug_rows = []
+                for question, answer, rating, comment, aid, drugs in batch:
+                    cur = conn.execute(_INSERT_FEEDBACK, (question, answer, rating, comment, aid))
+                    drug_rows.extend((cur.lastrowid, drug) for drug in drugs)
+                if drug_rows:
+                    conn.executemany(_INSERT_DRUG, drug_rows)
+            self.written += len(batch)
+            metrics.FEEDBACK.inc(len(batch), outcome="written")
+            logger.debug("Wrote %d feedback rows", len(batch))
+        except Exception:
+            logger.exception("Failed to write %d feedback rows", len(batch))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self.pending, "written": self.written, "dropped": self.dropped}
 
-def record_feedback(question: str, answer: str, rating: int = None, comment: str = None):
-    conn = get_conn()
-    with conn:
-        conn.execute(
-            "INSERT INTO feedback (question, answer, rating, comment) VALUES (?, ?, ?, ?)",
-            (question, answer, rating, comment),
+
+def record_feedback(question: str, answer: str, rating: int = None, comment: str = None,
+                    answer_id: str = None, drugs: Iterable[str] = ()) -> bool:
+    """Queue feedback for the background writer; returns False if it was dropped."""
+    return get_feedback_writer().submit(question, answer, rating, comment, answer_id, drugs)
+
+
+def _rows(cursor) -> List[Dict[str, Any]]:
+    cols = [c[0] for c in cursor.description]
+    return [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+
+def query_feedback(answer_id: Optional[str] = None, drug: Optional[str] = None,
+                   limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    Written feedback, newest first, optionally filtered by answer id and/or
+    drug. Each row lists the drugs the answer cited.
+    """
+    clauses, params = [], []
+    if answer_id:
+        clauses.append("f.answer_id = ?")
+        params.append(answer_id)
+    if drug:
+        clauses.append("f.id IN (SELECT feedback_id FROM feedback_drug WHERE drug = ?)")
+        params.append(drug)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with connection() as conn:
+        rows = _rows(conn.execute(
+            f"""
+            SELECT f.id, f.answer_id, f.question, f.answer, f.rating, f.comment, f.created_at,
+                   (SELECT group_concat(drug, char(10)) FROM feedback_drug WHERE feedback_id = f.id) AS drugs
+            FROM feedback f {where}
+            ORDER BY f.id DESC LIMIT ?
+            """,
+            (*params, limit),
+        ))
+    for row in rows:
+        row["drugs"] = row["drugs"].split("\n") if row["drugs"] else []
+    return rows
+
+
+def feedback_summary_by_drug(limit: int = 100) -> List[Dict[str, Any]]:
+    """Feedback count and average rating per cited drug, most discussed first."""
+    with connection() as conn:
+        return _rows(conn.execute(
+            """
+            SELECT d.drug, count(*) AS feedback, avg(f.rating) AS avg_rating
+            FROM feedback_drug d JOIN feedback f ON f.id = d.feedback_id
+            GROUP BY d.drug ORDER BY feedback DESC LIMIT ?
+            """,
+            (limit,),
+        ))
+
+
+# helper singleton
+_writer: Optional[FeedbackWriter] = None
+
+
+def get_feedback_writer() -> FeedbackWriter:
+    global _writer
+    if _writer is None:
+        _writer = FeedbackWriter(
+            queue_size=settings.FEEDBACK_QUEUE_SIZE,
+            batch_size=settings.FEEDBACK_BATCH_SIZE,
+            flush_interval=settings.FEEDBACK_FLUSH_INTERVAL,
         )
-    logger.info("Recorded feedback for question: %s", question)
+    return _writer
+
+
+def shutdown_feedback_writer():
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+def _collect_metrics():
+    if _writer is None:
+        return
+    yield "feedback_queue_depth", "gauge", "Feedback rows waiting to be written.", [({}, _writer.pending)]
+
+
+metrics.register_collector(_collect_metrics)
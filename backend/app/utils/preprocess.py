@@ -1,23 +1,74 @@
 # backend/app/utils/preprocess.py
-import pandas as pd
 import logging
-from typing import Optional
+from typing import Optional, Iterator, List, Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger("medical-chatbot.utils.preprocess")
 
 
-def load_drug_dataframe(path: str) -> Optional[pd.DataFrame]:
+def load_drug_dataframe(path: str) -> Optional["pd.DataFrame"]:
     """
     Load Kaggle drug dataset (CSV/TSV).
     Returns a pandas DataFrame with normalized columns:
     - drugName, condition, review, sideEffects (if present)
     """
+    import pandas as pd  # heavy; only the ingest path needs it
+
     logger.info("Loading drug dataset from %s", path)
-    if path.endswith(".tsv") or path.endswith(".txt"):
-        df = pd.read_csv(path, sep="\t", dtype=str, on_bad_lines="skip")
-    else:
-        df = pd.read_csv(path, dtype=str, on_bad_lines="skip")
+    df = pd.read_csv(path, sep=_separator(path), dtype=str, on_bad_lines="skip")
+    df = _normalize(df)
+    logger.info("Loaded %d rows", len(df))
+    return df
+
+
+def iter_drug_dataframes(path: str, chunksize: int) -> Iterator["pd.DataFrame"]:
+    """
+    Stream the dataset in DataFrames of at most `chunksize` rows, normalized the
+    same way as `load_drug_dataframe`. Memory use is bounded by the chunk size.
+    """
+    import pandas as pd
+
+    logger.info("Streaming drug dataset from %s in chunks of %d rows", path, chunksize)
+    reader = pd.read_csv(path, sep=_separator(path), dtype=str, on_bad_lines="skip", chunksize=chunksize)
+    with reader:
+        for df in reader:
+            yield _normalize(df)
+
 
+def build_drug_records(df: "pd.DataFrame") -> Tuple[List[Dict[str, str]], List[str]]:
+    """
+    Turn Medicine_Details rows into (meta_rows, texts): per-row drug, condition,
+    side effects and review fields, plus the description text that is embedded.
+    """
+    texts = []
+    meta_rows = []
+
+    for _, row in df.iterrows():
+        drug = str(row.get("Medicine Name", "")).strip()
+        cond = str(row.get("Uses", "")).strip()
+        effects = str(row.get("Side_effects", "")).strip()
+        # For description, we can include reviews as well
+        review = str(row.get("Excellent Review %", "")) + "%" if "Excellent Review %" in row else ""
+        desc = " | ".join(filter(None, [drug, cond, review, effects]))
+
+        texts.append(desc)
+        meta_rows.append({
+            "drug": drug,
+            "condition": cond,
+            "effects": effects,
+            "review": review
+        })
+
+    return meta_rows, texts
+
+
+def _separator(path: str) -> str:
+    return "\t" if path.endswith(".tsv") or path.endswith(".txt") else ","
+
+
+def _normalize(df: "pd.DataFrame") -> "pd.DataFrame":
     # normalize column names
     df.columns = [c.strip() for c in df.columns]
     # common Kaggle dataset columns: drugName, condition, review, rating, usefulCount
@@ -35,6 +86,4 @@ def load_drug_dataframe(path: str) -> Optional[pd.DataFrame]:
         df["sideEffects"] = df[possible_effects_cols[0]]
     else:
         df["sideEffects"] = ""
-
-    logger.info("Loaded %d rows", len(df))
     return df
@@ -0,0 +1,135 @@
+# backend/benchmarks/bench_embeddings.py
+"""
+Compare embedding backends on the drug corpus: load time, encode throughput,
+peak memory and top-k retrieval agreement with a reference backend.
+
+Each backend runs in its own process so load time and peak RSS are measured
+in isolation. Usage (from backend/):
+
+    python -m benchmarks.bench_embeddings --csv app/data/Medicine_Details.csv \\
+        --backends torch torch-int8 onnx hashing --limit 5000
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils.embedding_backends import create_backend  # noqa: E402
+from app.utils.preprocess import iter_drug_dataframes, build_drug_records  # noqa: E402
+
+
+def load_corpus(path: str, limit: int):
+    texts, queries = [], []
+    for df in iter_drug_dataframes(path, chunksize=1000):
+        meta_rows, chunk_texts = build_drug_records(df)
+        texts.extend(chunk_texts)
+        queries.extend(f"What are the side effects of {m['drug']}?" for m in meta_rows)
+        if len(texts) >= limit:
+            break
+    return texts[:limit], queries[:limit]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _run_backend(name: str, texts, queries, out_dir: str, result_queue):
+    try:
+        rss_before = _peak_rss_mb()
+        backend = create_backend(name)
+        t0 = time.perf_counter()
+        backend.load()
+        backend.encode(texts[:8])  # warm-up
+        load_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        corpus = backend.encode(texts)
+        encode_s = time.perf_counter() - t0
+        query_embs = backend.encode(queries)
+
+        np.save(os.path.join(out_dir, f"{name}-corpus.npy"), corpus)
+        np.save(os.path.join(out_dir, f"{name}-queries.npy"), query_embs)
+        result_queue.put({
+            "backend": name,
+            "load_s": round(load_s, 2),
+            "texts_per_s": round(len(texts) / encode_s, 1) if encode_s else 0.0,
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "rss_growth_mb": round(_peak_rss_mb() - rss_before, 1),
+        })
+    except Exception as e:
+        result_queue.put({"backend": name, "error": str(e)})
+
+
+def _top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    corpus = corpus / np.maximum(np.linalg.norm(corpus, axis=1, keepdims=True), 1e-12)
+    queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    scores = queries @ corpus.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def agreement(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean overlap (0..1) of the top-k id sets per query."""
+    k = reference.shape[1]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(reference.tolist(), candidate.tolist())]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", required=True, help="Medicine_Details-shaped CSV")
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx", "hashing"])
+    parser.add_argument("--reference", default=None, help="backend used as ground truth (default: first)")
+    parser.add_argument("--limit", type=int, default=5000, help="corpus rows to embed")
+    parser.add_argument("--queries", type=int, default=200, help="queries used for top-k agreement")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    texts, queries = load_corpus(args.csv, args.limit)
+    queries = queries[: args.queries]
+    reference = args.reference or args.backends[0]
+    ctx = mp.get_context("spawn")
+
+    results = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name in args.backends:
+            result_queue = ctx.Queue()
+            proc = ctx.Process(target=_run_backend, args=(name, texts, queries, out_dir, result_queue))
+            proc.start()
+            results.append(result_queue.get())
+            proc.join()
+
+        ok = {r["backend"] for r in results if "error" not in r}
+        if reference in ok:
+            ref_top = _top_k(np.load(os.path.join(out_dir, f"{reference}-corpus.npy")),
+                             np.load(os.path.join(out_dir, f"{reference}-queries.npy")), args.top_k)
+            for r in results:
+                if r["backend"] in ok:
+                    top = _top_k(np.load(os.path.join(out_dir, f"{r['backend']}-corpus.npy")),
+                                 np.load(os.path.join(out_dir, f"{r['backend']}-queries.npy")), args.top_k)
+                    r[f"top{args.top_k}_agreement"] = round(agreement(ref_top, top), 3)
+
+    print(f"{len(texts)} texts, {len(queries)} queries, reference={reference}")
+    for r in results:
+        if "error" in r:
+            print(f"  {r['backend']:<12} ERROR {r['error']}")
+        else:
+            print(
+                f"  {r['backend']:<12} load {r['load_s']:>6}s  {r['texts_per_s']:>8} texts/s  "
+                f"peak {r['peak_rss_mb']:>7} MB  top{args.top_k} agreement {r.get(f'top{args.top_k}_agreement', '-')}"
+            )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# backend/benchmarks/bench_vector_search.py
+"""
+Compare the two vector search backends against a running Neo4j 5.11+:
+
+    memory  in-process VectorIndex scan, then one graph-context query
+    neo4j   db.index.vector.queryNodes + graph context in one statement
+
+Reports per-query latency (p50/p95), recall@k of each against an exact scan,
+in-process index build time and the embedding matrix size. Synthetic drugs
+are ingested into the configured database first (skip with --rows 0), so use
+a throwaway instance, e.g.
+
+    docker run --rm -p 7687:7687 -e NEO4J_AUTH=neo4j/benchmark neo4j:5
+    python -m benchmarks.bench_vector_search --uri bolt://localhost:7687 --password benchmark --rows 10000
+
+--offline runs the same code against benchmarks/fakes.py (brute-force
+stand-in for the Neo4j index), which only checks the wiring.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def _configure_env(args, work_dir: str):
+    # must happen before app.core.config is imported
+    os.environ.update({
+        "EMBEDDING_BACKEND": args.embedding_backend,
+        "EMBEDDING_CACHE_PERSIST": "false",
+        "SQLITE_PATH": os.path.join(work_dir, "metadata.db"),
+        "VECTOR_SEARCH_BACKEND": "neo4j",
+        "PREWARM_ON_STARTUP": "false",
+    })
+    for name, value in (("NEO4J_URI", args.uri), ("NEO4J_USER", args.user), ("NEO4J_PASSWORD", args.password)):
+        if value:
+            os.environ[name] = value
+
+
+def _questions(csv_path: str, n: int, seed: int):
+    import csv
+    import random
+
+    rng = random.Random(seed)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    questions = []
+    for _ in range(n):
+        row = rng.choice(rows)
+        condition = row["Uses"].split("Treatment of ")[-1].strip().lower()
+        questions.append(f"What can I take for {condition} without {row['Side_effects'].split(' ')[0].lower()}?")
+    return questions
+
+
+def _stats(latencies, recalls):
+    ms = np.asarray(latencies) * 1000.0
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "recall_at_k": round(float(np.mean(recalls)), 4),
+    }
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as work_dir:
+        _configure_env(args, work_dir)
+        from benchmarks.synth_data import dataset_path
+        from app.db.neo4j_driver import execute_write
+        from app.services import graph_service
+        from app.utils.embeddings import embed_texts
+
+        logging.getLogger().setLevel(args.log_level)
+        if args.offline:
+            from benchmarks import fakes
+            fakes.install(args.neo4j_latency, 0.0)
+
+        # with --rows 0 the dataset only supplies question wording
+        csv_path = dataset_path(args.data_dir, args.rows or 1000, args.seed)
+        result = {}
+        if args.rows:
+            t0 = time.perf_counter()
+            result["ingested_rows"] = graph_service.ingest_drug_file(csv_path)
+            result["ingest_s"] = round(time.perf_counter() - t0, 3)
+
+        query_embeddings = embed_texts(_questions(csv_path, args.queries, args.seed), as_array=True)
+        if not graph_service.use_neo4j_vector_index(query_embeddings.shape[1]):
+            raise SystemExit("Neo4j vector index unavailable (needs Neo4j 5.11+); see the log above")
+        if not args.offline:
+            execute_write(graph_service._run_tx, "CALL db.awaitIndexes($timeout)", timeout=args.index_timeout)
+
+        t0 = time.perf_counter()
+        index = graph_service.get_vector_index()
+        result["memory_index_build_s"] = round(time.perf_counter() - t0, 3)
+        result["memory_matrix_mb"] = round(index.matrix.nbytes / 2 ** 20, 1)
+        result["drugs"] = len(index)
+
+        context = {"max_side_effects": 10, "expand_neighbours": args.expand_neighbours, "max_related": 5}
+
+        def memory(q):
+            hits = index.search(q, top_k=args.top_k)
+            graph_service.get_drug_context([h["name"] for h in hits], **context)
+            return hits
+
+        def neo4j(q):
+            return graph_service.neo4j_vector_search(q, top_k=args.top_k, context=context)
+
+        exact = [{h["name"] for h in index.search(q, top_k=args.top_k, exact=True)} for q in query_embeddings]
+        for label, search in (("memory", memory), ("neo4j", neo4j)):
+            for q in query_embeddings[:args.warmup]:
+                search(q)
+            latencies, recalls = [], []
+            for q, truth in zip(query_embeddings, exact):
+                t0 = time.perf_counter()
+                hits = search(q)
+                latencies.append(time.perf_counter() - t0)
+                recalls.append(len({h["name"] for h in hits} & truth) / max(1, len(truth)))
+            for key, value in _stats(latencies, recalls).items():
+                result[f"{label}_{key}"] = value
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", help="NEO4J_URI (default: from the environment / .env)")
+    parser.add_argument("--user")
+    parser.add_argument("--password")
+    parser.add_argument("--rows", type=int, default=10000, help="synthetic drugs to ingest first; 0 = use existing data")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--expand-neighbours", action="store_true")
+    parser.add_argument("--embedding-backend", default="hashing", help="EMBEDDING_BACKEND for the run")
+    parser.add_argument("--index-timeout", type=int, default=600, help="seconds to wait for the index to come online")
+    parser.add_argument("--offline", action="store_true", help="run against the in-process fakes instead of Neo4j")
+    parser.add_argument("--neo4j-latency", type=float, default=0.001, help="seconds per fake Neo4j query (--offline)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "medchat-bench"))
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    for metric, value in result.items():
+        print(f"  {metric:<28} {value}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": {k: v for k, v in vars(args).items() if k != "password"}, "results": result}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
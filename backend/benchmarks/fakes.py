@@ -0,0 +1,448 @@
+# backend/benchmarks/fakes.py
+"""
+In-process stand-ins for Neo4j and Groq so benchmarks run without network.
+
+FakeGraph keeps Drug/Condition/SideEffect data in dicts and answers the
+Cypher statements issued by app.services.graph_service (matched by their
+distinctive fragments). FakeDriver / FakeAsyncDriver expose the slice of the
+neo4j driver API that app.db.neo4j_driver uses, with an optional per-query
+latency that models the network round-trip. FakeGroq mimics the chat
+completions API of the groq client, with configurable latency.
+"""
+import asyncio
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import numpy as np
+from neo4j.exceptions import ClientError
+
+
+class FakeGraph:
+    """
+    `vector_index_support` models the server version: "statement" (CREATE
+    VECTOR INDEX, 5.13+), "procedure" (db.index.vector.createNodeIndex only,
+    5.11) or None (no vector indexes).
+    """
+
+    def __init__(self, vector_index_support: str = "statement"):
+        self.drugs: Dict[str, Dict[str, Any]] = {}
+        self.treats: Dict[str, List[str]] = {}
+        self.side_effects: Dict[str, List[str]] = {}
+        # Condition / SideEffect nodes, which outlive their edges until orphan cleanup
+        self.nodes: Dict[str, set] = {"Condition": set(), "SideEffect": set()}
+        self.vector_index_support = vector_index_support
+        self.vector_indexes: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.queries = 0
+
+    # ---- writes -----------------------------------------------------------
+
+    def _upsert_drugs(self, rows, embedding_dtype="float32", ingest_run=None, **_):
+        for row in rows:
+            drug = self.drugs.setdefault(row["name"], {"name": row["name"], "description": None})
+            if drug["description"] is None:
+                drug["description"] = row["description"]
+            drug["embedding_blob"] = row["embedding_blob"]
+            drug["embedding_dtype"] = embedding_dtype
+            drug["embedding"] = row["embedding"]
+            if drug.get("ingest_run") == ingest_run:
+                drug["row_hashes"] = (drug.get("row_hashes") or [drug.get("content_hash")]) + [row.get("content_hash")]
+            else:
+                drug["row_hashes"] = None
+            drug["content_hash"] = row.get("content_hash")
+            drug["ingest_run"] = ingest_run
+        return []
+
+    def _set_content_hashes(self, rows, **_):
+        for row in rows:
+            drug = self.drugs.get(row["name"])
+            if drug is not None:
+                drug["content_hash"] = row["content_hash"]
+                drug["row_hashes"] = None
+        return []
+
+    @staticmethod
+    def _merge(edges: Dict[str, List[str]], drug: str, target: str):
+        targets = edges.setdefault(drug, [])
+        if target not in targets:
+            targets.append(target)
+
+    def _upsert_conditions(self, rows, **_):
+        for row in rows:
+            if row["drug"] in self.drugs:
+                self._merge(self.treats, row["drug"], row["condition"])
+                self.nodes["Condition"].add(row["condition"])
+        return []
+
+    def _upsert_side_effects(self, rows, **_):
+        for row in rows:
+            if row["drug"] in self.drugs:
+                self._merge(self.side_effects, row["drug"], row["effect"])
+                self.nodes["SideEffect"].add(row["effect"])
+        return []
+
+    def _merge_nodes(self, conditions, effects, **_):
+        self.nodes["Condition"].update(conditions)
+        self.nodes["SideEffect"].update(effects)
+        return []
+
+    def _clear_drugs(self, names, **_):
+        for name in names:
+            if name in self.drugs:
+                self.drugs[name]["description"] = None
+                self.treats.pop(name, None)
+                self.side_effects.pop(name, None)
+        return []
+
+    def _delete_drugs(self, names, **_):
+        for name in names:
+            self.drugs.pop(name, None)
+            self.treats.pop(name, None)
+            self.side_effects.pop(name, None)
+        return []
+
+    def _delete_orphans(self, label, limit, **_):
+        edges = self.treats if label == "Condition" else self.side_effects
+        used = {target for targets in edges.values() for target in targets}
+        orphans = sorted(self.nodes[label] - used)[:limit]
+        self.nodes[label].difference_update(orphans)
+        return [{"deleted": len(orphans)}]
+
+    # ---- reads ------------------------------------------------------------
+
+    def _context_record(self, name, max_side_effects, max_related, related):
+        conditions = list(self.treats.get(name, []))
+        record = {
+            "name": name,
+            "description": self.drugs[name]["description"],
+            "conditions": conditions,
+            "side_effects": self.side_effects.get(name, [])[:max_side_effects],
+        }
+        if related:
+            others = []
+            for other, other_conditions in self.treats.items():
+                if other != name and set(other_conditions) & set(conditions):
+                    others.append(other)
+                    if len(others) >= max_related:
+                        break
+            record["related"] = others
+        return record
+
+    def _drug_context(self, names, max_side_effects=10, max_related=5, related=False, **_):
+        return [self._context_record(name, max_side_effects, max_related, related)
+                for name in names if name in self.drugs]
+
+    # ---- vector index -----------------------------------------------------
+
+    def _show_index(self, index_name, **_):
+        index = self.vector_indexes.get(index_name)
+        if index is None:
+            return []
+        config = {"vector.dimensions": index["dimensions"], "vector.similarity_function": index["similarity"]}
+        return [{"type": "VECTOR", "options": {"indexConfig": config}}]
+
+    def _create_vector_index(self, query, params):
+        if "CREATE VECTOR INDEX" in query:
+            if self.vector_index_support != "statement":
+                raise ClientError("Invalid input 'VECTOR'")
+            name = re.search(r"CREATE VECTOR INDEX `([^`]+)`", query).group(1)
+            dimensions = int(re.search(r"`vector.dimensions`: (\d+)", query).group(1))
+            similarity = re.search(r"`vector.similarity_function`: '(\w+)'", query).group(1)
+        else:
+            if self.vector_index_support is None:
+                raise ClientError("There is no procedure with the name `db.index.vector.createNodeIndex`")
+            name, dimensions, similarity = params["index_name"], params["dimensions"], params["similarity"]
+        self.vector_indexes.setdefault(name, {"dimensions": dimensions, "similarity": similarity})
+        return []
+
+    def _missing_embedding_lists(self, limit, **_):
+        missing = [d for d in self.drugs.values() if d.get("embedding") is None and d.get("embedding_blob") is not None]
+        return [{"name": d["name"], "blob": d["embedding_blob"], "dtype": d["embedding_dtype"]} for d in missing[:limit]]
+
+    def _set_embedding_lists(self, rows, **_):
+        for row in rows:
+            if row["name"] in self.drugs:
+                self.drugs[row["name"]]["embedding"] = row["embedding"]
+        return []
+
+    def _vector_query(self, index_name, top_k, embedding, max_side_effects=10, max_related=5, related=False, **_):
+        if self.vector_index_support is None or index_name not in self.vector_indexes:
+            raise ClientError("There is no procedure with the name `db.index.vector.queryNodes`")
+        names = [name for name, d in self.drugs.items() if d.get("embedding") is not None]
+        if not names:
+            return []
+        matrix = np.asarray([self.drugs[name]["embedding"] for name in names], dtype=np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        q = np.asarray(embedding, dtype=np.float32)
+        cosine = matrix @ (q / max(float(np.linalg.norm(q)), 1e-12))
+        out = []
+        for i in np.argsort(-cosine)[:top_k]:
+            record = self._context_record(names[i], max_side_effects, max_related, related)
+            record["score"] = (1.0 + float(cosine[i])) / 2.0  # Neo4j's cosine score
+            out.append(record)
+        return out
+
+    def _all_embeddings(self, **_):
+        return [
+            {
+                "name": d["name"], "blob": d.get("embedding_blob"), "dtype": d.get("embedding_dtype"),
+                "embedding": d.get("embedding"), "description": d["description"],
+            }
+            for d in self.drugs.values()
+            if d.get("embedding_blob") is not None or d.get("embedding") is not None
+        ]
+
+    def _row_hashes(self, **_):
+        return [{"name": name, "row_hashes": d["row_hashes"]} for name, d in self.drugs.items() if d.get("row_hashes")]
+
+    def _content_hashes(self, **_):
+        return [{"name": name, "content_hash": d.get("content_hash")} for name, d in self.drugs.items()]
+
+    def _all_terms(self, **_):
+        return [
+            {"name": name, "conditions": self.treats.get(name, []), "side_effects": self.side_effects.get(name, [])}
+            for name in self.drugs
+        ]
+
+    def run(self, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        with self.lock:
+            self.queries += 1
+            if "CREATE CONSTRAINT" in query:
+                return []
+            if "SHOW INDEXES" in query:
+                return self._show_index(**params)
+            if "CREATE VECTOR INDEX" in query or "db.index.vector.createNodeIndex" in query:
+                return self._create_vector_index(query, params)
+            if "db.index.vector.queryNodes" in query:
+                return self._vector_query(related="AS related" in query, **params)
+            if "WHERE d.embedding IS NULL" in query:
+                return self._missing_embedding_lists(**params)
+            if "SET d.embedding = row.embedding" in query:
+                return self._set_embedding_lists(**params)
+            if "MERGE (d:Drug {name: row.name})" in query:
+                return self._upsert_drugs(**params)
+            if "REMOVE d.row_hashes" in query:
+                return self._set_content_hashes(**params)
+            if "WHERE d.row_hashes IS NOT NULL" in query:
+                return self._row_hashes(**params)
+            if "MERGE (c:Condition {name: row.condition})" in query:
+                return self._upsert_conditions(**params)
+            if "MERGE (s:SideEffect {name: row.effect})" in query:
+                return self._upsert_side_effects(**params)
+            if "MERGE (:Condition {name: name})" in query:
+                return self._merge_nodes(**params)
+            if "MATCH (c:Condition {name: row.condition})" in query:
+                return self._upsert_conditions(**params)
+            if "MATCH (s:SideEffect {name: row.effect})" in query:
+                return self._upsert_side_effects(**params)
+            if "SET d.description = null" in query:
+                return self._clear_drugs(**params)
+            if "DETACH DELETE d" in query:
+                return self._delete_drugs(**params)
+            if "WHERE NOT (n)--()" in query:
+                label = "Condition" if "(n:Condition)" in query else "SideEffect"
+                return self._delete_orphans(label, **params)
+            if "d.content_hash AS content_hash" in query:
+                return self._content_hashes(**params)
+            if "UNWIND range(0, size($names) - 1)" in query:
+                return self._drug_context(related="AS related" in query, **params)
+            if "d.embedding_blob as blob" in query:
+                return self._all_embeddings(**params)
+            if "collect(s.name) AS side_effects" in query:
+                return self._all_terms(**params)
+        raise NotImplementedError(f"FakeGraph does not understand query:\n{query}")
+
+
+class _Result(list):
+    def consume(self):
+        return None
+
+
+class _Tx:
+    def __init__(self, graph: FakeGraph, latency: float):
+        self.graph = graph
+        self.latency = latency
+
+    def run(self, query: str, **params):
+        if self.latency:
+            time.sleep(self.latency)
+        return _Result(self.graph.run(query, params))
+
+
+class _Session:
+    def __init__(self, graph: FakeGraph, latency: float):
+        self._tx = _Tx(graph, latency)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_read(self, work, *args, **kwargs):
+        return work(self._tx, *args, **kwargs)
+
+    execute_write = execute_read
+
+
+class FakeDriver:
+    def __init__(self, graph: FakeGraph, latency: float = 0.0):
+        self.graph = graph
+        self.latency = latency
+
+    def session(self, **kwargs):
+        return _Session(self.graph, self.latency)
+
+    def verify_connectivity(self):
+        return None
+
+    def close(self):
+        return None
+
+
+class _AsyncResult:
+    def __init__(self, records):
+        self._records = records
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for r in self._records:
+            yield r
+
+    async def consume(self):
+        return None
+
+
+class _AsyncTx:
+    def __init__(self, graph: FakeGraph, latency: float):
+        self.graph = graph
+        self.latency = latency
+
+    async def run(self, query: str, **params):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return _AsyncResult(self.graph.run(query, params))
+
+
+class _AsyncSession:
+    def __init__(self, graph: FakeGraph, latency: float):
+        self._tx = _AsyncTx(graph, latency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, work, *args, **kwargs):
+        return await work(self._tx, *args, **kwargs)
+
+    execute_write = execute_read
+
+
+class FakeAsyncDriver(FakeDriver):
+    def session(self, **kwargs):
+        return _AsyncSession(self.graph, self.latency)
+
+    async def close(self):
+        return None
+
+
+# ---- Groq ----------------------------------------------------------------
+
+def _usage(messages, text: str):
+    prompt = sum(len(m["content"].split()) for m in messages)
+    return SimpleNamespace(prompt_tokens=prompt, completion_tokens=len(text.split()))
+
+
+def _answer(messages) -> str:
+    return "Based on the provided context: " + messages[-1]["content"].splitlines()[0][:200]
+
+
+class _Completions:
+    def __init__(self, latency: float, token_latency: float, is_async: bool):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.is_async = is_async
+
+    def _response(self, messages):
+        text = _answer(messages)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=_usage(messages, text),
+        )
+
+    def _chunks(self, messages):
+        text = _answer(messages)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            delta = word if i == 0 else " " + word
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))], usage=None)
+        yield SimpleNamespace(choices=[], usage=_usage(messages, text))
+
+    def create(self, messages, model=None, temperature=0.0, stream=False):
+        if self.is_async:
+            return self._acreate(messages, stream)
+        time.sleep(self.latency)
+        if not stream:
+            return self._response(messages)
+
+        def gen():
+            for chunk in self._chunks(messages):
+                time.sleep(self.token_latency)
+                yield chunk
+        return gen()
+
+    async def _acreate(self, messages, stream):
+        await asyncio.sleep(self.latency)
+        if not stream:
+            return self._response(messages)
+
+        async def gen():
+            for chunk in self._chunks(messages):
+                await asyncio.sleep(self.token_latency)
+                yield chunk
+        return gen()
+
+
+class FakeGroq:
+    """Stand-in for groq.Groq / groq.AsyncGroq: `latency` until the first token, then `token_latency` per token."""
+
+    def __init__(self, latency: float = 0.3, token_latency: float = 0.0, is_async: bool = False):
+        self.chat = SimpleNamespace(completions=_Completions(latency, token_latency, is_async))
+
+
+# ---- wiring ----------------------------------------------------------------
+
+def install(neo4j_latency: float = 0.0, llm_latency: float = 0.3, token_latency: float = 0.0,
+            vector_index_support: str = "statement") -> FakeGraph:
+    """
+    Point the application at the fakes: the neo4j_driver module singletons and
+    the LLM service singleton are replaced. Returns the backing FakeGraph.
+    """
+    from app.db import neo4j_driver
+    from app.services import llm_service
+
+    graph = FakeGraph(vector_index_support)
+    neo4j_driver._driver = FakeDriver(graph, neo4j_latency)
+    neo4j_driver._async_driver = FakeAsyncDriver(graph, neo4j_latency)
+
+    service = llm_service.LLMService.__new__(llm_service.LLMService)
+    service.client = FakeGroq(llm_latency, token_latency)
+    service.async_client = FakeGroq(llm_latency, token_latency, is_async=True)
+    llm_service._llm_service = service
+    return graph
+
+
+def reset_indexes():
+    """Drop the in-process indexes and graph projection so the next query rebuilds them from the graph."""
+    from app.services import graph_service
+    graph_service._vector_index = None
+    graph_service._lexical_index = None
+    graph_service._neo4j_vector_ready = None
+    graph_service._graph_projection = None
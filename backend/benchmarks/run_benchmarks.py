@@ -0,0 +1,266 @@
+# backend/benchmarks/run_benchmarks.py
+"""
+Offline end-to-end benchmarks: ingest throughput, /api/ask latency under
+concurrency and peak memory, with Neo4j and Groq replaced by in-process fakes
+(benchmarks/fakes.py) and synthetic Medicine_Details-shaped data
+(benchmarks/synth_data.py). No network is needed.
+
+Each dataset size runs in its own process so peak RSS is per size. Results
+are compared against a stored baseline and regressions beyond --tolerance
+are flagged. Usage (from backend/):
+
+    python -m benchmarks.run_benchmarks --rows 1000 10000
+    python -m benchmarks.run_benchmarks --rows 1000 10000 --save-baseline
+    python -m benchmarks.run_benchmarks --rows 100000 --requests 500 --concurrency 32 --fail-on-regression
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing as mp
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _configure_env(args, work_dir: str):
+    # must happen before app.core.config is imported
+    os.environ.update({
+        "EMBEDDING_BACKEND": args.embedding_backend,
+        "EMBEDDING_CACHE_PERSIST": "false",
+        "SQLITE_PATH": os.path.join(work_dir, "metadata.db"),
+        "GROQ_API_KEY": "offline-benchmark",
+        "PREWARM_ON_STARTUP": "false",
+        "ANSWER_CACHE_ENABLED": "false",  # every request runs the full pipeline
+        "INGEST_BATCH_SIZE": str(args.ingest_batch_size),
+        "INGEST_EMBED_PROCESSES": str(args.embed_processes),
+        "INGEST_WRITE_PARTITIONS": str(args.write_partitions),
+    })
+
+
+def _questions(csv_path: str, n: int, seed: int):
+    import csv
+    import random
+    from app.services.lexical_index import name_key
+
+    rng = random.Random(seed)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    exact, free = [], []
+    for _ in range(n):
+        row = rng.choice(rows)
+        exact.append(f"What are the side effects of {' '.join(name_key(row['Medicine Name']))}?")
+        condition = row["Uses"].split("Treatment of ")[-1].strip()
+        effect = row["Side_effects"].split(" ")[0].lower()
+        free.append(f"What can I take for {condition.lower()} that does not cause {effect}?")
+    return exact, free
+
+
+async def _load(app, path: str, questions, concurrency: int):
+    import httpx
+
+    latencies, errors = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        async def one(question):
+            nonlocal errors
+            async with semaphore:
+                t0 = time.perf_counter()
+                resp = await client.post(path, json={"question": question, "top_k": 5})
+                latencies.append(time.perf_counter() - t0)
+                if resp.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(q) for q in questions))
+        elapsed = time.perf_counter() - started
+    ms = np.asarray(latencies) * 1000.0
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "requests_per_sec": round(len(questions) / elapsed, 1),
+        "errors": errors,
+    }
+
+
+def _run_size(args, rows: int, result_queue):
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            _configure_env(args, work_dir)
+            from benchmarks import fakes
+            from benchmarks.synth_data import dataset_path
+            from app.main import app
+            from app.core import metrics
+            from app.services import graph_service, intent_router
+
+            # per-request INFO logs would dominate the measurements
+            logging.getLogger().setLevel(args.log_level)
+
+            csv_path = dataset_path(args.data_dir, rows, args.seed)
+            graph = fakes.install(args.neo4j_latency, args.llm_latency)
+            result = {"rows": rows}
+
+            stages = {}
+            t0 = time.perf_counter()
+            count = graph_service.ingest_drug_file(csv_path, progress=stages.update)
+            elapsed = time.perf_counter() - t0
+            result["ingest_rows_per_sec"] = round(count / elapsed, 1)
+            for stage, s in stages.items():
+                result[f"ingest_{stage}_rows_per_sec"] = s["rows_per_sec"]
+            result["ingest_peak_rss_mb"] = round(_peak_rss_mb(), 1)
+
+            # re-ingesting the unchanged file in delta mode only hashes and diffs it
+            t0 = time.perf_counter()
+            graph_service.ingest_drug_file_delta(csv_path)
+            result["delta_ingest_unchanged_s"] = round(time.perf_counter() - t0, 3)
+
+            # rebuild the indexes from the graph, as a fresh process would
+            fakes.reset_indexes()
+            t0 = time.perf_counter()
+            graph_service.get_vector_index()
+            graph_service.get_lexical_index()
+            result["index_build_s"] = round(time.perf_counter() - t0, 3)
+            t0 = time.perf_counter()
+            intent_router.warm()
+            result["graph_projection_build_s"] = round(time.perf_counter() - t0, 3)
+
+            def routed():
+                return sum(metrics.INTENT_ROUTES.value(intent=i, outcome="answered") for i in intent_router.INTENTS)
+
+            exact, free = _questions(csv_path, args.requests, args.seed)
+            for label, questions in (("exact", exact), ("free_text", free)):
+                prompts, tokens = metrics.CONTEXT_TOKENS.count(part="prompt"), metrics.CONTEXT_TOKENS.total(part="prompt")
+                answered = routed()
+                stats = asyncio.run(_load(app, "/api/ask", questions, args.concurrency))
+                for key, value in stats.items():
+                    result[f"ask_{label}_{key}"] = value
+                # share of questions answered by the intent router without the LLM
+                result[f"ask_{label}_graph_answer_share"] = round((routed() - answered) / len(questions), 3)
+                prompts = metrics.CONTEXT_TOKENS.count(part="prompt") - prompts
+                if prompts:
+                    tokens = metrics.CONTEXT_TOKENS.total(part="prompt") - tokens
+                    result[f"ask_{label}_prompt_tokens"] = round(tokens / prompts, 1)
+            result["neo4j_queries"] = graph.queries
+            result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+            result_queue.put(result)
+    except Exception as e:
+        import traceback
+        result_queue.put({"rows": rows, "error": f"{e}\n{traceback.format_exc()}"})
+
+
+def _higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_sec")
+
+
+def _lower_is_better(metric: str) -> bool:
+    return metric.endswith(("_ms", "_s", "_mb", "_tokens")) or metric.endswith("errors")
+
+
+def compare(results, baseline, tolerance: float):
+    """Yield (rows, metric, baseline, current, change, regressed) for metrics present in both."""
+    base_by_rows = {str(r["rows"]): r for r in baseline.get("results", [])}
+    for r in results:
+        base = base_by_rows.get(str(r["rows"]))
+        if base is None or "error" in r:
+            continue
+        for metric, value in r.items():
+            old = base.get(metric)
+            if metric == "rows" or not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+                continue
+            if not (_higher_is_better(metric) or _lower_is_better(metric)):
+                continue
+            change = (value - old) / old if old else (0.0 if value == old else float("inf"))
+            regressed = (change < -tolerance) if _higher_is_better(metric) else (change > tolerance and value - old > 1e-9)
+            yield r["rows"], metric, old, value, change, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000], help="dataset sizes (e.g. 1000 10000 100000)")
+    parser.add_argument("--requests", type=int, default=200, help="/api/ask requests per question type")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--neo4j-latency", type=float, default=0.001, help="seconds added per fake Neo4j query")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per fake Groq completion")
+    parser.add_argument("--embedding-backend", default="hashing", help="EMBEDDING_BACKEND for the run")
+    parser.add_argument("--ingest-batch-size", type=int, default=500)
+    parser.add_argument("--embed-processes", type=int, default=0, help="INGEST_EMBED_PROCESSES for the run")
+    parser.add_argument("--write-partitions", type=int, default=1, help="INGEST_WRITE_PARTITIONS for the run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "medchat-bench"))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative change tolerated before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    ctx = mp.get_context("spawn")
+    results = []
+    for rows in sorted(args.rows):
+        result_queue = ctx.Queue()
+        proc = ctx.Process(target=_run_size, args=(args, rows, result_queue))
+        proc.start()
+        results.append(result_queue.get())
+        proc.join()
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("baseline", "save_baseline", "json", "data_dir")},
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+    for r in results:
+        print(f"\n== {r['rows']} rows")
+        if "error" in r:
+            print(f"  ERROR {r['error']}")
+            continue
+        for metric, value in r.items():
+            if metric != "rows":
+                print(f"  {metric:<36} {value}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changed = {k: (v, report["config"].get(k)) for k, v in baseline.get("config", {}).items()
+                   if k != "rows" and report["config"].get(k) != v}
+        if changed:
+            print(f"\nWARNING: run settings differ from the baseline: {changed}")
+        print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for rows, metric, old, new, change, regressed in compare(results, baseline, args.tolerance):
+            flag = "REGRESSION" if regressed else ""
+            print(f"  {rows:>7} {metric:<36} {old:>10} -> {new:<10} {change:+7.1%} {flag}")
+            if regressed:
+                regressions.append((rows, metric))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+    if any("error" in r for r in results) or (regressions and args.fail_on_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# backend/benchmarks/synth_data.py
+"""
+Generate synthetic CSVs shaped like Medicine_Details.csv (same columns, similar
+value distributions) for reproducible ingest and query benchmarks.
+
+    python -m benchmarks.synth_data --rows 1000 10000 100000 --out-dir /tmp/medchat-bench
+"""
+import argparse
+import csv
+import os
+import random
+from typing import List
+
+COLUMNS = [
+    "Medicine Name", "Composition", "Uses", "Side_effects", "Image URL",
+    "Manufacturer", "Excellent Review %", "Average Review %", "Poor Review %",
+]
+
+_SYLLABLES = ["ab", "ac", "al", "am", "an", "ar", "az", "bi", "ce", "ci", "co", "da", "de", "do", "fa", "fe",
+              "ga", "gli", "la", "le", "li", "lo", "ma", "me", "mi", "mo", "na", "ne", "no", "pa", "pi", "pra",
+              "ra", "re", "ri", "ro", "sa", "se", "so", "ta", "te", "ti", "to", "tra", "va", "vi", "xa", "zo"]
+_SUFFIXES = ["cin", "mol", "pril", "zole", "vir", "mab", "tide", "pam", "ril", "tan", "dine", "fen", "mide"]
+_FORMS = ["Tablet", "Capsule", "Syrup", "Injection", "Cream", "Oral Suspension", "Tablet SR", "Drops"]
+_VARIANTS = ["", "Plus", "Duo", "Forte", "DT", "MR", "XL", "Advance"]
+_CONDITIONS = [
+    "Hypertension", "Type 2 diabetes mellitus", "Bacterial infections", "Pain relief", "Fever", "Acid reflux",
+    "Peptic ulcer disease", "Allergic conditions", "Asthma", "Epilepsy", "Depression", "Anxiety",
+    "High cholesterol", "Heart failure", "Migraine", "Rheumatoid arthritis", "Osteoarthritis", "Fungal infections",
+    "HIV infection", "Hepatitis B", "Insomnia", "Parkinson's disease", "Angina", "Psoriasis", "Acne",
+    "Vitamin D deficiency", "Anemia", "Hypothyroidism", "Urinary tract infection", "Nausea and vomiting",
+]
+_EFFECTS = [
+    "Nausea", "Vomiting", "Headache", "Diarrhea", "Dizziness", "Constipation", "Abdominal pain", "Rash",
+    "Fatigue", "Dry mouth", "Insomnia", "Sleepiness", "Skin rash", "Itching", "Indigestion", "Flatulence",
+    "Muscle pain", "Increased liver enzymes", "Hypoglycemia", "Edema", "Cough", "Blurred vision",
+    "Loss of appetite", "Weight gain", "Anxiety", "Tremor", "Hair loss", "Injection site pain",
+]
+_MANUFACTURERS = [
+    "Sun Pharmaceutical Industries Ltd", "Cipla Ltd", "Lupin Ltd", "Mankind Pharma Ltd", "Alkem Laboratories Ltd",
+    "Torrent Pharmaceuticals Ltd", "Intas Pharmaceuticals Ltd", "Zydus Cadila", "Abbott", "Glenmark Pharmaceuticals Ltd",
+]
+
+
+def _ingredient(rng: random.Random) -> str:
+    stem = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 3)))
+    return (stem + rng.choice(_SUFFIXES)).capitalize()
+
+
+def _split_reviews(rng: random.Random) -> List[int]:
+    a = rng.randint(0, 100)
+    b = rng.randint(0, 100 - a)
+    return [a, b, 100 - a - b]
+
+
+def generate_rows(rows: int, seed: int = 0):
+    """Yield `rows` synthetic rows; the same seed always yields the same data."""
+    rng = random.Random(seed)
+    ingredients = [_ingredient(rng) for _ in range(max(50, rows // 20))]
+    brands = ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize() for _ in range(max(100, rows // 4))]
+    seen = set()
+    while len(seen) < rows:
+        brand = rng.choice(brands)
+        strength = rng.choice([5, 10, 20, 25, 40, 50, 100, 200, 250, 400, 500, 625, 650, 1000])
+        name = " ".join(filter(None, [brand, str(strength), rng.choice(_VARIANTS), rng.choice(_FORMS)]))
+        if name in seen:
+            continue
+        seen.add(name)
+        parts = rng.sample(ingredients, rng.randint(1, 3))
+        composition = " + ".join(f"{p} ({rng.choice([5, 10, 50, 125, 250, 500])}mg)" for p in parts)
+        uses = " ".join(f"Treatment of {c}" for c in rng.sample(_CONDITIONS, rng.randint(1, 3)))
+        effects = " ".join(rng.sample(_EFFECTS, rng.randint(2, 8)))
+        excellent, average, poor = _split_reviews(rng)
+        yield {
+            "Medicine Name": name,
+            "Composition": composition,
+            "Uses": uses,
+            "Side_effects": effects,
+            "Image URL": f"https://example.invalid/img/{len(seen)}.jpg",
+            "Manufacturer": rng.choice(_MANUFACTURERS),
+            "Excellent Review %": excellent,
+            "Average Review %": average,
+            "Poor Review %": poor,
+        }
+
+
+def write_csv(path: str, rows: int, seed: int = 0) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(generate_rows(rows, seed))
+    return path
+
+
+def dataset_path(out_dir: str, rows: int, seed: int = 0) -> str:
+    """Path of the dataset for (rows, seed), generated on first use."""
+    path = os.path.join(out_dir, f"medicine_details_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        write_csv(path, rows, seed)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default="benchmarks/data")
+    args = parser.parse_args(argv)
+    for rows in args.rows:
+        print(write_csv(os.path.join(args.out_dir, f"medicine_details_{rows}_{args.seed}.csv"), rows, args.seed))
+
+
+if __name__ == "__main__":
+    main()
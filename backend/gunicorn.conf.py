@@ -0,0 +1,36 @@
+# backend/gunicorn.conf.py
+"""
+Multi-worker deployment: `gunicorn app.main:app -c gunicorn.conf.py`.
+
+The app is imported once in the master (preload_app) and the embedding model
+loaded there before workers fork, so all workers share the model weights
+copy-on-write. The vector and lexical indexes are shared through memory-mapped
+snapshots in INDEX_SNAPSHOT_DIR (see app/services/index_snapshot.py): the
+worker that runs an ingest publishes a new snapshot and the others switch to
+it within INDEX_REFRESH_INTERVAL seconds.
+"""
+import gc
+import os
+import tempfile
+
+bind = os.getenv("BIND", f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WORKERS", os.getenv("WEB_CONCURRENCY", "2")))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+
+# workers must agree on where the shared snapshots live; set before the app reads its settings
+os.environ.setdefault("INDEX_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "medchat-index"))
+
+
+def when_ready(server):
+    # runs in the master after the app is imported and before the first fork
+    from app.utils.embeddings import preload_model
+    try:
+        if preload_model():
+            server.log.info("Embedding model loaded in master; workers share it copy-on-write")
+    except Exception as e:
+        server.log.warning("Embedding model not preloaded (%s); workers load it themselves", e)
+    # keep the refcount writes of the GC out of pages shared with the workers
+    gc.freeze()
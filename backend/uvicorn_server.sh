@@ -0,0 +1,12 @@
+#!/usr/bin/env sh
+# Start the API. WORKERS=1 (default) runs a single uvicorn process; WORKERS>1
+# runs gunicorn with uvicorn workers that share the embedding model and the
+# memory-mapped vector index (see gunicorn.conf.py).
+set -e
+cd "$(dirname "$0")"
+
+WORKERS="${WORKERS:-1}"
+if [ "$WORKERS" -gt 1 ]; then
+    exec gunicorn app.main:app -c gunicorn.conf.py
+fi
+exec uvicorn app.main:app --host "${HOST:-0.0.0.0}" --port "${PORT:-8000}"
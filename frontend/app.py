@@ -1,10 +1,7 @@
 # frontend/app.py
 import streamlit as st
-import requests
-import os
 
-# Backend URL (default: local FastAPI server)
-BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+from utils.api_client import stream_answer
 
 st.set_page_config(page_title="Medical Chatbot", page_icon="💊", layout="wide")
 
@@ -222,45 +219,50 @@ if question := st.chat_input("💬 Type your medical question here..."):
     with st.chat_message("user", avatar="🧑‍⚕️"):
         st.markdown(f"**You:** {question}")
 
-    # Query backend
+    # Query backend (streamed: sources arrive first, then answer tokens)
     with st.chat_message("assistant", avatar="🤖"):
-        with st.spinner("🔍 Analyzing your question..."):
-            try:
-                response = requests.post(
-                    f"{BACKEND_URL}/api/ask",
-                    json={"question": question, "top_k": 5}
-                )
+        placeholder = st.empty()
+        placeholder.markdown("🔍 Analyzing your question...")
+        answer = ""
+        sources = []
+        error_msg = None
+        try:
+            for event, data in stream_answer(question, top_k=5):
+                if event == "sources":
+                    sources = data
+                elif event == "token":
+                    answer += data
+                    placeholder.markdown(f"**Medical Assistant:** {answer}▌")
+                elif event == "error":
+                    error_msg = f"⚠️ Server Error: {data.get('detail')}"
+                    break
+        except RuntimeError as e:
+            error_msg = f"⚠️ {e}"
+        except Exception as e:
+            error_msg = f"❌ Connection Failed: Unable to reach the medical database. Please try again later."
 
-                if response.status_code == 200:
-                    data = response.json()
-                    answer = data["answer"]
-                    st.markdown(f"**Medical Assistant:** {answer}")
+        if error_msg:
+            placeholder.empty()
+            st.error(error_msg)
+            st.session_state["messages"].append(
+                {"role": "assistant", "content": error_msg}
+            )
+        else:
+            placeholder.markdown(f"**Medical Assistant:** {answer}")
 
-                    if data.get("sources"):
-                        st.markdown("**📚 Sources:**")
-                        for src in data["sources"]:
-                            st.markdown(f"• {src}")
+            if sources:
+                st.markdown("**📚 Sources:**")
+                for src in sources:
+                    st.markdown(f"• {src}")
 
-                    # Save bot response in history
-                    st.session_state["messages"].append(
-                        {
-                            "role": "assistant",
-                            "content": answer,
-                            "sources": data.get("sources", []),
-                        }
-                    )
-                else:
-                    error_msg = f"⚠️ Server Error: {response.text}"
-                    st.error(error_msg)
-                    st.session_state["messages"].append(
-                        {"role": "assistant", "content": error_msg}
-                    )
-            except Exception as e:
-                error_msg = f"❌ Connection Failed: Unable to reach the medical database. Please try again later."
-                st.error(error_msg)
-                st.session_state["messages"].append(
-                    {"role": "assistant", "content": error_msg}
-                )
+            # Save bot response in history
+            st.session_state["messages"].append(
+                {
+                    "role": "assistant",
+                    "content": answer,
+                    "sources": sources,
+                }
+            )
 
 # Add a footer with medical disclaimer
 # st.markdown("""
@@ -0,0 +1,38 @@
+# frontend/utils/api_client.py
+import json
+import os
+from typing import Iterator, Tuple, Any
+
+import requests
+
+# Backend URL (default: local FastAPI server)
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+
+
+def stream_answer(question: str, top_k: int = 5, timeout: float = 120) -> Iterator[Tuple[str, Any]]:
+    """
+    Call the /api/ask/stream Server-Sent Events endpoint and yield
+    (event, data) pairs: "sources", then "token"s, then "done" or "error".
+    Raises for non-200 responses.
+    """
+    with requests.post(
+        f"{BACKEND_URL}/api/ask/stream",
+        json={"question": question, "top_k": top_k},
+        stream=True,
+        timeout=timeout,
+    ) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"Server Error: {response.text}")
+
+        event, data_lines = "message", []
+        for line in response.iter_lines(decode_unicode=True):
+            if line is None:
+                continue
+            if line == "":
+                if data_lines:
+                    yield event, json.loads("\n".join(data_lines))
+                event, data_lines = "message", []
+            elif line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[len("data:"):].strip())